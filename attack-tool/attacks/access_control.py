@@ -1,64 +1,127 @@
-import time
-import random
-from urllib.parse import urljoin
-from config import get_log_filename, log_result
-from datetime import datetime, timedelta
+import hashlib
+import re
+from urllib.parse import urljoin, urlparse
+from concurrency import bounded_map
+from config import get_log_filename
+from events import EventLog
+from live_log import LiveLogSink
+from pacing import Pacer
+from session_pool import is_login_page
+
+# Papéis da matriz, do menor para o maior privilégio (nomes das identidades no SessionPool)
+MATRIX_ROLES = ["anonymous", "user", "admin"]
+ROLE_LABELS = {"anonymous": "anônimo", "user": "usuário", "admin": "admin"}
+
+
+def body_fingerprint(text, usernames=()):
+    """
+    Hash do corpo normalizado para comparar respostas de identidades
+    diferentes: comentários HTML são removidos, o nome de cada usuário vira
+    um marcador (só como palavra inteira: "username" continua igual) e
+    espaços em branco são colapsados ("Bem-vindo, user" == "Bem-vindo, admin").
+    """
+    text = re.sub(r"<!--.*?-->", "", text, flags=re.DOTALL)
+    for username in usernames:
+        if username:
+            text = re.sub(rf"(?<!\w){re.escape(username)}(?!\w)", "{usuario}", text)
+    text = re.sub(r"\s+", " ", text).strip()
+    return hashlib.blake2b(text.encode("utf-8", "replace"), digest_size=8).hexdigest()
+
+
+def observe(response, usernames=()):
+    """Resumo de uma resposta usado na comparação: status, URL final e corpo."""
+    final = urlparse(str(response.url))
+    return {
+        "status": response.status_code,
+        "final_url": final.path + (f"?{final.query}" if final.query else ""),
+        "fingerprint": body_fingerprint(response.text, usernames),
+        "size": len(response.content or b""),
+        "login_page": is_login_page(response),
+    }
+
+
+def same_response(a, b):
+    """Mesma resposta: status, URL final e corpo normalizado iguais (sem erros)."""
+    if a is None or b is None or "error" in a or "error" in b:
+        return False
+    return all(a[key] == b[key] for key in ("status", "final_url", "fingerprint"))
 
 class AccessControlAttack:
+    # Delay do modo fixo quando nenhum Pacer é informado
+    DEFAULT_DELAY_RANGE = (0.5, 1.0)
+
     def __init__(self, session_manager):
         self.session_manager = session_manager
         self.vulnerabilities = []
+        self.total_endpoints = 0
+        self.total_requests = 0
+        # Modo matriz: {url: {papel: resumo da resposta}}
+        self.matrix = {}
 
-    def run(self, target_url, endpoints, log_file=None, live_log_container=None, progress_container=None):
+    def run(self, target_url, endpoints, log_file=None, live_log_container=None, progress_container=None,
+            checkpoint=None, pacer=None, catalogue=None, events=None, session_pool=None, concurrency=1):
         """
         Executa o teste de controle de acesso com logs em tempo real.
+        checkpoint (Checkpoint) salva/retoma a posição na lista de endpoints.
+        pacer (Pacer) controla o ritmo dos testes; sem ele, usa o delay fixo DEFAULT_DELAY_RANGE.
+        catalogue (SiteCatalogue) acrescenta as URLs encontradas pelo crawler aos endpoints.
+        events (EventLog) recebe um registro estruturado por endpoint.
+        session_pool (SessionPool) ativa o modo matriz: cada endpoint é buscado
+        por todas as identidades do pool (MATRIX_ROLES), com concurrency
+        requisições em paralelo, e as respostas são comparadas com a do admin.
         """
         if log_file is None:
             log_file = get_log_filename("access_control")
 
-        live_logs = []
-        progress_bar, status_text = (progress_container, None) if progress_container else (None, None)
-        if progress_container:
-            progress_bar, status_text = progress_container
-
-        def add_log(message, update_progress=None):
-            brazil_time = datetime.now() - timedelta(hours=3)
-            timestamp = brazil_time.strftime("%H:%M:%S")
-            formatted_log = f"[{timestamp}] {message}"
-            live_logs.append(formatted_log)
-            log_result(message, log_file)
-            
-            if live_log_container:
-                display_logs = live_logs[-15:]
-                live_log_container.text_area(
-                    f"📋 Logs em Tempo Real ({len(live_logs)} total):", 
-                    value="\n".join(display_logs),
-                    height=300,
-                    key=f"live_logs_ac_{len(live_logs)}"
-                )
-            
-            if progress_bar and update_progress is not None:
-                progress_bar.progress(update_progress)
-            
-            if status_text:
-                status_text.text(f"🔄 {message}")
+        sink = LiveLogSink(log_file, live_log_container, progress_container, key_prefix="live_logs_ac")
+        add_log = sink.add_log
+        events = (events or EventLog()).for_module("access_control")
 
         add_log("🔐 Iniciando teste de Controle de Acesso...", 0)
+        if pacer is None:
+            pacer = Pacer(mode="fixed", delay_range=self.DEFAULT_DELAY_RANGE)
+        add_log(f"🚦 Ritmo: {pacer.describe()}")
         
+        if catalogue is not None:
+            known = {urljoin(target_url, endpoint) for endpoint in endpoints}
+            crawled = [url for url in catalogue.urls() if url not in known]
+            endpoints = list(endpoints) + crawled
+            add_log(f"🗺️ {len(crawled)} endpoints adicionados pelo crawler")
+
+        total_endpoints = self.total_endpoints = self.total_requests = len(endpoints)
+
+        # Retomada: restaura achados e pula os endpoints já testados
+        start_position = 0
+        if checkpoint is not None and checkpoint.position:
+            start_position = checkpoint.position
+            self.vulnerabilities = list(checkpoint.findings)
+            add_log(f"♻️ Retomando execução a partir do endpoint {start_position + 1}/{total_endpoints}")
+
+        if session_pool is not None:
+            return self._run_matrix(target_url, endpoints, start_position, session_pool, concurrency,
+                                    sink, pacer, events, checkpoint)
+
         # Verifica o status da sessão atual
         if self.session_manager.is_authenticated:
             add_log(f"ℹ️ Sessão ATUAL: Autenticada como '{self.session_manager.current_user or 'usuário desconhecido'}'.")
         else:
             add_log("ℹ️ Sessão ATUAL: Não autenticada.")
 
-        total_endpoints = len(endpoints)
         for i, endpoint in enumerate(endpoints):
+            if i < start_position:
+                continue
+            if pacer.cancelled:
+                add_log("⛔ Cancelamento solicitado: encerrando com resultados parciais.")
+                break
             progress = int(((i + 1) / total_endpoints) * 100)
             full_url = urljoin(target_url, endpoint)
             add_log(f"🔍 Testando endpoint ({i+1}/{total_endpoints}): {full_url}", progress)
 
+            response = None
             try:
+                # Sem cache HTTP: o veredicto depende do estado de autenticação atual
                 response = self.session_manager.session.get(full_url, allow_redirects=True, timeout=10)
+                pacer.record(response)
                 add_log(f"  -> Status: {response.status_code}, URL Final: {response.url}")
 
                 # Lógica de detecção de vulnerabilidade
@@ -84,12 +147,21 @@ class AccessControlAttack:
                     self.vulnerabilities.append({"endpoint": full_url, "reason": reason, "status": response.status_code})
                 else:
                     add_log("  ✅ Acesso parece estar controlado corretamente.")
+                events.emit("access", "vulnerable" if is_vulnerable else "controlled", url=full_url,
+                            response=response, reason=reason or None)
 
             except Exception as e:
+                if response is None:
+                    pacer.record(error=e)
                 add_log(f"  🔥 Erro ao testar o endpoint {full_url}: {str(e)}")
+                events.emit("access", url=full_url, error=e)
+
+            if checkpoint is not None:
+                checkpoint.update(i + 1, findings=self.vulnerabilities, total=total_endpoints)
             
-            time.sleep(random.uniform(0.5, 1.0))
+            sink.sleep(pacer.next_delay())
 
+        add_log(f"🚦 Ritmo final: {pacer.describe()}")
         add_log("📊 Gerando relatório final...", 100)
         if self.vulnerabilities:
             report = f"🚨 {len(self.vulnerabilities)} vulnerabilidades de Controle de Acesso encontradas:\n\n"
@@ -101,4 +173,166 @@ class AccessControlAttack:
             report = "✅ Nenhuma vulnerabilidade de Controle de Acesso encontrada nos endpoints testados."
         
         add_log("🏁 Teste de Controle de Acesso finalizado!", 100)
+        sink.flush()
+        if checkpoint is not None:
+            if pacer.cancelled:
+                checkpoint.flush()
+            else:
+                checkpoint.complete()
+        return report
+
+    # --- Modo matriz (papel × endpoint) ---
+
+    def _matrix_verdict(self, observations):
+        """
+        Compara cada papel de menor privilégio com o admin; retorna
+        (veredicto, papéis com a mesma resposta do admin, razão).
+        """
+        admin = observations.get("admin")
+        if admin is None or "error" in admin or admin["login_page"] or admin["status"] >= 400:
+            return "inconclusive", [], "O admin não acessa o endpoint (erro, status de falha ou página de login)."
+        matching = [role for role in MATRIX_ROLES[:-1]
+                    if role in observations and same_response(observations[role], admin)]
+        if not matching:
+            return "controlled", [], ""
+        labels = ", ".join(ROLE_LABELS[role] for role in matching)
+        if matching[0] == "anonymous":
+            reason = f"Resposta sem autenticação idêntica à do admin ({labels})."
+        else:
+            reason = f"Usuário sem privilégio de admin recebe a mesma resposta do admin ({labels})."
+        return "vulnerable", matching, reason
+
+    def _describe_cell(self, role, observation, admin):
+        if "error" in observation:
+            return f"{ROLE_LABELS[role]}: erro ({observation['error']})"
+        cell = f"{ROLE_LABELS[role]}: {observation['status']} {observation['final_url']}"
+        if observation["login_page"]:
+            cell += " (página de login)"
+        if role != "admin":
+            cell += " = admin" if same_response(observation, admin) else " ≠ admin"
+        return cell
+
+    def _run_matrix(self, target_url, endpoints, start_position, session_pool, concurrency,
+                    sink, pacer, events, checkpoint):
+        add_log = sink.add_log
+        total_endpoints = self.total_endpoints
+        self.total_requests = 0
+
+        add_log("🧮 Modo matriz: cada endpoint como anônimo, usuário e admin")
+        logins = session_pool.login_all(workers=len(session_pool.identities))
+        add_log(f"👥 Identidades: {session_pool.describe()}")
+        if not logins.get("admin"):
+            add_log("❌ Login do admin falhou: sem a resposta de referência, a matriz não pode ser comparada.", 100)
+            sink.flush()
+            return "❌ Matriz de controle de acesso não executada: o login do admin falhou."
+        roles = [role for role in MATRIX_ROLES if logins.get(role)]
+        for role in MATRIX_ROLES:
+            if role not in roles:
+                add_log(f"⚠️ Identidade {ROLE_LABELS[role]} indisponível: fica fora da comparação")
+        usernames = [identity.username for identity in session_pool.identities.values() if identity.username]
+
+        concurrency = max(1, int(concurrency or 1))
+        if concurrency > 1:
+            self.session_manager.configure_transport(concurrency)
+        add_log(f"⚡ {concurrency} requisições em paralelo, {len(roles)} papéis por endpoint")
+
+        urls = [urljoin(target_url, endpoint) for endpoint in endpoints]
+
+        def tasks():
+            for i in range(start_position, total_endpoints):
+                for role in roles:
+                    if pacer.cancelled:
+                        return
+                    yield i, role
+
+        def fetch(task):
+            i, role = task
+            pacer.wait()
+            response, error = None, None
+            try:
+                response = session_pool.get(role, urls[i], allow_redirects=True, timeout=10)
+            except Exception as e:
+                error = e
+            pacer.record(response, error)
+            return response, error
+
+        pending = {}
+        finished = set()
+        position = start_position
+        done_endpoints = 0
+        for (i, role), result, error in bounded_map(fetch, tasks(), concurrency):
+            response, request_error = result if error is None else (None, error)
+            self.total_requests += 1
+            if request_error is not None:
+                observation = {"error": str(request_error)}
+                events.emit("fetch", url=urls[i], error=request_error, role=role)
+            else:
+                observation = observe(response, usernames)
+                events.emit("fetch", url=urls[i], response=response, role=role,
+                            final_url=observation["final_url"], fingerprint=observation["fingerprint"])
+
+            observations = pending.setdefault(i, {})
+            observations[role] = observation
+            if len(observations) < len(roles):
+                continue
+
+            # Todos os papéis responderam: compara o endpoint
+            del pending[i]
+            full_url = urls[i]
+            self.matrix[full_url] = observations
+            done_endpoints += 1
+            progress = int(((start_position + done_endpoints) / total_endpoints) * 100)
+            add_log(f"🔍 Endpoint ({start_position + done_endpoints}/{total_endpoints}): {full_url}", progress)
+            admin = observations["admin"]
+            for matrix_role in roles:
+                add_log(f"  -> {self._describe_cell(matrix_role, observations[matrix_role], admin)}")
+
+            verdict, matching, reason = self._matrix_verdict(observations)
+            if verdict == "vulnerable":
+                add_log(f"  🚨 VULNERABILIDADE ENCONTRADA: {reason}")
+                self.vulnerabilities.append({"endpoint": full_url, "reason": reason, "status": admin["status"],
+                                             "role": matching[0], "roles": matching, "matrix": observations})
+            elif verdict == "inconclusive":
+                add_log(f"  ⚠️ Inconclusivo: {reason}")
+            else:
+                add_log("  ✅ Respostas dos papéis de menor privilégio diferem da do admin.")
+            events.emit("matrix", verdict, url=full_url, reason=reason or None, roles=matching,
+                        matrix={r: o.get("status") for r, o in observations.items()})
+
+            # Checkpoint: primeiro endpoint ainda não comparado (a conclusão é fora de ordem)
+            finished.add(i)
+            while position in finished:
+                finished.discard(position)
+                position += 1
+            if checkpoint is not None:
+                checkpoint.update(position, findings=self.vulnerabilities, total=total_endpoints)
+
+        if pacer.cancelled:
+            add_log("⛔ Cancelamento solicitado: encerrando com resultados parciais.")
+            if checkpoint is not None:
+                checkpoint.update(position, findings=self.vulnerabilities, total=total_endpoints, force=True)
+        add_log(f"👥 Sessões: {session_pool.describe()}")
+        add_log(f"🚦 Ritmo final: {pacer.describe()}")
+        add_log("📊 Gerando relatório final...", 100)
+        report = self._matrix_report(roles)
+        add_log("🏁 Teste de Controle de Acesso finalizado!", 100)
+        sink.flush()
+        if checkpoint is not None and not pacer.cancelled:
+            checkpoint.complete()
+        return report
+
+    def _matrix_report(self, roles):
+        if self.vulnerabilities:
+            report = f"🚨 {len(self.vulnerabilities)} vulnerabilidades de Controle de Acesso encontradas:\n\n"
+            for vuln in self.vulnerabilities:
+                report += f"- Endpoint: {vuln['endpoint']}\n"
+                report += f"  Razão: {vuln['reason']}\n"
+                report += f"  Status HTTP: {vuln['status']}\n\n"
+        else:
+            report = "✅ Nenhum papel de menor privilégio recebeu a mesma resposta do admin.\n\n"
+        report += f"🧮 Matriz ({', '.join(ROLE_LABELS[role] for role in roles)}):\n"
+        for url, observations in self.matrix.items():
+            admin = observations["admin"]
+            cells = " | ".join(self._describe_cell(role, observations[role], admin) for role in roles)
+            report += f"- {url}\n  {cells}\n"
         return report
@@ -0,0 +1,103 @@
+import re
+import statistics
+from typing import FrozenSet, List
+
+TOKEN_PATTERN = re.compile(r"\w+")
+
+BASELINE_SAMPLES = 3           # Requisições benignas por cenário
+# Valores benignos de tamanhos diferentes: se a página ecoa o valor enviado,
+# a variação aparece no desvio padrão do tamanho
+BASELINE_VALUES = ["usuario_normal", "teste", "baseline_usuario_inexistente_2024"]
+SIGMA = 3.0                    # Desvios padrão tolerados antes de marcar diferença
+MIN_SIZE_DELTA = 1000          # Diferença mínima de tamanho (chars) considerada (piso da detecção original)
+MIN_LATENCY_DELTA = 2.0        # Atraso mínimo (s) acima da média considerado
+DEFAULT_SIMILARITY_THRESHOLD = 0.3
+
+
+def tokenize(text: str) -> FrozenSet[str]:
+    """Conjunto de palavras (minúsculas) de um texto."""
+    return frozenset(TOKEN_PATTERN.findall(text.lower()))
+
+
+class BaselineProfile:
+    """
+    Perfil do comportamento normal de um cenário, montado a partir de
+    várias respostas benignas.
+
+    Guarda os status/URLs finais observados, média e desvio padrão do
+    tamanho e da latência e a união das palavras das amostras (calculada
+    uma vez). Os limites de tamanho, latência e similaridade saem da
+    variação entre as amostras, com pisos para perfis de uma amostra só.
+    """
+
+    def __init__(self, responses):
+        if not responses:
+            raise ValueError("BaselineProfile precisa de ao menos uma resposta")
+
+        self.samples = len(responses)
+        self.statuses = frozenset(r.status_code for r in responses)
+        self.urls = frozenset(str(r.url) for r in responses)
+
+        sizes = [len(r.text) for r in responses]
+        latencies = [r.elapsed.total_seconds() for r in responses]
+        self.size_mean = statistics.fmean(sizes)
+        self.size_std = statistics.pstdev(sizes)
+        self.latency_mean = statistics.fmean(latencies)
+        self.latency_std = statistics.pstdev(latencies)
+
+        token_sets = [tokenize(r.text) for r in responses]
+        self.tokens = frozenset().union(*token_sets)
+
+        self.size_threshold = max(MIN_SIZE_DELTA, SIGMA * self.size_std)
+        self.latency_threshold = self.latency_mean + max(MIN_LATENCY_DELTA, SIGMA * self.latency_std)
+        self.similarity_threshold = DEFAULT_SIMILARITY_THRESHOLD
+        if len(token_sets) > 1:
+            # Similaridade de cada amostra com as demais: páginas muito
+            # dinâmicas toleram similaridade menor
+            sims = [self._similarity(tokens, frozenset().union(*(token_sets[:i] + token_sets[i + 1:])))
+                    for i, tokens in enumerate(token_sets)]
+            spread = statistics.fmean(sims) - SIGMA * statistics.pstdev(sims)
+            self.similarity_threshold = max(0.0, min(DEFAULT_SIMILARITY_THRESHOLD, spread))
+
+    @staticmethod
+    def _similarity(tokens, reference) -> float:
+        if not tokens:
+            return 0.0
+        return len(tokens & reference) / len(tokens)
+
+    def similarity(self, text: str) -> float:
+        """Fração das palavras do texto que aparecem nas amostras do baseline."""
+        return self._similarity(tokenize(text), self.tokens)
+
+    def compare(self, response) -> List[str]:
+        """Indicadores de diferença entre a resposta e o perfil (exceto latência)."""
+        indicators = []
+
+        size_diff = abs(len(response.text) - self.size_mean)
+        if size_diff > self.size_threshold:
+            indicators.append(f"baseline:size_difference:{size_diff:.0f}")
+
+        if str(response.url) not in self.urls:
+            indicators.append("baseline:url_change")
+
+        if response.status_code not in self.statuses:
+            indicators.append("baseline:status_change")
+
+        similarity = self.similarity(response.text)
+        if similarity < self.similarity_threshold:
+            indicators.append(f"baseline:low_similarity:{similarity:.2f}")
+
+        return indicators
+
+    def latency_indicators(self, response) -> List[str]:
+        """Indicador de resposta anormalmente lenta (injeções baseadas em tempo)."""
+        latency = response.elapsed.total_seconds()
+        if latency > self.latency_threshold:
+            return [f"baseline:slow_response:{latency:.2f}s"]
+        return []
+
+    def describe(self) -> str:
+        return (f"{self.samples} amostras, status {sorted(self.statuses)}, "
+                f"tamanho {self.size_mean:.0f}±{self.size_std:.0f} (limite ±{self.size_threshold:.0f}), "
+                f"latência {self.latency_mean * 1000:.0f}±{self.latency_std * 1000:.0f}ms, "
+                f"{len(self.tokens)} palavras, similaridade mínima {self.similarity_threshold:.2f}")
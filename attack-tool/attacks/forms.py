@@ -0,0 +1,106 @@
+from dataclasses import dataclass, field
+from html.parser import HTMLParser
+from typing import Dict, List, Tuple
+from urllib.parse import urljoin
+
+
+@dataclass
+class HTMLForm:
+    """Formulário encontrado em uma página"""
+    action_url: str
+    method: str
+    fields: List[Dict[str, str]] = field(default_factory=list)
+
+
+class FormExtractor(HTMLParser):
+    """
+    Extrai formulários e campos em uma única passada pelo HTML.
+
+    Cada <form> vira um HTMLForm com action (absoluta), method (maiúsculo,
+    GET por padrão como no HTML) e os campos nomeados na ordem em que
+    aparecem: input (com o type declarado, text por padrão), textarea e
+    select (com o valor da opção selecionada ou da primeira). Campos fora
+    de qualquer formulário ficam em orphan_fields, e os destinos de <a>,
+    <area>, <frame> e <iframe> (absolutos) em links.
+    """
+
+    def __init__(self, base_url: str):
+        super().__init__(convert_charrefs=True)
+        self.base_url = base_url
+        self.forms: List[HTMLForm] = []
+        self.orphan_fields: List[Dict[str, str]] = []
+        self.links: List[str] = []
+        self._form = None
+        self._select = None
+
+    def _add_field(self, field_info):
+        if self._form is not None:
+            self._form.fields.append(field_info)
+        else:
+            self.orphan_fields.append(field_info)
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag in ("a", "area") and attrs.get("href"):
+            self.links.append(urljoin(self.base_url, attrs["href"]))
+        elif tag in ("frame", "iframe") and attrs.get("src"):
+            self.links.append(urljoin(self.base_url, attrs["src"]))
+        elif tag == "form":
+            # <form> aninhado não existe em HTML: o anterior é encerrado
+            self._close_form()
+            action = attrs.get("action") or ""
+            self._form = HTMLForm(
+                action_url=urljoin(self.base_url, action) if action else self.base_url,
+                method=(attrs.get("method") or "GET").upper(),
+            )
+        elif tag == "input":
+            if attrs.get("name"):
+                self._add_field({
+                    "name": attrs["name"],
+                    "type": (attrs.get("type") or "text").lower(),
+                    "value": attrs.get("value") or "",
+                })
+        elif tag == "textarea":
+            if attrs.get("name"):
+                self._add_field({"name": attrs["name"], "type": "textarea", "value": ""})
+        elif tag == "select":
+            if attrs.get("name"):
+                self._select = {"name": attrs["name"], "type": "select", "value": ""}
+                self._add_field(self._select)
+        elif tag == "option" and self._select is not None:
+            value = attrs.get("value") or ""
+            if "selected" in attrs or not self._select.get("_has_option"):
+                self._select["value"] = value
+                self._select["_has_option"] = True
+
+    handle_startendtag = handle_starttag
+
+    def handle_endtag(self, tag):
+        if tag == "form":
+            self._close_form()
+        elif tag == "select":
+            self._close_select()
+
+    def _close_select(self):
+        if self._select is not None:
+            self._select.pop("_has_option", None)
+            self._select = None
+
+    def _close_form(self):
+        self._close_select()
+        if self._form is not None:
+            self.forms.append(self._form)
+            self._form = None
+
+    def close(self):
+        super().close()
+        # Formulário sem </form> até o fim da página
+        self._close_form()
+
+
+def extract_forms(html: str, base_url: str) -> Tuple[List[HTMLForm], List[Dict[str, str]]]:
+    """Retorna (formulários, campos órfãos) da página."""
+    extractor = FormExtractor(base_url)
+    extractor.feed(html)
+    extractor.close()
+    return extractor.forms, extractor.orphan_fields
@@ -0,0 +1,81 @@
+import re
+import threading
+from typing import Dict, Iterable, List, Set
+
+
+class IndicatorMatcher:
+    """
+    Casamento de múltiplos conjuntos de indicadores em uma única passada.
+
+    Todos os padrões de todas as categorias são compilados em uma só regex
+    de alternância (dentro de um lookahead, para achar ocorrências que se
+    sobrepõem). Os padrões são ordenados do maior para o menor: quando um
+    padrão casa em uma posição, todo padrão que é substring dele também
+    está presente, e isso é resolvido por uma tabela pré-calculada.
+    """
+
+    def __init__(self):
+        self._categories: Dict[str, List[str]] = {}
+        self._compiled = None
+        self._implied: Dict[str, Set[str]] = {}
+        self._lock = threading.Lock()
+
+    def register(self, category: str, patterns: Iterable[str]):
+        """Adiciona padrões a uma categoria (invalida a compilação atual)."""
+        with self._lock:
+            existing = self._categories.setdefault(category, [])
+            for pattern in patterns:
+                pattern = pattern.lower()
+                if pattern not in existing:
+                    existing.append(pattern)
+            self._compiled = None
+
+    def patterns(self, category: str) -> List[str]:
+        return list(self._categories.get(category, []))
+
+    def _compile(self):
+        with self._lock:
+            if self._compiled is not None:
+                return self._compiled
+            unique = sorted({p for patterns in self._categories.values() for p in patterns},
+                            key=len, reverse=True)
+            self._implied = {p: {q for q in unique if q in p} for p in unique}
+            alternation = "|".join(re.escape(p) for p in unique) or "(?!)"
+            self._compiled = re.compile(f"(?=({alternation}))")
+            return self._compiled
+
+    def scan(self, text: str) -> Dict[str, List[str]]:
+        """
+        Procura todos os indicadores em text (já em minúsculas) e retorna
+        {categoria: [padrões encontrados]} na ordem em que foram registrados.
+        """
+        compiled = self._compile()
+        found: Set[str] = set()
+        for match in compiled.finditer(text):
+            pattern = match.group(1)
+            if pattern not in found:
+                found |= self._implied[pattern]
+
+        return {
+            category: [p for p in patterns if p in found]
+            for category, patterns in self._categories.items()
+        }
+
+
+# Conjuntos de indicadores usados pela detecção de SQL Injection
+SQLI_INDICATORS = IndicatorMatcher()
+SQLI_INDICATORS.register("auth_bypass", [
+    "bem-vindo", "welcome", "dashboard", "home", "admin panel",
+    "user profile", "logged in", "login successful", "sucesso",
+    "painel", "perfil", "logado", "autenticado", "menu principal",
+    "logout", "sair", "painel de controle", "bem vindo"
+])
+SQLI_INDICATORS.register("sql_error", [
+    "mysql_fetch_array", "you have an error in your sql syntax",
+    "warning: mysql_", "mysqlsyntaxerrorexception", "ora-00933",
+    "postgresql query failed", "sqlite3.operationalerror",
+    "syntax error", "unclosed quotation mark", "mysql_num_rows",
+    "mysql error", "sql syntax", "database error"
+])
+SQLI_INDICATORS.register("login_field", ["password", "senha", "login", "type='password'"])
+SQLI_INDICATORS.register("logged_in", ["logout", "sair", "perfil", "dashboard", "bem-vindo"])
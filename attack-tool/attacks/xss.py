@@ -1,14 +1,28 @@
-import time
-import random
-from urllib.parse import urljoin, urlparse, parse_qs, urlencode
-from config import get_log_filename, log_result
-from datetime import datetime, timedelta
+import hashlib
+import importlib.util
+from itertools import islice
+from urllib.parse import urlparse, parse_qs, urlencode
+from config import get_log_filename
+from events import EventLog
+from live_log import LiveLogSink
+from pacing import Pacer
+from attacks.forms import extract_forms
 from bs4 import BeautifulSoup, NavigableString
 
+# Parser mais rápido, quando disponível
+HTML_PARSER = 'lxml' if importlib.util.find_spec('lxml') else 'html.parser'
+
+EVENT_HANDLERS = ['onerror', 'onload', 'onmouseover', 'onfocus']
+PARSE_CACHE_SIZE = 256
+
 class XSSAttack:
+    # Delay do modo fixo quando nenhum Pacer é informado
+    DEFAULT_DELAY_RANGE = (0.1, 0.2)
+
     def __init__(self, session_manager):
         self.session_manager = session_manager
         self.vulnerabilities = []
+        self._parse_cache = {}
 
     def get_xss_payloads(self):
         """Retorna uma lista mais abrangente e categorizada de payloads XSS."""
@@ -45,11 +59,30 @@ class XSSAttack:
             all_payloads.extend(category_payloads)
         return all_payloads
 
+    def _get_dom_markers(self, response_text):
+        """
+        Extrai da página o conteúdo dos <script> e dos atributos de evento.
+        O resultado é guardado em cache pelo hash do corpo, então páginas
+        idênticas são parseadas uma única vez por execução.
+        """
+        body_hash = hashlib.blake2b(response_text.encode('utf-8', 'surrogatepass'), digest_size=16).digest()
+        markers = self._parse_cache.get(body_hash)
+        if markers is not None:
+            return markers
+
+        soup = BeautifulSoup(response_text, HTML_PARSER)
+        scripts = [script.string for script in soup.find_all('script') if script.string]
+        handlers = [tag.attrs[handler] for tag in soup.find_all(True)
+                    for handler in EVENT_HANDLERS if handler in tag.attrs]
+        markers = (scripts, handlers)
+
+        if len(self._parse_cache) >= PARSE_CACHE_SIZE:
+            self._parse_cache.pop(next(iter(self._parse_cache)))
+        self._parse_cache[body_hash] = markers
+        return markers
+
     def is_payload_active(self, response_text, payload):
         """Verifica se o payload está ativo e não foi sanitizado na resposta."""
-        soup = BeautifulSoup(response_text, 'html.parser')
-        
-        # 1. Procura por tags de script criadas pelo payload
         # Extrai o conteúdo do alert para busca, ex: XSS-Test-Gemini-CLI-1
         alert_content = ""
         try:
@@ -57,139 +90,192 @@ class XSSAttack:
         except IndexError:
             return False # Payload malformado para esta verificação
 
-        scripts = soup.find_all('script')
-        for script in scripts:
-            if script.string and alert_content in script.string:
-                return True # Encontrou o script com o conteúdo do alert
-
-        # 2. Procura por atributos de evento (onerror, onload, etc.)
-        event_handlers = ['onerror', 'onload', 'onmouseover', 'onfocus']
-        for handler in event_handlers:
-            tags_with_handler = soup.find_all(attrs={handler: True})
-            for tag in tags_with_handler:
-                if alert_content in tag[handler]:
+        # Caminho rápido: se nem o marcador do alert nem o payload aparecem no
+        # corpo bruto, nenhuma das verificações abaixo pode ter sucesso
+        # (o conteúdo de <script> não é decodificado e os payloads não usam entidades).
+        payload_reflected = payload in response_text
+        if alert_content not in response_text and not payload_reflected:
+            return False
+
+        if alert_content in response_text:
+            scripts, handlers = self._get_dom_markers(response_text)
+
+            # 1. Procura por tags de script criadas pelo payload
+            for script in scripts:
+                if alert_content in script:
+                    return True # Encontrou o script com o conteúdo do alert
+
+            # 2. Procura por atributos de evento (onerror, onload, etc.)
+            for handler_value in handlers:
+                if alert_content in handler_value:
                     return True
         
         # 3. Verifica se o payload original está em algum lugar sem ter sido escapado
         # Isso é menos confiável, mas serve como um fallback.
-        if payload in response_text and payload.replace('<', '&lt;') not in response_text:
+        if payload_reflected and payload.replace('<', '&lt;') not in response_text:
              # Encontrou o payload, e não parece ter sido convertido para entidade HTML
              return True
 
         return False
 
-    def run(self, target_url, payloads=None, log_file=None, live_log_container=None, progress_container=None):
-        """Executa o teste de XSS com detecção avançada de vulnerabilidades."""
+    def _add_page_points(self, injection_points, page_url, forms, orphan_fields, add_log):
+        """Pontos de injeção de uma página: parâmetros da URL, campos de formulário e órfãos."""
+        for param in parse_qs(urlparse(page_url).query, keep_blank_values=True):
+            injection_points.add(('url', param, page_url, 'get'))
+            add_log(f"  -> Ponto de injeção (URL): '{param}'")
+
+        total_fields = sum(len(form.fields) for form in forms) + len(orphan_fields)
+        add_log(f"  -> Encontrados {total_fields} campos de entrada na página.")
+        for form in forms:
+            for field in form.fields:
+                injection_points.add(('form', field['name'], form.action_url, form.method.lower()))
+                add_log(f"  -> Ponto de injeção (Form): '{field['name']}' em {form.action_url}")
+        for field in orphan_fields:
+            injection_points.add(('orphan', field['name'], page_url, 'get'))
+            injection_points.add(('orphan', field['name'], page_url, 'post'))
+            add_log(f"  -> Ponto de injeção (Órfão): '{field['name']}'")
+
+    def _discover_injection_points(self, target_url, add_log):
+        """Pontos de injeção da página alvo."""
+        injection_points = set()
+        try:
+            response = self.session_manager.cached_get(target_url, timeout=10)
+            forms, orphan_fields = self.session_manager.cached_parse(
+                "forms", response, lambda r: extract_forms(r.text, target_url))
+            self._add_page_points(injection_points, target_url, forms, orphan_fields, add_log)
+        except Exception as e:
+            add_log(f"🔥 Erro ao analisar a URL alvo: {e}")
+        return injection_points
+
+    def _catalogue_injection_points(self, catalogue, add_log):
+        """Pontos de injeção de todas as páginas do catálogo do crawler."""
+        add_log(f"🗺️ Usando catálogo do crawler: {catalogue.describe()}")
+        injection_points = set()
+        for page in catalogue.pages:
+            add_log(f"📄 {page.url}")
+            self._add_page_points(injection_points, page.url, page.forms, page.orphan_fields, add_log)
+        return injection_points
+
+    def discover_injection_points(self, target_url, add_log, catalogue=None):
+        """Pontos de injeção do catálogo do crawler, se houver, ou da página alvo."""
+        if catalogue is not None:
+            return self._catalogue_injection_points(catalogue, add_log)
+        return self._discover_injection_points(target_url, add_log)
+
+    def generate_report(self):
+        """Relatório das vulnerabilidades em self.vulnerabilities."""
+        if not self.vulnerabilities:
+            return "✅ Nenhuma vulnerabilidade de XSS ativa encontrada."
+        report = f"🚨 {len(self.vulnerabilities)} vulnerabilidades de XSS Ativo encontradas:\n\n"
+        for vuln in self.vulnerabilities:
+            report += f"- URL: {vuln['url']}\n"
+            report += f"  Método: {vuln['method'].upper()}\n"
+            report += f"  Parâmetro Vulnerável: {vuln['param']}\n"
+            report += f"  Payload: {vuln['payload']}\n\n"
+        return report
+
+    def run(self, target_url, payloads=None, log_file=None, live_log_container=None, progress_container=None,
+            checkpoint=None, pacer=None, catalogue=None, events=None, injection_points=None):
+        """
+        Executa o teste de XSS com detecção avançada de vulnerabilidades.
+        checkpoint (Checkpoint) salva/retoma a posição na matriz ponto de injeção × payload.
+        pacer (Pacer) controla o ritmo dos testes; sem ele, usa o delay fixo DEFAULT_DELAY_RANGE.
+        catalogue (SiteCatalogue) substitui a descoberta na target_url pelas páginas do crawler.
+        events (EventLog) recebe um registro estruturado por teste.
+        injection_points, se informado (ex.: pelo coordenador distribuído), pula a descoberta.
+        """
         if log_file is None:
             log_file = get_log_filename("xss")
         
         final_payloads = self.get_flattened_payloads(payloads)
         self.vulnerabilities = []
+        self._parse_cache.clear()
         total_tests = 0
 
-        live_logs = []
-        progress_bar, status_text = (None, None)
-        if progress_container:
-            progress_bar, status_text = progress_container
-
-        def add_log(message, update_progress=None):
-            brazil_time = datetime.now() - timedelta(hours=3)
-            timestamp = brazil_time.strftime("%H:%M:%S")
-            formatted_log = f"[{timestamp}] {message}"
-            live_logs.append(formatted_log)
-            log_result(message, log_file)
-            
-            if live_log_container:
-                display_logs = live_logs[-15:]
-                live_log_container.text_area(
-                    f"📋 Logs em Tempo Real ({len(live_logs)} total):", 
-                    value="\n".join(display_logs),
-                    height=300,
-                    key=f"live_logs_xss_{len(live_logs)}"
-                )
-            
-            if progress_bar and update_progress is not None:
-                progress_bar.progress(update_progress)
-            
-            if status_text:
-                status_text.text(f"🔄 {message}")
+        sink = LiveLogSink(log_file, live_log_container, progress_container, key_prefix="live_logs_xss")
+        add_log = sink.add_log
+        events = (events or EventLog()).for_module("xss")
 
         add_log("🎭 Iniciando teste de XSS com detecção avançada...", 0)
+        if pacer is None:
+            pacer = Pacer(mode="fixed", delay_range=self.DEFAULT_DELAY_RANGE)
+        add_log(f"🚦 Ritmo: {pacer.describe()}")
         
-        injection_points = set()
-        try:
-            response = self.session_manager.session.get(target_url, timeout=10)
-            soup = BeautifulSoup(response.text, 'html.parser')
-            parsed_url = urlparse(target_url)
-            query_params = parse_qs(parsed_url.query)
-            for param in query_params:
-                injection_points.add(('url', param, target_url, 'get'))
-                add_log(f"  -> Ponto de injeção (URL): '{param}'")
-
-            all_inputs = soup.find_all(['input', 'textarea', 'select'])
-            add_log(f"  -> Encontrados {len(all_inputs)} campos de entrada na página.")
-            for field in all_inputs:
-                name = field.get('name')
-                if not name: continue
-                form = field.find_parent('form')
-                if form:
-                    action = form.get('action', '')
-                    form_url = urljoin(target_url, action)
-                    method = form.get('method', 'get').lower()
-                    injection_points.add(('form', name, form_url, method))
-                    add_log(f"  -> Ponto de injeção (Form): '{name}' em {form_url}")
-                else:
-                    injection_points.add(('orphan', name, target_url, 'get'))
-                    injection_points.add(('orphan', name, target_url, 'post'))
-                    add_log(f"  -> Ponto de injeção (Órfão): '{name}'")
-        except Exception as e:
-            add_log(f"🔥 Erro ao analisar a URL alvo: {e}")
+        if injection_points is not None:
+            injection_points = set(injection_points)
+            add_log(f"🔍 {len(injection_points)} pontos de injeção recebidos (descoberta já feita)")
+        else:
+            injection_points = self.discover_injection_points(target_url, add_log, catalogue)
 
         if not injection_points:
             add_log("⚠️ Nenhum ponto de injeção encontrado.", 100)
+            sink.flush()
             return ("Nenhum ponto de injeção encontrado para testar.", 0)
 
         estimated_tests = len(injection_points) * len(final_payloads)
         add_log(f"📊 Total de testes a serem executados: {estimated_tests}")
 
-        for task_type, name, url, method in injection_points:
-            for payload in final_payloads:
-                total_tests += 1
-                progress = int((total_tests / estimated_tests) * 100) if estimated_tests > 0 else 0
-                add_log(f"💉 Teste {total_tests}/{estimated_tests}: Parâmetro '{name}' via {method.upper()}", progress)
-
-                try:
-                    if method == 'get':
-                        parsed_url = urlparse(url)
-                        original_params = parse_qs(parsed_url.query)
-                        original_params[name] = payload
-                        new_query = urlencode(original_params, doseq=True)
-                        test_url = parsed_url._replace(query=new_query).geturl()
-                        test_response = self.session_manager.session.get(test_url, timeout=5)
-                    else:
-                        data = {name: payload}
-                        test_response = self.session_manager.session.post(url, data=data, timeout=5)
-
-                    if self.is_payload_active(test_response.text, payload):
-                        add_log(f"  🚨 VULNERABILIDADE ENCONTRADA! Payload ATIVO em '{name}'.")
-                        self.vulnerabilities.append({"url": url, "param": name, "payload": payload, "method": method})
-                    else:
-                        add_log(f"  ✅ Seguro: Payload não foi ativado.")
-
-                except Exception as e:
-                    add_log(f"  🔥 Erro no teste do parâmetro '{name}': {e}")
-                time.sleep(random.uniform(0.1, 0.2))
+        # Retomada: restaura achados e pula os testes já executados
+        start_position = 0
+        if checkpoint is not None and checkpoint.position:
+            start_position = total_tests = checkpoint.position
+            self.vulnerabilities = list(checkpoint.findings)
+            add_log(f"♻️ Retomando execução a partir do teste {start_position + 1}/{estimated_tests}")
 
+        # Ordenado para que a posição do checkpoint seja estável entre execuções
+        test_matrix = ((point, payload) for point in sorted(injection_points) for payload in final_payloads)
+        for (task_type, name, url, method), payload in islice(test_matrix, start_position, None):
+            if pacer.cancelled:
+                add_log("⛔ Cancelamento solicitado: encerrando com resultados parciais.")
+                break
+            total_tests += 1
+            progress = int((total_tests / estimated_tests) * 100) if estimated_tests > 0 else 0
+            add_log(f"💉 Teste {total_tests}/{estimated_tests}: Parâmetro '{name}' via {method.upper()}", progress)
+
+            test_response = None
+            try:
+                if method == 'get':
+                    parsed_url = urlparse(url)
+                    original_params = parse_qs(parsed_url.query)
+                    original_params[name] = payload
+                    new_query = urlencode(original_params, doseq=True)
+                    test_url = parsed_url._replace(query=new_query).geturl()
+                    test_response = self.session_manager.session.get(test_url, timeout=5)
+                else:
+                    data = {name: payload}
+                    test_response = self.session_manager.session.post(url, data=data, timeout=5)
+                pacer.record(test_response)
+
+                if self.is_payload_active(test_response.text, payload):
+                    add_log(f"  🚨 VULNERABILIDADE ENCONTRADA! Payload ATIVO em '{name}'.")
+                    self.vulnerabilities.append({"url": url, "param": name, "payload": payload, "method": method})
+                    verdict = "vulnerable"
+                else:
+                    add_log(f"  ✅ Seguro: Payload não foi ativado.")
+                    verdict = "safe"
+                events.emit("injection", verdict, url=url, field=name, payload=payload,
+                            response=test_response, method=method, point=task_type)
+
+            except Exception as e:
+                if test_response is None:
+                    pacer.record(error=e)
+                add_log(f"  🔥 Erro no teste do parâmetro '{name}': {e}")
+                events.emit("injection", url=url, field=name, payload=payload, error=e,
+                            method=method, point=task_type)
+
+            if checkpoint is not None:
+                checkpoint.update(total_tests, findings=self.vulnerabilities, total=estimated_tests)
+            sink.sleep(pacer.next_delay())
+
+        add_log(f"🚦 Ritmo final: {pacer.describe()}")
         add_log("📊 Gerando relatório final...", 100)
-        if self.vulnerabilities:
-            report = f"🚨 {len(self.vulnerabilities)} vulnerabilidades de XSS Ativo encontradas:\n\n"
-            for vuln in self.vulnerabilities:
-                report += f"- URL: {vuln['url']}\n"
-                report += f"  Método: {vuln['method'].upper()}\n"
-                report += f"  Parâmetro Vulnerável: {vuln['param']}\n"
-                report += f"  Payload: {vuln['payload']}\n\n"
-        else:
-            report = "✅ Nenhuma vulnerabilidade de XSS ativa encontrada."
+        report = self.generate_report()
         
         add_log("🏁 Teste de XSS finalizado!", 100)
+        sink.flush()
+        if checkpoint is not None:
+            if pacer.cancelled:
+                checkpoint.flush()
+            else:
+                checkpoint.complete()
         return (report, total_tests)
\ No newline at end of file
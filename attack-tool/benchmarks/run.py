@@ -0,0 +1,176 @@
+"""
+Benchmark de throughput dos módulos de ataque contra o servidor stand-in.
+
+Uso (a partir de attack-tool/):
+    python -m benchmarks.run
+    python -m benchmarks.run --latency 0.005 --response-size 16384 --json bench.json
+    python -m benchmarks.run --compare bench.json
+
+Para cada módulo (BruteForceAttack, SQLInjectionAttack, XSSAttack e
+AccessControlAttack), com os delays desligados, mede requisições por
+segundo, tempo de CPU do cliente por requisição e pico de memória
+(tracemalloc). O servidor roda em outro processo, então o tempo de CPU
+medido é só o da ferramenta.
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks.standin import serve
+
+REGRESSION_THRESHOLD = 0.10  # 10% mais lento que a referência é destacado
+
+
+def start_standin(latency, response_size):
+    """Sobe o stand-in em um processo separado e retorna (processo, base_url)."""
+    ready = multiprocessing.Queue()
+    process = multiprocessing.Process(
+        target=serve, args=("127.0.0.1", 0, latency, response_size, ready), daemon=True
+    )
+    process.start()
+    port = ready.get(timeout=10)
+    return process, f"http://127.0.0.1:{port}"
+
+
+def build_cases(base_url, scale):
+    """Cenários de benchmark: (nome, função que recebe o SessionManager e executa o ataque)."""
+    from attacks.brute_force import BruteForceAttack
+    from attacks.sql_injection import SQLInjectionAttack
+    from attacks.xss import XSSAttack
+    from attacks.access_control import AccessControlAttack
+    from pacing import Pacer
+
+    usernames = [f"user{i}" for i in range(10 * scale)] + ["admin"]
+    passwords = [f"senha{i}" for i in range(20 * scale)] + ["admin"]
+    login_url = f"{base_url}/controller/usuario.php"
+
+    def brute_force(session_manager):
+        attack = BruteForceAttack(session_manager)
+        attack.run(login_url, usernames, passwords, max_attempts=len(usernames) * len(passwords),
+                   pacer=Pacer.unlimited())
+
+    def sql_injection(session_manager):
+        attack = SQLInjectionAttack(session_manager)
+        attack.run(f"{base_url}/", pacer=Pacer.unlimited())
+
+    def xss(session_manager):
+        session_manager.authenticate("admin", "admin", os.devnull)
+        attack = XSSAttack(session_manager)
+        attack.run(f"{base_url}/view/home.php?msg=teste", pacer=Pacer.unlimited())
+
+    def access_control(session_manager):
+        attack = AccessControlAttack(session_manager)
+        endpoints = ["/view/home.php", "/view/post.php?msg=a", "/view/perfil.php?id=1",
+                     "/view/cadastrar.php", "/view/teste-de-conexao.php"] * (4 * scale)
+        attack.run(base_url, endpoints, pacer=Pacer.unlimited())
+
+    return [
+        ("BruteForceAttack", brute_force),
+        ("SQLInjectionAttack", sql_injection),
+        ("XSSAttack", xss),
+        ("AccessControlAttack", access_control),
+    ]
+
+
+def measure(case, session_dir):
+    """
+    Executa um cenário e devolve as métricas. O tempo é medido em uma
+    passada sem tracemalloc (que distorce a CPU); o pico de memória vem de
+    uma segunda passada instrumentada.
+    """
+    from config import flush_logs
+    from session_manager import SessionManager
+
+    def run_once():
+        session_manager = SessionManager(session_file=os.path.join(session_dir, "session.pkl"))
+        case(session_manager)
+        flush_logs()
+        return session_manager.get_transport_stats()["requests"]
+
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    requests_made = run_once()
+    cpu = time.process_time() - cpu_start
+    wall = time.perf_counter() - wall_start
+
+    tracemalloc.start()
+    run_once()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "requests": requests_made,
+        "wall_s": round(wall, 4),
+        "requests_per_s": round(requests_made / wall, 2) if wall else 0.0,
+        "cpu_ms_per_request": round(cpu * 1000 / requests_made, 3) if requests_made else 0.0,
+        "peak_memory_kb": round(peak / 1024, 1),
+    }
+
+
+def print_report(results, reference=None):
+    header = f"{'Módulo':<22}{'Req':>7}{'Req/s':>10}{'CPU ms/req':>12}{'Pico KB':>10}"
+    print(header)
+    print("-" * len(header))
+    for name, metrics in results.items():
+        line = (f"{name:<22}{metrics['requests']:>7}{metrics['requests_per_s']:>10.1f}"
+                f"{metrics['cpu_ms_per_request']:>12.3f}{metrics['peak_memory_kb']:>10.1f}")
+        previous = (reference or {}).get(name)
+        if previous and previous.get("requests_per_s"):
+            change = metrics["requests_per_s"] / previous["requests_per_s"] - 1
+            flag = "  ⚠️ REGRESSÃO" if change < -REGRESSION_THRESHOLD else ""
+            line += f"  ({change:+.1%} req/s){flag}"
+        print(line)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark de throughput dos módulos de ataque.")
+    parser.add_argument("--latency", type=float, default=0.0, help="Latência artificial do stand-in (s)")
+    parser.add_argument("--response-size", type=int, default=4096, help="Tamanho das páginas do stand-in (bytes)")
+    parser.add_argument("--scale", type=int, default=1, help="Multiplicador do tamanho das listas")
+    parser.add_argument("--only", action="append", help="Executa só o módulo indicado (repetível)")
+    parser.add_argument("--json", help="Salva os resultados em JSON")
+    parser.add_argument("--compare", help="JSON de uma execução anterior para comparação")
+    args = parser.parse_args(argv)
+
+    work_dir = tempfile.mkdtemp(prefix="attack-bench-")
+    # Logs e checkpoints do benchmark não se misturam com os reais
+    os.environ["ATTACK_LOG_DIR"] = work_dir
+
+    process, base_url = start_standin(args.latency, args.response_size)
+    # SessionManager.authenticate usa config.BASE_URL
+    os.environ["ATTACK_BASE_URL"] = base_url
+    try:
+        results = {}
+        for name, case in build_cases(base_url, args.scale):
+            if args.only and name not in args.only:
+                continue
+            print(f"▶ {name}...", file=sys.stderr)
+            results[name] = measure(case, work_dir)
+    finally:
+        process.terminate()
+
+    reference = None
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            reference = json.load(f)["results"]
+
+    print_report(results, reference)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({
+                "latency": args.latency,
+                "response_size": args.response_size,
+                "scale": args.scale,
+                "results": results,
+            }, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
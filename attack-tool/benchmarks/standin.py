@@ -0,0 +1,212 @@
+"""
+Servidor HTTP local que imita os endpoints do ChitChat usados pelos ataques
+(config.ENDPOINTS): login em /controller/usuario.php, /view/home.php,
+/view/post.php, /view/perfil.php e os formulários de login e cadastro.
+
+Latência e tamanho das respostas são configuráveis, para medir o custo do
+lado do cliente sem depender do contêiner PHP/MySQL.
+"""
+import argparse
+import html
+import secrets
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+VALID_USERS = {"admin": "admin", "user": "123456"}
+SQLI_MARKERS = ("' or", "\" or", "'--", "' --", "'#", "' #", "or 1=1", "or true")
+
+LOGIN_FORM = """
+<form method="POST" action="controller/usuario.php">
+    <input type="hidden" name="Usuario" value="Login" />
+    <input type="text" name="Login" placeholder="Usuario" />
+    <input type="password" autocomplete="new-password" name="Senha" placeholder="Senha" />
+    <button type="submit" name="login">Entrar</button>
+</form>
+"""
+
+SIGNUP_FORM = """
+<form method="POST" action="../controller/usuario.php" enctype="multipart/form-data">
+    <input type="hidden" name="Usuario" value="Cadastrar" />
+    <input type="text" name="Login" placeholder="Login" />
+    <input type="text" name="Nome" placeholder="Nome" />
+    <input type="password" name="Senha" placeholder="Senha" />
+    <textarea name="Bio"></textarea>
+    <select name="Tema"><option value="claro">Claro</option></select>
+    <button type="submit">Cadastrar</button>
+</form>
+"""
+
+SEARCH_FORM = """
+<form method="GET" action="post.php">
+    <input type="text" name="msg" placeholder="Pesquisar mensagem" required />
+    <button type="submit">Pesquisar</button>
+</form>
+"""
+
+
+class StandInState:
+    """Configuração e estado compartilhado do servidor (sessões e contadores)."""
+
+    def __init__(self, latency=0.0, response_size=4096):
+        self.latency = latency
+        self.response_size = response_size
+        self.sessions = {}
+        self.requests = 0
+        self.lock = threading.Lock()
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "Apache/2.4 (stand-in)"
+    # Cabeçalhos e corpo em uma única escrita, sem Nagle: evita que o atraso
+    # de ACK do TCP domine a latência medida
+    wbufsize = -1
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    @property
+    def state(self):
+        return self.server.state
+
+    # --- Sessão ---
+
+    def _session(self):
+        cookie = self.headers.get("Cookie", "")
+        for part in cookie.split(";"):
+            name, _, value = part.strip().partition("=")
+            if name == "PHPSESSID" and value in self.state.sessions:
+                return value, self.state.sessions[value]
+        session_id = secrets.token_hex(13)
+        with self.state.lock:
+            self.state.sessions[session_id] = {}
+        return session_id, self.state.sessions[session_id]
+
+    # --- Respostas ---
+
+    def _page(self, title, body):
+        padding_size = max(0, self.state.response_size - len(body) - 200)
+        padding = "<!-- " + "x" * padding_size + " -->" if padding_size else ""
+        return (f"<html><head><title>{title}</title></head><body>{body}"
+                f"{padding}</body></html>")
+
+    def _send(self, status, content="", session_id=None, location=None):
+        if self.state.latency:
+            time.sleep(self.state.latency)
+        with self.state.lock:
+            self.state.requests += 1
+
+        data = content.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "text/html; charset=UTF-8")
+        self.send_header("Content-Length", str(len(data)))
+        if session_id:
+            self.send_header("Set-Cookie", f"PHPSESSID={session_id}; path=/")
+        if location:
+            self.send_header("Location", location)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _login_page(self, session):
+        message = session.pop("resultado", "")
+        result = f'<p style="color:red">{message}</p>' if message else ""
+        return self._page("Login", LOGIN_FORM + result)
+
+    # --- Rotas ---
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        session_id, session = self._session()
+        user = session.get("usuario")
+
+        if url.path in ("/", "/index.php"):
+            if query.get("page") == ["view/cadastrar.php"]:
+                return self._send(200, self._page("Cadastro", SIGNUP_FORM), session_id)
+            return self._send(200, self._login_page(session), session_id)
+
+        if url.path == "/view/cadastrar.php":
+            return self._send(200, self._page("Cadastro", SIGNUP_FORM), session_id)
+
+        if url.path == "/view/teste-de-conexao.php":
+            return self._send(200, self._page("Conexão", "<p>Conexão com o banco OK</p>"), session_id)
+
+        if not user:
+            return self._send(302, "", session_id, location="/")
+
+        if url.path == "/view/home.php":
+            body = (f"<h1>Bem-vindo, {html.escape(user)}!</h1>{SEARCH_FORM}"
+                    f'<a href="perfil.php?id=1">Perfil</a> <a href="../controller/usuario.php?logout">Sair</a>')
+            return self._send(200, self._page("Home", body), session_id)
+
+        if url.path == "/view/post.php":
+            # Reflete a busca sem escapar, como o original
+            msg = query.get("msg", [""])[0]
+            body = f"<div class='post-container'><p>Resultados para: {msg}</p></div>"
+            return self._send(200, self._page("Post", body), session_id)
+
+        if url.path == "/view/perfil.php":
+            user_id = query.get("id", ["1"])[0]
+            body = f"<h2>Perfil</h2><p>Usuário #{html.escape(user_id)}: {html.escape(user)}</p>{SIGNUP_FORM}"
+            return self._send(200, self._page("Perfil", body), session_id)
+
+        return self._send(404, self._page("404", "<h1>Not Found</h1>"), session_id)
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        length = int(self.headers.get("Content-Length") or 0)
+        form = parse_qs(self.rfile.read(length).decode("utf-8", errors="replace"))
+        session_id, session = self._session()
+
+        if url.path != "/controller/usuario.php":
+            return self._send(404, self._page("404", "<h1>Not Found</h1>"), session_id)
+
+        login = form.get("Login", [""])[0]
+        password = form.get("Senha", [""])[0]
+        injected = any(marker in f"{login} {password}".lower() for marker in SQLI_MARKERS)
+
+        if VALID_USERS.get(login) == password or injected:
+            session["usuario"] = login or "admin"
+            return self._send(302, "", session_id, location="/view/home.php")
+
+        session["resultado"] = "Usuário ou senha inválidos."
+        return self._send(302, "", session_id, location="/")
+
+
+def make_server(host="127.0.0.1", port=0, latency=0.0, response_size=4096, handler=StandInHandler):
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    server.state = StandInState(latency=latency, response_size=response_size)
+    return server
+
+
+def start_server(host="127.0.0.1", port=0, latency=0.0, response_size=4096, handler=StandInHandler):
+    """
+    Inicia o servidor em uma thread e retorna (server, base_url). handler
+    permite acrescentar rotas (subclasse de StandInHandler).
+    """
+    server = make_server(host, port, latency, response_size, handler)
+    threading.Thread(target=server.serve_forever, name="standin", daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}"
+
+
+def serve(host, port, latency, response_size, ready=None):
+    """Executa o servidor no processo atual até ser interrompido."""
+    server = make_server(host, port, latency, response_size)
+    if ready is not None:
+        ready.put(server.server_address[1])
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Servidor stand-in do ChitChat para benchmarks.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8099)
+    parser.add_argument("--latency", type=float, default=0.0, help="Latência artificial por resposta (s)")
+    parser.add_argument("--response-size", type=int, default=4096, help="Tamanho aproximado das páginas (bytes)")
+    args = parser.parse_args()
+    print(f"Stand-in em http://{args.host}:{args.port}")
+    serve(args.host, args.port, args.latency, args.response_size)
@@ -0,0 +1,156 @@
+import json
+import os
+import threading
+import time
+from datetime import datetime
+
+from config import CHECKPOINT_DIR, CHECKPOINT_INTERVAL, BR_TIMEZONE, redact_params
+from wordlists import Wordlist
+
+
+def serialize_params(params):
+    """
+    Converte os parâmetros de um ataque para JSON (Wordlists viram o caminho
+    do arquivo; senhas de SECRET_PARAMS são descartadas).
+    """
+    serialized = {}
+    for key, value in redact_params(params).items():
+        if isinstance(value, Wordlist):
+            serialized[key] = {"wordlist": str(value.source)} if value.is_file else list(value)
+        else:
+            serialized[key] = value
+    return serialized
+
+
+def deserialize_params(params):
+    """Reconstrói os parâmetros salvos por serialize_params."""
+    restored = {}
+    for key, value in params.items():
+        if isinstance(value, dict) and "wordlist" in value:
+            restored[key] = Wordlist(value["wordlist"])
+        else:
+            restored[key] = value
+    return restored
+
+
+class Checkpoint:
+    """
+    Ponto de retomada de uma execução de ataque, salvo em JSON.
+
+    Guarda a posição no espaço de trabalho (índice no produto de credenciais
+    ou na matriz payload × cenário), os achados e os contadores, além dos
+    parâmetros necessários para reiniciar a execução de onde parou. A
+    gravação é atômica (arquivo temporário + os.replace) e limitada a uma a
+    cada `interval` segundos.
+    """
+
+    def __init__(self, attack_type, directory=CHECKPOINT_DIR, interval=CHECKPOINT_INTERVAL, name=None):
+        slug = attack_type.lower().replace(" ", "_")
+        if name:
+            # Checkpoint próprio (ex.: um job em segundo plano), separado do padrão do ataque
+            slug = f"{slug}_{name}"
+        self.attack_type = attack_type
+        self.name = name
+        self.path = os.path.join(directory, f"{slug}.json")
+        self.interval = interval
+        self.state = None
+        self._last_save = 0.0
+        self._lock = threading.Lock()
+
+    # --- Leitura ---
+
+    def load(self):
+        """Carrega o checkpoint salvo (ou None se não houver)."""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self.state = json.load(f)
+        except (OSError, ValueError):
+            self.state = None
+        return self.state
+
+    def can_resume(self):
+        state = self.state if self.state is not None else self.load()
+        return bool(state) and state.get("status") == "running"
+
+    @property
+    def position(self):
+        return self.state.get("position", 0) if self.state else 0
+
+    @property
+    def findings(self):
+        return self.state.get("findings", []) if self.state else []
+
+    @property
+    def counters(self):
+        return self.state.get("counters", {}) if self.state else {}
+
+    @property
+    def params(self):
+        return deserialize_params(self.state.get("params", {})) if self.state else {}
+
+    # --- Escrita ---
+
+    def start(self, target_url, params, log_file):
+        """Inicia um checkpoint novo para uma execução do zero."""
+        self.state = {
+            "attack_type": self.attack_type,
+            "status": "running",
+            "target_url": target_url,
+            "params": serialize_params(params),
+            "log_file": log_file,
+            "started_at": datetime.now(BR_TIMEZONE).strftime("%Y-%m-%d %H:%M:%S"),
+            "position": 0,
+            "total": None,
+            "findings": [],
+            "counters": {},
+        }
+        self._save()
+
+    def update(self, position, findings=None, counters=None, total=None, force=False):
+        """Atualiza a posição/achados; grava em disco no máximo a cada `interval` segundos."""
+        with self._lock:
+            if self.state is None:
+                return
+            self.state["position"] = position
+            if findings is not None:
+                self.state["findings"] = findings
+            if counters is not None:
+                self.state["counters"] = counters
+            if total is not None:
+                self.state["total"] = total
+            if not force and time.monotonic() - self._last_save < self.interval:
+                return
+            self._save()
+
+    def flush(self):
+        """Grava o estado atual sem esperar o intervalo (ex.: ao cancelar)."""
+        with self._lock:
+            if self.state is not None:
+                self._save()
+
+    def complete(self):
+        """Marca a execução como concluída e remove o checkpoint."""
+        with self._lock:
+            self.state = None
+            try:
+                os.remove(self.path)
+            except OSError:
+                pass
+
+    @property
+    def saved_at(self):
+        """Epoch da última gravação em disco (o que a retomada vai usar)."""
+        return self.state.get("saved_at") if self.state else None
+
+    def _save(self):
+        self.state["updated_at"] = datetime.now(BR_TIMEZONE).strftime("%Y-%m-%d %H:%M:%S")
+        self.state["saved_at"] = round(time.time(), 3)  # Mesma precisão do ts dos eventos
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.state, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+            self._last_save = time.monotonic()
+        except (OSError, TypeError) as e:
+            print(f"Erro ao salvar checkpoint: {e}")
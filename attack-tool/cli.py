@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+Execução headless dos ataques, sem Streamlit.
+
+Exemplos:
+    python cli.py brute-force --target http://web:80/controller/usuario.php \\
+        --usernames wordlists/usernames.txt --passwords wordlists/passwords.txt --delay 0.2
+    python cli.py --pacing adaptive --max-rps 50 sqli --target http://web:80/controller/usuario.php
+    python cli.py access-control --target http://web:80 --endpoint /view/home.php
+    python cli.py access-control --target http://web:80 --endpoints-file endpoints.txt \\
+        --matrix --user user:123456 --admin admin:admin --concurrency 6
+    python cli.py --load-session --crawl xss --target http://web:80/view/home.php
+    python cli.py --processes 4 sqli --target http://web:80/controller/usuario.php
+
+A saída padrão é um único objeto JSON com o resultado. Códigos de saída:
+    0 - execução concluída sem achados
+    1 - execução concluída com achados (credenciais válidas / vulnerabilidades)
+    2 - erro de uso ou falha na execução
+"""
+import argparse
+import contextlib
+import json
+import os
+import sys
+
+EXIT_CLEAN = 0
+EXIT_FINDINGS = 1
+EXIT_ERROR = 2
+
+COMMANDS = {
+    "brute-force": "Brute Force",
+    "sqli": "SQL Injection",
+    "xss": "XSS",
+    "access-control": "Access Control",
+}
+
+
+def read_lines(path):
+    """Lê um arquivo com um item por linha (ignorando linhas vazias)."""
+    with open(path, 'r', encoding='utf-8') as f:
+        return [line.strip() for line in f if line.strip()]
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="cli.py",
+        description="Executa os ataques do Web Security Tester pela linha de comando.",
+    )
+    parser.add_argument("--log-dir", help="Diretório dos logs e checkpoints (padrão: ATTACK_LOG_DIR ou /app/logs)")
+    parser.add_argument("--load-session", action="store_true", help="Reutiliza os cookies da sessão salva")
+    parser.add_argument("--session-file", default="sessions/current_session.pkl", help="Arquivo de sessão (cookies)")
+    parser.add_argument("--resume", action="store_true", help="Retoma a última execução interrompida do ataque")
+    parser.add_argument("--http-cache", action="store_true",
+                        help="Reaproveita GETs de descoberta entre execuções (ETag/Last-Modified + TTL)")
+    parser.add_argument("--http-cache-ttl", type=float, default=None, help="TTL (s) do cache HTTP")
+    parser.add_argument("--http-cache-file", default=None,
+                        help="Arquivo do cache HTTP (padrão: http_cache.pkl ao lado do arquivo de sessão)")
+    parser.add_argument("--pretty", action="store_true", help="JSON indentado")
+    parser.add_argument("--pacing", choices=["fixed", "adaptive"], default=None,
+                        help="Ritmo das requisições: delay fixo (padrão) ou adaptativo (AIMD)")
+    parser.add_argument("--max-rps", type=float, default=None, help="Teto de requisições por segundo")
+    parser.add_argument("--processes", type=int, default=None,
+                        help="Divide o ataque em shards executados por N processos (brute-force, sqli, xss)")
+    parser.add_argument("--listen", default=None,
+                        help="host:porta da fila distribuída para workers remotos (python distributed.py --connect ...; "
+                             "chave em ATTACK_DISTRIBUTED_AUTHKEY)")
+    parser.add_argument("--shard-size", type=int, default=None, help="Itens (credenciais/payloads) por shard")
+    parser.add_argument("--crawl", action="store_true",
+                        help="Descobre páginas/formulários com o crawler antes do ataque (sqli, xss, access-control)")
+    parser.add_argument("--crawl-start", help="URL inicial do crawler (padrão: ATTACK_BASE_URL)")
+    parser.add_argument("--crawl-depth", type=int, default=None, help="Profundidade máxima do crawler")
+    parser.add_argument("--crawl-max-pages", type=int, default=None, help="Máximo de páginas visitadas")
+
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    brute = subparsers.add_parser("brute-force", help="Brute force no formulário de login")
+    brute.add_argument("--target", required=True, help="URL do formulário de login")
+    brute.add_argument("--usernames", required=True, help="Wordlist de usernames (um por linha)")
+    brute.add_argument("--passwords", required=True, help="Wordlist de passwords (um por linha)")
+    brute.add_argument("--max-attempts", type=int, default=50)
+    brute.add_argument("--delay", type=float, default=1.0)
+    brute.add_argument("--concurrency", type=int, default=1)
+    brute.add_argument("--max-per-host", type=int, default=None)
+    brute.add_argument("--order", choices=["user", "spray"], default="user",
+                       help="user: todas as senhas de cada usuário; spray: cada senha em todos os usuários")
+    brute.add_argument("--keep-going", action="store_true",
+                       help="Continua testando um usuário depois da senha válida")
+    brute.add_argument("--frequency", action="store_true",
+                       help="Ordena as senhas por frequência (lê a wordlist inteira antes da primeira tentativa)")
+    brute.add_argument("--no-dedup", action="store_true", help="Mantém usernames/senhas repetidos (a deduplicação guarda as senhas únicas em memória)")
+
+    for name, help_text in (("sqli", "Teste de SQL Injection"), ("xss", "Teste de XSS")):
+        sub = subparsers.add_parser(name, help=help_text)
+        sub.add_argument("--target", required=True, help="URL alvo")
+        sub.add_argument("--payloads", help="Arquivo de payloads customizados (padrão: payloads embutidos)")
+        if name == "sqli":
+            sub.add_argument("--blind-extract", action="store_true",
+                             help="Após a detecção, extrai Forum.Usuario por injeção blind booleana")
+            sub.add_argument("--blind-workers", type=int, default=4, help="Caracteres extraídos em paralelo")
+            sub.add_argument("--blind-max-rows", type=int, default=10, help="Máximo de linhas extraídas")
+
+    access = subparsers.add_parser("access-control", help="Teste de controle de acesso")
+    access.add_argument("--target", required=True, help="URL base")
+    access.add_argument("--endpoint", action="append", default=[], help="Endpoint a testar (repetível)")
+    access.add_argument("--endpoints-file", help="Arquivo com endpoints (um por linha)")
+    access.add_argument("--matrix", action="store_true",
+                        help="Busca cada endpoint como anônimo, usuário e admin e compara as respostas")
+    access.add_argument("--user", metavar="LOGIN:SENHA", help="Credenciais do usuário comum (modo matriz)")
+    access.add_argument("--admin", metavar="LOGIN:SENHA", help="Credenciais do admin (modo matriz, obrigatório)")
+    access.add_argument("--concurrency", type=int, default=1, help="Requisições em paralelo (modo matriz)")
+
+    return parser
+
+
+def parse_credentials(value):
+    """LOGIN:SENHA -> (login, senha); a senha pode conter ':'."""
+    if not value:
+        return None
+    username, sep, password = value.partition(":")
+    if not sep or not username:
+        raise ValueError(f"credenciais no formato LOGIN:SENHA: {value}")
+    return username, password
+
+
+def build_params(args):
+    """Converte os argumentos da linha de comando nos params de runner.run_attack."""
+    from wordlists import Wordlist
+
+    params = {}
+    if args.pacing:
+        params["pacing"] = args.pacing
+    if args.max_rps:
+        params["max_rps"] = args.max_rps
+    for key in ("processes", "listen", "shard_size"):
+        if getattr(args, key) is not None:
+            params[key] = getattr(args, key)
+    if args.crawl:
+        params["crawl"] = True
+        for key in ("crawl_start", "crawl_depth", "crawl_max_pages"):
+            if getattr(args, key) is not None:
+                params[key] = getattr(args, key)
+
+    if args.command == "brute-force":
+        return {
+            **params,
+            "usernames": Wordlist(args.usernames),
+            "passwords": Wordlist(args.passwords),
+            "max_attempts": args.max_attempts,
+            "delay": args.delay,
+            "concurrency": args.concurrency,
+            "max_per_host": args.max_per_host or args.concurrency,
+            "credential_order": args.order,
+            "stop_on_success": not args.keep_going,
+            "frequency_order": args.frequency,
+            "dedup": not args.no_dedup,
+        }
+    if args.command == "sqli":
+        return {
+            **params,
+            "payloads": read_lines(args.payloads) if args.payloads else None,
+            "blind_extraction": args.blind_extract,
+            "blind_workers": args.blind_workers,
+            "blind_max_rows": args.blind_max_rows,
+        }
+    if args.command == "xss":
+        return {**params, "payloads": read_lines(args.payloads) if args.payloads else None}
+
+    endpoints = list(args.endpoint)
+    if args.endpoints_file:
+        endpoints.extend(read_lines(args.endpoints_file))
+    params["endpoints"] = endpoints
+    if args.matrix:
+        params.update({
+            "matrix": True,
+            "user_credentials": parse_credentials(args.user),
+            "admin_credentials": parse_credentials(args.admin),
+            "concurrency": args.concurrency,
+        })
+    return params
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+
+    if args.log_dir:
+        # Precisa ser definido antes de importar config (via runner)
+        os.environ["ATTACK_LOG_DIR"] = os.path.abspath(args.log_dir)
+
+    from session_manager import SessionManager
+    from runner import run_attack
+    from config import HTTP_CACHE_TTL
+
+    attack_type = COMMANDS[args.command]
+    # stdout fica reservado para o JSON; mensagens informativas vão para stderr
+    try:
+        params = build_params(args)
+        if args.command == "access-control" and not params["endpoints"] and not args.crawl:
+            raise ValueError("informe ao menos um --endpoint, --endpoints-file ou --crawl")
+        if params.get("matrix") and not params["admin_credentials"]:
+            raise ValueError("o modo matriz exige --admin LOGIN:SENHA")
+
+        with contextlib.redirect_stdout(sys.stderr):
+            session_manager = SessionManager(session_file=args.session_file)
+            if args.http_cache:
+                cache_file = args.http_cache_file or os.path.join(
+                    os.path.dirname(args.session_file), "http_cache.pkl")
+                ttl = HTTP_CACHE_TTL if args.http_cache_ttl is None else args.http_cache_ttl
+                session_manager.enable_http_cache(ttl=ttl, path=cache_file)
+            if args.load_session:
+                session_manager.load_session()
+
+            attack_result = run_attack(session_manager, attack_type, args.target, params, resume=args.resume)
+    except Exception as e:
+        json.dump({"attack": attack_type, "error": str(e)}, sys.stdout)
+        sys.stdout.write("\n")
+        return EXIT_ERROR
+
+    output = {"attack": attack_type, "target": args.target, **attack_result}
+    json.dump(output, sys.stdout, ensure_ascii=False, indent=2 if args.pretty else None, default=str)
+    sys.stdout.write("\n")
+    return EXIT_FINDINGS if attack_result["success_count"] else EXIT_CLEAN
+
+
+if __name__ == "__main__":
+    sys.exit(main())
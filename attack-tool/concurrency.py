@@ -0,0 +1,74 @@
+import threading
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from urllib.parse import urlparse
+
+
+class HostLimiter:
+    """
+    Limita o número de requisições simultâneas por host, independente
+    do número de workers do pool.
+    """
+
+    def __init__(self, max_per_host=None):
+        self.max_per_host = max_per_host
+        self._semaphores = {}
+        self._lock = threading.Lock()
+
+    def _get_semaphore(self, url):
+        host = urlparse(url).netloc
+        with self._lock:
+            semaphore = self._semaphores.get(host)
+            if semaphore is None:
+                semaphore = threading.BoundedSemaphore(self.max_per_host)
+                self._semaphores[host] = semaphore
+            return semaphore
+
+    @contextmanager
+    def slot(self, url):
+        """Reserva uma vaga de requisição para o host da URL."""
+        if not self.max_per_host:
+            yield
+            return
+        semaphore = self._get_semaphore(url)
+        with semaphore:
+            yield
+
+
+def bounded_map(func, items, workers, max_in_flight=None):
+    """
+    Executa func(item) em um pool de threads consumindo o iterável sob demanda.
+
+    Nunca mais do que max_in_flight itens ficam submetidos ao mesmo tempo, então
+    iteráveis grandes (ou infinitos) não são materializados em memória.
+    Produz tuplas (item, resultado, erro) na ordem de conclusão; o consumo do
+    gerador acontece sempre na thread chamadora.
+    """
+    workers = max(1, int(workers))
+    max_in_flight = max(workers, max_in_flight or workers * 2)
+    iterator = iter(items)
+    executor = ThreadPoolExecutor(max_workers=workers)
+    pending = {}
+
+    def submit_next():
+        try:
+            item = next(iterator)
+        except StopIteration:
+            return False
+        pending[executor.submit(func, item)] = item
+        return True
+
+    try:
+        while len(pending) < max_in_flight and submit_next():
+            pass
+
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                item = pending.pop(future)
+                error = future.exception()
+                result = None if error else future.result()
+                yield item, result, error
+                submit_next()
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
@@ -1,26 +1,117 @@
+import atexit
 import os
+import threading
 from datetime import datetime, timedelta, timezone
 
+from log_writer import BufferedLogWriter
+
 # --- Configurações Globais ---
-BASE_URL = "http://web:80"
-LOG_DIR = "/app/logs"
+BASE_URL = os.environ.get("ATTACK_BASE_URL", "http://web:80")
+LOG_DIR = os.environ.get("ATTACK_LOG_DIR", "/app/logs")
 SLEEP_INTERVAL = 1
 TARGET_USERNAME = "admin"
- 
-# Criar diretório de logs
-os.makedirs(LOG_DIR, exist_ok=True)
+
+# --- Transporte HTTP ---
+HTTP_POOL_SIZE = 10        # Conexões keep-alive por host (ajustado à concorrência)
+HTTP_TIMEOUT = 15          # Timeout padrão (s) quando a requisição não define um
+HTTP_RETRIES = 2           # Retentativas em falhas de conexão (a requisição não chegou ao alvo)
+HTTP_RETRY_STATUSES = ()   # Status que repetem GETs (ex.: (502, 503, 504)); opt-in: repete o payload
+DNS_CACHE_TTL = 300        # Tempo (s) que a resolução do host fica em cache
+
+# --- Cache HTTP de GETs de descoberta (http_cache.HTTPCache, opcional) ---
+HTTP_CACHE_ENABLED = os.environ.get("ATTACK_HTTP_CACHE", "0") == "1"
+HTTP_CACHE_TTL = 300       # Tempo (s) em que a resposta é reaproveitada sem requisição
+HTTP_CACHE_FILE = os.path.join("sessions", "http_cache.pkl")  # Persistência entre execuções
+
+# --- Pool de sessões de várias identidades (session_pool.SessionPool) ---
+SESSION_POOL_DIR = os.path.join("sessions", "pool")  # Sessão salva de cada identidade
+SESSION_POOL_PROBE = "/view/home.php"  # Página autenticada: distingue sessão expirada de acesso negado
+# Params com credenciais (username, password): a senha nunca vai para checkpoint nem banco
+SECRET_PARAMS = ("user_credentials", "admin_credentials")
+
+# --- Ritmo das requisições (pacing.Pacer) ---
+PACING_MODE = "fixed"      # "fixed" (delay aleatório, como antes) ou "adaptive" (AIMD, opcional)
+PACING_MAX_RPS = 20.0      # Teto de requisições por segundo
+PACING_INITIAL_RPS = 2.0   # Taxa inicial do modo adaptativo
+PACING_MIN_RPS = 0.2       # Taxa mínima do modo adaptativo
+PACING_INCREASE = 0.5      # Aumento aditivo (req/s) por resposta saudável
+PACING_DECREASE = 0.5      # Fator multiplicativo aplicado em erro/lentidão
+PACING_LATENCY_FACTOR = 3.0  # Latência > fator × menor latência observada conta como lentidão
+
+# --- Logs em tempo real ---
+BR_TIMEZONE = timezone(timedelta(hours=-3))
+LIVE_LOG_LINES = 15        # Linhas exibidas na área de logs em tempo real
+LIVE_LOG_MAX_FPS = 4       # Máximo de redesenhos da interface por segundo
+
+# --- Escrita dos arquivos de log ---
+LOG_FLUSH_INTERVAL = 0.5   # Intervalo (s) entre gravações em lote
+LOG_FSYNC = "never"        # "never", "batch" (após cada lote) ou "close" (em flush/encerramento)
+
+# --- Checkpoints (retomada de execuções interrompidas) ---
+CHECKPOINT_DIR = os.path.join(LOG_DIR, "checkpoints")
+CHECKPOINT_INTERVAL = 5    # Intervalo mínimo (s) entre gravações do checkpoint
+
+# --- Banco de resultados (results_store.ResultsStore) ---
+RESULTS_DB = os.environ.get("ATTACK_RESULTS_DB", os.path.join(LOG_DIR, "results.sqlite3"))
+
+# --- Jobs em segundo plano (jobs.JobManager) ---
+JOBS_MAX_WORKERS = int(os.environ.get("ATTACK_JOBS_WORKERS", "2"))  # Jobs executados ao mesmo tempo
+JOBS_MAX_QUEUED = 20       # Jobs aguardando na fila
+JOBS_HISTORY = 50          # Jobs finalizados mantidos na lista
+JOB_MAX_RPS = 50.0         # Teto de requisições por segundo de cada job
+JOB_MAX_CONCURRENCY = 20   # Máximo de workers/threads de cada job
+JOB_MAX_PROCESSES = 4      # Máximo de processos locais de cada job (execução distribuída)
+JOB_TIMEOUT = 4 * 3600     # Tempo máximo (s) de um job antes do cancelamento; 0 desativa
+
+_log_names = set()
+_log_names_lock = threading.Lock()
+
+_log_writer = BufferedLogWriter(flush_interval=LOG_FLUSH_INTERVAL, fsync=LOG_FSYNC)
+atexit.register(_log_writer.close)
 
 def get_log_filename(test_type="attack"):
-    """Gera um nome de arquivo de log com timestamp"""
-    utc_minu_3 = timezone(timedelta(hours=-3))
-    timestamp = datetime.now(utc_minu_3).strftime("%Y%m%d_%H%M%S")
-    return os.path.join(LOG_DIR, f"{test_type}_{timestamp}.log")
+    """Gera um nome de arquivo de log com timestamp (criando o diretório de logs se preciso)"""
+    os.makedirs(LOG_DIR, exist_ok=True)
+    timestamp = datetime.now(BR_TIMEZONE).strftime("%Y%m%d_%H%M%S")
+    base = os.path.join(LOG_DIR, f"{test_type}_{timestamp}")
+    # Execuções iniciadas no mesmo segundo (jobs em paralelo) recebem um sufixo
+    with _log_names_lock:
+        path, counter = f"{base}.log", 1
+        while path in _log_names or os.path.exists(path):
+            counter += 1
+            path = f"{base}_{counter}.log"
+        _log_names.add(path)
+    return path
+
+def redact_params(params):
+    """Cópia dos params sem as senhas de SECRET_PARAMS (o username é mantido)."""
+    redacted = dict(params)
+    for key in SECRET_PARAMS:
+        if redacted.get(key):
+            redacted[key] = [redacted[key][0], None]
+    return redacted
+
+
+def restore_secrets(saved, live):
+    """Params salvos (sem senhas) com as credenciais informadas de novo na retomada."""
+    restored = dict(saved)
+    for key in SECRET_PARAMS:
+        if live.get(key):
+            restored[key] = live[key]
+    return restored
+
 
 def log_result(message, log_file):
-    """Escreve uma mensagem no arquivo de log e no console"""
-    utc_minu_3 = timezone(timedelta(hours=-3))
-    with open(log_file, "a", encoding='utf-8') as f:
-        f.write(f"[{datetime.now(utc_minu_3).strftime('%Y-%m-%d %H:%M:%S')}] {message}\n")
+    """Enfileira uma mensagem para o arquivo de log (gravada em lote em segundo plano)"""
+    _log_writer.write(log_file, f"[{datetime.now(BR_TIMEZONE).strftime('%Y-%m-%d %H:%M:%S')}] {message}\n")
+
+def log_text(text, log_file):
+    """Enfileira um bloco de texto já formatado para o arquivo de log"""
+    _log_writer.write(log_file, text)
+
+def flush_logs(timeout=5.0):
+    """Garante que todas as mensagens enfileiradas foram gravadas em disco"""
+    return _log_writer.flush(timeout)
 
 # Endpoints para testar
 ENDPOINTS = {
@@ -54,7 +145,3 @@ ENDPOINTS = {
     }
 }
 
-data = get_log_filename()
-print(data)
-log_result("aaaaaaa", data)
-print("aaaaaaaaaaa")
@@ -0,0 +1,499 @@
+"""
+Execução distribuída de ataques grandes em vários processos (e máquinas).
+
+O coordenador divide o espaço de trabalho em shards - faixas do produto de
+credenciais no brute force, fatias da lista de payloads no SQLi/XSS (cada
+shard cobre payload × cenário × campo para os seus payloads) - e os publica
+em uma fila servida por multiprocessing.managers. Workers locais são
+processos iniciados pelo próprio coordenador; workers em outras máquinas
+se conectam à mesma fila, com a mesma chave em ATTACK_DISTRIBUTED_AUTHKEY:
+
+    ATTACK_DISTRIBUTED_AUTHKEY=... python distributed.py --connect coordenador:50000 --processes 4
+
+A descoberta (e o baseline do SQLi) é feita uma vez pelo coordenador e vai
+para os workers no job. Cada worker tem seu próprio SessionManager (com os
+cookies da sessão do coordenador) e devolve, por shard, achados, contadores,
+o log de texto e os eventos estruturados, que o coordenador junta em um
+único relatório e log. No cancelamento, o coordenador descarta os shards
+pendentes e marca "stop" no job: os workers interrompem o shard em
+andamento e devolvem o resultado parcial.
+"""
+import argparse
+import math
+import multiprocessing
+import os
+import queue
+import secrets
+import sys
+import tempfile
+import threading
+import time
+from dataclasses import asdict
+from itertools import islice
+from multiprocessing.managers import BaseManager, DictProxy
+
+from config import log_text, flush_logs, PACING_MAX_RPS
+from events import EventLog
+from attacks.credential_strategies import CredentialStrategy
+
+DISTRIBUTED_ATTACKS = ["Brute Force", "SQL Injection", "XSS"]
+SHARDS_PER_PROCESS = 4      # Shards por processo: equilibra a carga quando shards demoram tempos diferentes
+LOCAL_IDLE_TIMEOUT = 5.0    # Espera (s) de um worker local por trabalho antes de desistir
+REMOTE_IDLE_TIMEOUT = 60.0  # Espera (s) de um worker remoto por trabalho antes de desistir
+STOP_POLL_INTERVAL = 0.5    # Intervalo (s) entre consultas do worker ao sinal de parada
+STOP_GRACE = 15.0           # Espera (s) pelos shards em andamento depois do cancelamento
+AUTHKEY_ENV = "ATTACK_DISTRIBUTED_AUTHKEY"
+
+_STOP = "stop"              # Sentinela na fila de tarefas (reposto para os demais workers)
+
+# Estado do processo servidor da fila (criado sob demanda dentro dele)
+_tasks = None
+_results = None
+_job = {}
+
+
+def _get_tasks():
+    global _tasks
+    if _tasks is None:
+        _tasks = queue.Queue()
+    return _tasks
+
+
+def _get_results():
+    global _results
+    if _results is None:
+        _results = queue.Queue()
+    return _results
+
+
+def _get_job():
+    return _job
+
+
+class _QueueServer(BaseManager):
+    """Servidor da fila (processo próprio, iniciado pelo coordenador)."""
+
+
+_QueueServer.register("get_tasks", callable=_get_tasks)
+_QueueServer.register("get_results", callable=_get_results)
+_QueueServer.register("get_job", callable=_get_job, proxytype=DictProxy)
+
+
+class _QueueClient(BaseManager):
+    """Conexão de um worker (local ou remoto) ao servidor da fila."""
+
+
+_QueueClient.register("get_tasks")
+_QueueClient.register("get_results")
+_QueueClient.register("get_job", proxytype=DictProxy)
+
+
+def _parse_address(address):
+    host, _, port = address.rpartition(":")
+    return (host or "127.0.0.1", int(port))
+
+
+# --- Worker ---
+
+def _session_manager_for(job):
+    from session_manager import SessionManager
+
+    session_manager = SessionManager(session_file=os.path.join(tempfile.gettempdir(), "distributed_session.pkl"))
+    for name, value, domain, path in job["cookies"]:
+        session_manager.session.cookies.set(name, value, domain=domain, path=path)
+    session_manager.is_authenticated = job["is_authenticated"]
+    session_manager.is_admin = job["is_admin"]
+    return session_manager
+
+
+def run_shard(job, shard_index, work, cancel_event=None):
+    """
+    Executa um shard com um SessionManager próprio e devolve achados,
+    contadores, o log de texto do shard e os eventos estruturados.
+    cancel_event interrompe o shard entre itens (resultado parcial).
+    """
+    from runner import build_pacer  # Import tardio: runner importa este módulo
+    from attacks.brute_force import BruteForceAttack
+    from attacks.sql_injection import SQLInjectionAttack
+    from attacks.xss import XSSAttack
+
+    attack_type = job["attack_type"]
+    params = job["params"]
+    prepared = job.get("prepared") or {}
+    session_manager = _session_manager_for(job)
+    records = []
+    events = EventLog(run_id=job["run_id"], listeners=[records.append])
+    fd, log_file = tempfile.mkstemp(prefix=f"shard_{shard_index}_", suffix=".log")
+    os.close(fd)
+    result = {"shard": shard_index, "worker": f"{os.uname().nodename}:{os.getpid()}",
+              "findings": [], "attempts": 0, "error": None}
+
+    try:
+        pacer = build_pacer(attack_type, params, cancel_event)
+        if attack_type == "Brute Force":
+            attack = BruteForceAttack(session_manager)
+            attack.run(job["target_url"], [], [], credentials=work, max_attempts=len(work),
+                       pacer=pacer, concurrency=params.get('concurrency', 1),
+                       max_per_host=params.get('max_per_host'), log_file=log_file, events=events,
+                       strategy=CredentialStrategy.from_params(params))
+            result["attempts"] = attack.total_attempts
+            result["findings"] = [{"username": u, "password": p} for u, p in attack.valid_credentials]
+        elif attack_type == "SQL Injection":
+            attack = SQLInjectionAttack(session_manager)
+            attack.run(job["target_url"], work, log_file=log_file, pacer=pacer, events=events,
+                       scenarios=prepared.get("scenarios"), baselines=prepared.get("baselines"))
+            result["attempts"] = attack.total_attempts
+            result["findings"] = [asdict(v) for v in attack.vulnerabilities]
+        elif attack_type == "XSS":
+            attack = XSSAttack(session_manager)
+            _, result["attempts"] = attack.run(job["target_url"], work, log_file=log_file, pacer=pacer,
+                                               events=events, injection_points=prepared.get("injection_points"))
+            result["findings"] = list(attack.vulnerabilities)
+        else:
+            raise ValueError(f"Ataque não suportado no modo distribuído: {attack_type}")
+    except Exception as e:
+        result["error"] = str(e)
+    finally:
+        flush_logs()
+        with open(log_file, "r", encoding="utf-8", errors="replace") as f:
+            result["log"] = f.read()
+        os.remove(log_file)
+
+    result["events"] = records
+    return result
+
+
+def _watch_stop(job_proxy, stop, done):
+    """Thread do worker: repassa o "stop" do job do coordenador para o evento local."""
+    while not done.wait(STOP_POLL_INTERVAL):
+        try:
+            if job_proxy.get("stop"):
+                stop.set()
+                return
+        except (EOFError, OSError):
+            # Servidor da fila encerrado: não há mais para quem devolver resultados
+            stop.set()
+            return
+
+
+def worker_loop(address, authkey, idle_timeout=LOCAL_IDLE_TIMEOUT):
+    """Processa shards da fila do coordenador até a sentinela de parada (ou ociosidade)."""
+    manager = _QueueClient(address=address, authkey=authkey)
+    manager.connect()
+    tasks, results = manager.get_tasks(), manager.get_results()
+    job_proxy = manager.get_job()
+    job = job_proxy.copy()
+
+    # O shard em andamento é interrompido pelo Pacer assim que o coordenador cancela
+    stop, done = threading.Event(), threading.Event()
+    watcher = threading.Thread(target=_watch_stop, args=(job_proxy, stop, done), daemon=True)
+    watcher.start()
+
+    processed = 0
+    try:
+        while not stop.is_set():
+            try:
+                task = tasks.get(timeout=idle_timeout)
+            except queue.Empty:
+                break
+            if task == _STOP:
+                tasks.put(_STOP)
+                break
+            shard_index, work = task
+            results.put(run_shard(job, shard_index, work, cancel_event=stop))
+            processed += 1
+    finally:
+        done.set()
+    return processed
+
+
+def _local_worker(address, authkey):
+    # Processo filho (spawn): stdout é só ruído para o coordenador
+    sys.stdout = open(os.devnull, "w")
+    worker_loop(address, authkey)
+
+
+# --- Coordenador ---
+
+class Coordinator:
+    """
+    Divide um ataque em shards, distribui entre processos (e workers remotos,
+    se listen for informado) e junta os resultados à medida que chegam.
+    """
+
+    def __init__(self, session_manager, attack_type, target_url, params, processes=2,
+                 shard_size=None, listen=None, authkey=None, add_log=print, should_stop=None,
+                 pacer=None):
+        if attack_type not in DISTRIBUTED_ATTACKS:
+            raise ValueError(f"Ataque não suportado no modo distribuído: {attack_type}")
+        self.session_manager = session_manager
+        self.attack_type = attack_type
+        self.target_url = target_url
+        self.params = params
+        self.processes = max(0, int(processes))
+        self.shard_size = shard_size
+        self.listen = listen
+        # Workers remotos precisam da mesma chave, que nunca vai para o log:
+        # com listen ela é obrigatória; só com processos locais pode ser aleatória
+        authkey = authkey or os.environ.get(AUTHKEY_ENV)
+        if listen and not authkey:
+            raise ValueError(f"A fila para workers remotos exige uma chave em {AUTHKEY_ENV} "
+                             "(a mesma nos workers)")
+        self.authkey = (authkey or secrets.token_hex(16)).encode()
+        self.add_log = add_log
+        self.credential_plan = None
+        # Função consultada entre shards; True descarta os shards pendentes e para os em andamento
+        self.should_stop = should_stop
+        # Ritmo da descoberta/baseline feitos pelo coordenador
+        self.pacer = pacer
+
+    # --- Espaço de trabalho ---
+
+    def _payloads(self):
+        if self.attack_type == "SQL Injection":
+            from attacks.sql_injection import SQLInjectionAttack
+            return self.params.get('payloads') or SQLInjectionAttack(self.session_manager).get_flattened_payloads()
+        from attacks.xss import XSSAttack
+        return XSSAttack(self.session_manager).get_flattened_payloads(self.params.get('payloads'))
+
+    def work_space(self):
+        """(total de itens, iterador de itens) do ataque."""
+        if self.attack_type == "Brute Force":
+            # Plano global: usuários com senha já encontrada saem dos shards ainda não gerados
+            self.credential_plan = CredentialStrategy.from_params(self.params).plan(
+                self.params.get('usernames') or [], self.params.get('passwords') or [])
+            total = min(self.credential_plan.total, self.params.get('max_attempts', 50))
+            return total, ((u, p) for _, u, p in self.credential_plan.iter(limit=total))
+        payloads = list(self._payloads())
+        return len(payloads), iter(payloads)
+
+    def shards(self, total, items):
+        """Shards (índice, lista de itens) gerados sob demanda."""
+        workers = max(1, self.processes)
+        size = self.shard_size or max(1, math.ceil(total / (workers * SHARDS_PER_PROCESS)))
+        index = 0
+        while True:
+            chunk = list(islice(items, size))
+            if not chunk:
+                return
+            yield index, chunk
+            index += 1
+
+    def prepare(self, catalogue=None, events=None):
+        """
+        Descoberta dos pontos de injeção (e baseline, no SQLi) feita uma vez
+        aqui; o resultado vai para os shards no job em vez de ser refeito por
+        cada um.
+        """
+        add_log = self.add_log
+        if self.attack_type == "SQL Injection":
+            from attacks.sql_injection import SQLInjectionAttack
+            attack = SQLInjectionAttack(self.session_manager)
+            if self.pacer is not None:
+                attack.pacer = self.pacer
+            attack.events = (events or EventLog()).for_module("sql_injection")
+            if catalogue is not None:
+                scenarios = attack.scenarios_from_catalogue(catalogue, add_log)
+            else:
+                scenarios = attack.discover_form_scenarios(self.target_url, add_log)
+            baselines = attack.establish_baseline(scenarios, add_log)
+            return {"scenarios": scenarios, "baselines": baselines}
+        if self.attack_type == "XSS":
+            from attacks.xss import XSSAttack
+            points = XSSAttack(self.session_manager).discover_injection_points(self.target_url, add_log, catalogue)
+            return {"injection_points": sorted(points)}
+        return {}
+
+    def _job(self, run_id, prepared):
+        # Cada worker tem seu próprio Pacer: o teto de requisições é dividido entre os processos locais
+        params = {k: v for k, v in self.params.items() if k not in ("usernames", "passwords", "payloads")}
+        params["max_rps"] = (self.params.get('max_rps') or PACING_MAX_RPS) / max(1, self.processes)
+        return {
+            "run_id": run_id,
+            "attack_type": self.attack_type,
+            "target_url": self.target_url,
+            "params": params,
+            "prepared": prepared,
+            "stop": False,
+            "cookies": [(c.name, c.value, c.domain, c.path) for c in self.session_manager.session.cookies],
+            "is_authenticated": self.session_manager.is_authenticated,
+            "is_admin": self.session_manager.is_admin,
+        }
+
+    # --- Execução ---
+
+    def run(self, log_file, run_id="", catalogue=None, events=None):
+        """Executa todos os shards e retorna o resultado consolidado (mesmo formato do runner)."""
+        add_log = self.add_log
+        events = events or EventLog()
+        context = multiprocessing.get_context("spawn")
+
+        prepared = self.prepare(catalogue, events)
+
+        address = _parse_address(self.listen) if self.listen else ("127.0.0.1", 0)
+        server = _QueueServer(address=address, authkey=self.authkey, ctx=context)
+        server.start()
+        tasks, results = server.get_tasks(), server.get_results()
+        job = server.get_job()
+        job.update(self._job(run_id, prepared))
+        host, port = server.address
+        add_log(f"🧩 Fila distribuída em {host}:{port} ({self.processes} processos locais)")
+        if self.listen:
+            add_log(f"🧩 Workers remotos: python distributed.py --connect {host}:{port} "
+                    f"(chave em {AUTHKEY_ENV})")
+
+        total, items = self.work_space()
+        shard_iter = self.shards(total, items)
+        pending = 0
+        prefetch = max(4, 2 * max(1, self.processes))
+        exhausted = False
+
+        stopping = False
+        stop_deadline = None
+
+        def refill():
+            nonlocal pending, exhausted
+            while not exhausted and not stopping and pending < prefetch:
+                shard = next(shard_iter, None)
+                if shard is None:
+                    exhausted = True
+                    tasks.put(_STOP)
+                    break
+                tasks.put(shard)
+                pending += 1
+
+        refill()
+        workers = [context.Process(target=_local_worker, args=(("127.0.0.1", port), self.authkey), daemon=True)
+                   for _ in range(self.processes)]
+        for process in workers:
+            process.start()
+
+        findings, attempts, done_items, errors = [], 0, 0, 0
+        started = time.monotonic()
+        try:
+            while pending:
+                if not stopping and self.should_stop is not None and self.should_stop():
+                    stopping = True
+                    job["stop"] = True
+                    discarded = self._drain(tasks)
+                    pending -= discarded
+                    stop_deadline = time.monotonic() + STOP_GRACE
+                    add_log(f"⛔ Cancelamento solicitado: {discarded} shards pendentes descartados, "
+                            f"aguardando {pending} em andamento.")
+                    if not pending:
+                        break
+                try:
+                    result = results.get(timeout=1.0)
+                except queue.Empty:
+                    if not self.listen and not any(p.is_alive() for p in workers):
+                        add_log(f"⚠️ Todos os workers terminaram com {pending} shards pendentes")
+                        break
+                    if stopping and time.monotonic() > stop_deadline:
+                        add_log(f"⚠️ {pending} shards não responderam ao cancelamento")
+                        break
+                    continue
+
+                pending -= 1
+                refill()
+                attempts += result["attempts"]
+                findings.extend(result["findings"])
+                if self.credential_plan is not None:
+                    for finding in result["findings"]:
+                        self.credential_plan.mark_valid(finding["username"], finding["password"])
+                done_items += result["attempts"]
+                log_text(f"\n===== 📦 Shard {result['shard']} ({result['worker']}) =====\n{result['log']}", log_file)
+                for record in result["events"]:
+                    events.write({**record, "run_id": run_id})
+                if result["error"]:
+                    errors += 1
+                    add_log(f"🔥 Shard {result['shard']} falhou em {result['worker']}: {result['error']}")
+                progress = min(99, int(done_items / total * 100)) if total else 99
+                add_log(f"📦 Shard {result['shard']} concluído ({result['worker']}): "
+                        f"{result['attempts']} tentativas, {len(result['findings'])} achados", progress)
+        finally:
+            # A sentinela pode ter sido descartada junto com os shards pendentes
+            if not exhausted or stopping:
+                tasks.put(_STOP)
+            for process in workers:
+                process.join(timeout=10)
+                if process.is_alive():
+                    process.terminate()
+            server.shutdown()
+
+        elapsed = time.monotonic() - started
+        if self.credential_plan is not None:
+            self.credential_plan.finalize([(f["username"], f["password"]) for f in findings])
+            add_log(f"🧮 Requisições evitadas (entre shards): {self.credential_plan.describe()}")
+        add_log(f"🧩 {attempts} tentativas em {elapsed:.1f}s ({attempts / elapsed if elapsed else 0:.1f}/s), "
+                f"{len(findings)} achados, {errors} shards com erro")
+        return {
+            "result": self.report(findings, attempts),
+            "attempts": attempts,
+            "success_count": len(findings),
+            "findings": findings,
+        }
+
+    @staticmethod
+    def _drain(tasks):
+        """Remove da fila os shards ainda não iniciados e retorna quantos eram."""
+        discarded = 0
+        while True:
+            try:
+                task = tasks.get_nowait()
+            except queue.Empty:
+                return discarded
+            if task != _STOP:
+                discarded += 1
+
+    def report(self, findings, attempts):
+        """Relatório consolidado no formato do módulo de ataque."""
+        if self.attack_type == "Brute Force":
+            if findings:
+                credentials = [(f["username"], f["password"]) for f in findings]
+                return f"🏆 SUCESSO! Credenciais válidas encontradas: {credentials}"
+            return f"😔 Nenhuma credencial válida encontrada após {attempts} tentativas."
+        if self.attack_type == "SQL Injection":
+            from attacks.sql_injection import SQLInjectionAttack, VulnerabilityResult
+            attack = SQLInjectionAttack(self.session_manager)
+            attack.vulnerabilities = [VulnerabilityResult(**f) for f in findings]
+            attack.total_attempts = attempts
+            attack.successful_attempts = len(findings)
+            attack.failed_attempts = attempts - len(findings)
+            return attack.generate_final_report()
+        from attacks.xss import XSSAttack
+        attack = XSSAttack(self.session_manager)
+        attack.vulnerabilities = findings
+        return attack.generate_report()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Worker remoto da execução distribuída.")
+    parser.add_argument("--connect", required=True, help="Endereço host:porta do coordenador")
+    parser.add_argument("--authkey", default=None,
+                        help=f"Chave da fila (padrão: {AUTHKEY_ENV}, preferível por não aparecer na lista de processos)")
+    parser.add_argument("--processes", type=int, default=1, help="Processos worker nesta máquina")
+    parser.add_argument("--idle-timeout", type=float, default=REMOTE_IDLE_TIMEOUT,
+                        help="Segundos sem trabalho antes de encerrar")
+    args = parser.parse_args(argv)
+
+    address = _parse_address(args.connect)
+    authkey = args.authkey or os.environ.get(AUTHKEY_ENV)
+    if not authkey:
+        parser.error(f"defina {AUTHKEY_ENV} (ou --authkey) com a chave do coordenador")
+    authkey = authkey.encode()
+    if args.processes <= 1:
+        processed = worker_loop(address, authkey, args.idle_timeout)
+        print(f"{processed} shards processados")
+        return 0
+    context = multiprocessing.get_context("spawn")
+    processes = [context.Process(target=worker_loop, args=(address, authkey, args.idle_timeout))
+                 for _ in range(args.processes)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
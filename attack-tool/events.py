@@ -0,0 +1,184 @@
+import json
+import os
+import time
+from collections import deque
+
+from config import log_text
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.json as pa_json
+    import pyarrow.parquet as pq
+except ImportError:  # Exportação colunar é opcional
+    pa = None
+
+EVENT_FIELDS = ["ts", "run_id", "module", "phase", "url", "field", "payload",
+                "status", "latency_ms", "size", "verdict", "detail"]
+FILTER_FIELDS = ["module", "phase", "verdict"]
+
+
+def events_filename(log_file):
+    """Arquivo de eventos de uma execução: mesmo nome do log, extensão .events.jsonl"""
+    return f"{os.path.splitext(log_file)[0]}.events.jsonl"
+
+
+def columnar_available():
+    return pa is not None
+
+
+class EventLog:
+    """
+    Registros tipados (JSON Lines) dos eventos de um ataque, um por
+    requisição relevante: execução, módulo, fase, URL, campo, payload,
+    status, latência, tamanho da resposta e veredicto. Campos extras do
+    módulo vão serializados em detail. A escrita usa o mesmo escritor em
+    lote dos logs de texto, e listeners recebem o mesmo registro; sem path
+    nem listeners, emit() não faz nada.
+    """
+
+    def __init__(self, path=None, run_id="", module="", listeners=()):
+        self.path = path
+        self.run_id = run_id
+        self.module = module
+        # Funções chamadas com cada registro (ex.: ResultsStore.record_event)
+        self.listeners = list(listeners)
+
+    @property
+    def enabled(self):
+        return self.path is not None or bool(self.listeners)
+
+    def for_module(self, module):
+        """EventLog no mesmo arquivo/execução para outro módulo (ex.: crawler)."""
+        return EventLog(self.path, self.run_id, module, self.listeners)
+
+    def emit(self, phase, verdict=None, url=None, field=None, payload=None,
+             response=None, error=None, **detail):
+        if not self.enabled:
+            return
+        record = {
+            "ts": round(time.time(), 3),
+            "run_id": self.run_id,
+            "module": self.module,
+            "phase": phase,
+            "url": url,
+            "field": field,
+            "payload": None if payload is None else str(payload),
+            "status": None,
+            "latency_ms": None,
+            "size": None,
+            "verdict": verdict,
+            "detail": None,
+        }
+        if response is not None:
+            record["url"] = url or str(response.url)
+            record["status"] = response.status_code
+            record["latency_ms"] = round(response.elapsed.total_seconds() * 1000, 1)
+            record["size"] = len(response.content or b"")
+        if error is not None:
+            record["verdict"] = verdict or "error"
+            detail["error"] = str(error)
+        if detail:
+            # Texto JSON: mantém o esquema fixo para a leitura colunar
+            record["detail"] = json.dumps(detail, ensure_ascii=False, default=str)
+        self.write(record)
+
+    def write(self, record):
+        """Grava um registro já montado (ex.: recebido de um worker distribuído)."""
+        if self.path is not None:
+            log_text(json.dumps(record, ensure_ascii=False) + "\n", self.path)
+        for listener in self.listeners:
+            listener(record)
+
+
+# --- Leitura / exportação ---
+
+def _schema():
+    return pa.schema([
+        ("ts", pa.float64()), ("run_id", pa.string()), ("module", pa.string()),
+        ("phase", pa.string()), ("url", pa.string()), ("field", pa.string()),
+        ("payload", pa.string()), ("status", pa.int64()), ("latency_ms", pa.float64()),
+        ("size", pa.int64()), ("verdict", pa.string()), ("detail", pa.string()),
+    ])
+
+
+def read_events_table(path):
+    """Tabela Arrow com todos os eventos do arquivo (requer pyarrow)."""
+    if pa is None:
+        raise RuntimeError("pyarrow não está instalado (pip install pyarrow)")
+    return pa_json.read_json(path, parse_options=pa_json.ParseOptions(explicit_schema=_schema()))
+
+
+def iter_events(path, search=None, **filters):
+    """
+    Eventos do arquivo um a um, filtrados por igualdade em FILTER_FIELDS
+    (valores None são ignorados) e por texto em URL/campo/payload.
+    """
+    filters = {k: v for k, v in filters.items() if v is not None}
+    search = search.lower() if search else None
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                event = json.loads(line)
+            except ValueError:
+                continue  # Linha parcial (execução em andamento)
+            if any(event.get(k) != v for k, v in filters.items()):
+                continue
+            if search and not any(search in (event.get(k) or "").lower() for k in ("url", "field", "payload")):
+                continue
+            yield event
+
+
+def load_events(path, search=None, limit=None, **filters):
+    """
+    DataFrame com os eventos filtrados (no máximo limit, os mais recentes).
+    Com pyarrow, o arquivo é lido e filtrado em formato colunar.
+    """
+    import pandas as pd
+
+    if pa is not None:
+        try:
+            table = read_events_table(path)
+        except pa.ArrowInvalid:
+            table = None  # Linha parcial no fim do arquivo: cai para a leitura linha a linha
+        if table is not None:
+            mask = None
+            for name, value in filters.items():
+                if value is None:
+                    continue
+                condition = pc.equal(table[name], value)
+                mask = condition if mask is None else pc.and_(mask, condition)
+            if search:
+                pattern = search.lower()
+                matches = [pc.fill_null(pc.match_substring(pc.utf8_lower(table[k]), pattern), False)
+                           for k in ("url", "field", "payload")]
+                condition = pc.or_(pc.or_(matches[0], matches[1]), matches[2])
+                mask = condition if mask is None else pc.and_(mask, condition)
+            if mask is not None:
+                table = table.filter(pc.fill_null(mask, False))
+            if limit is not None and table.num_rows > limit:
+                table = table.slice(table.num_rows - limit)
+            return table.to_pandas()
+
+    # Só os últimos limit eventos ficam em memória
+    events = deque(iter_events(path, search=search, **filters), maxlen=limit)
+    return pd.DataFrame(list(events), columns=EVENT_FIELDS)
+
+
+def distinct_values(path, field):
+    """Valores distintos de um campo (para os filtros do visualizador)."""
+    if pa is not None:
+        try:
+            return sorted(v for v in pc.unique(read_events_table(path)[field]).to_pylist() if v is not None)
+        except pa.ArrowInvalid:
+            pass
+    return sorted({e[field] for e in iter_events(path) if e.get(field) is not None})
+
+
+def export_parquet(path, dest=None):
+    """Converte o arquivo de eventos para Parquet (requer pyarrow); retorna o caminho gerado."""
+    dest = dest or f"{os.path.splitext(path)[0]}.parquet"
+    pq.write_table(read_events_table(path), dest, compression="zstd")
+    return dest
@@ -0,0 +1,226 @@
+import hashlib
+import os
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from datetime import timedelta
+from urllib.parse import urlencode
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+HTTP_CACHE_MAX_ENTRIES = 512
+HTTP_CACHE_MAX_PARSED = 512
+
+
+class CacheEntry:
+    """Resposta guardada para uma (identidade, URL), com seus validadores."""
+
+    def __init__(self, response, stored_at):
+        self.status_code = response.status_code
+        self.reason = response.reason
+        self.url = str(response.url)
+        self.headers = dict(response.headers)
+        self.content = response.content
+        self.encoding = response.encoding
+        self.etag = response.headers.get("ETag")
+        self.last_modified = response.headers.get("Last-Modified")
+        self.stored_at = stored_at
+
+    @property
+    def has_validators(self):
+        return bool(self.etag or self.last_modified)
+
+    def to_response(self, source, elapsed=None):
+        """Reconstrói um requests.Response com o conteúdo guardado."""
+        response = requests.Response()
+        response.status_code = self.status_code
+        response.reason = self.reason
+        response.url = self.url
+        response.headers = CaseInsensitiveDict(self.headers)
+        response._content = self.content
+        response.encoding = self.encoding
+        response.elapsed = elapsed or timedelta(0)
+        # "fresh" (sem rede) ou "revalidated" (304); ausente em respostas da rede
+        response.from_cache = source
+        return response
+
+
+class HTTPCache:
+    """
+    Cache de GETs seguros (descoberta de formulários, crawler, endpoints).
+
+    As entradas são indexadas pela URL (com parâmetros ordenados) e pela
+    identidade da sessão (hash dos cookies), então respostas de usuários
+    diferentes nunca se misturam. Dentro do TTL a resposta vem da memória
+    sem nenhuma requisição; depois dele, se o servidor enviou ETag ou
+    Last-Modified, é feita uma requisição condicional e um 304 renova a
+    entrada. O TTL é a política da ferramenta: Cache-Control/Pragma do
+    servidor (que o PHP envia em toda página com sessão) não são seguidos.
+
+    Resultados de parsing (ex.: formulários extraídos) ficam guardados
+    pelo hash do corpo, e podem ser persistidos em disco junto com as
+    respostas para valer entre execuções.
+    """
+
+    def __init__(self, ttl=300, path=None, max_entries=HTTP_CACHE_MAX_ENTRIES,
+                 max_parsed=HTTP_CACHE_MAX_PARSED):
+        self.ttl = ttl
+        self.path = path
+        self.max_entries = max_entries
+        self.max_parsed = max_parsed
+        self._entries = OrderedDict()
+        self._parsed = OrderedDict()
+        self._lock = threading.Lock()
+        self.reset_stats()
+        if path:
+            self.load()
+
+    def reset_stats(self):
+        self.fresh_hits = 0
+        self.revalidated = 0
+        self.misses = 0
+        self.parse_hits = 0
+
+    # --- Chaves ---
+
+    @staticmethod
+    def identity(session):
+        """Hash dos cookies da sessão (nome, valor, domínio, caminho)."""
+        cookies = sorted((c.name, c.value or "", c.domain, c.path) for c in session.cookies)
+        return hashlib.blake2b(repr(cookies).encode(), digest_size=12).hexdigest()
+
+    @staticmethod
+    def _url_key(url, params=None):
+        if params:
+            items = params.items() if isinstance(params, dict) else params
+            url = f"{url}{'&' if '?' in url else '?'}{urlencode(sorted(items))}"
+        return url
+
+    def _store(self, key, entry):
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    # --- Requisições ---
+
+    def get(self, session, url, params=None, **kwargs):
+        """GET através do cache; kwargs são repassados para session.get."""
+        key = (self.identity(session), self._url_key(url, params))
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+
+        if entry is not None and now - entry.stored_at < self.ttl:
+            with self._lock:
+                self.fresh_hits += 1
+            return entry.to_response("fresh")
+
+        headers = dict(kwargs.pop("headers", None) or {})
+        if entry is not None and entry.has_validators:
+            if entry.etag:
+                headers["If-None-Match"] = entry.etag
+            if entry.last_modified:
+                headers["If-Modified-Since"] = entry.last_modified
+
+        response = session.get(url, params=params, headers=headers, **kwargs)
+
+        if response.status_code == 304 and entry is not None:
+            with self._lock:
+                entry.stored_at = time.time()
+                self.revalidated += 1
+            return entry.to_response("revalidated", elapsed=response.elapsed)
+
+        with self._lock:
+            self.misses += 1
+            if response.status_code < 500:
+                # A resposta pode ter definido cookies: guarda sob a identidade
+                # com que a próxima requisição será feita
+                self._store((self.identity(session), key[1]), CacheEntry(response, time.time()))
+        return response
+
+    def parsed(self, name, response, parser):
+        """
+        Resultado de parser(response) guardado pelo hash do corpo e URL final;
+        a mesma página não é analisada duas vezes.
+        """
+        body_hash = hashlib.blake2b(response.content or b"", digest_size=16).digest()
+        key = (name, str(response.url), body_hash)
+        with self._lock:
+            if key in self._parsed:
+                self._parsed.move_to_end(key)
+                self.parse_hits += 1
+                return self._parsed[key]
+
+        value = parser(response)
+        with self._lock:
+            self._parsed[key] = value
+            while len(self._parsed) > self.max_parsed:
+                self._parsed.popitem(last=False)
+        return value
+
+    # --- Persistência ---
+
+    def load(self):
+        if not self.path or not os.path.exists(self.path):
+            return False
+        try:
+            with open(self.path, "rb") as f:
+                entries, parsed = pickle.load(f)
+        except Exception as e:
+            print(f"Erro ao carregar o cache HTTP: {e}")
+            return False
+        with self._lock:
+            self._entries = OrderedDict(entries)
+            self._parsed = OrderedDict(parsed)
+        return True
+
+    def save(self):
+        if not self.path:
+            return False
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            with self._lock:
+                data = (list(self._entries.items()), list(self._parsed.items()))
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "wb") as f:
+                pickle.dump(data, f)
+            os.replace(tmp_path, self.path)
+            return True
+        except Exception as e:
+            print(f"Erro ao salvar o cache HTTP: {e}")
+            return False
+
+    def invalidate(self, session):
+        """
+        Remove as respostas da identidade de cookies da sessão. Usado quando o
+        estado de autenticação muda sem trocar os cookies (o PHP mantém o
+        PHPSESSID no login), para não servir páginas de antes da mudança.
+        """
+        identity = self.identity(session)
+        with self._lock:
+            stale = [key for key in self._entries if key[0] == identity]
+            for key in stale:
+                del self._entries[key]
+        return len(stale)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._parsed.clear()
+            self.reset_stats()
+        if self.path and os.path.exists(self.path):
+            os.remove(self.path)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def describe(self):
+        """Resumo para os logs."""
+        return (f"{self.fresh_hits} respostas sem rede, {self.revalidated} revalidadas (304), "
+                f"{self.misses} baixadas, {self.parse_hits} análises reaproveitadas, "
+                f"{len(self._entries)} páginas em cache")
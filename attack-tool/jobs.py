@@ -0,0 +1,262 @@
+import threading
+import time
+import traceback
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from config import (JOBS_MAX_WORKERS, JOBS_MAX_QUEUED, JOBS_HISTORY, JOB_MAX_RPS,
+                    JOB_MAX_CONCURRENCY, JOB_MAX_PROCESSES, JOB_TIMEOUT, PACING_MAX_RPS)
+from runner import run_attack
+
+JOB_STATUSES = ["queued", "running", "completed", "cancelled", "failed"]
+FINISHED_STATUSES = frozenset(["completed", "cancelled", "failed"])
+
+
+class JobLimits:
+    """
+    Limites de recursos aplicados aos params de cada job: teto de req/s,
+    workers/threads, processos locais e tempo máximo de execução.
+    """
+
+    def __init__(self, max_rps=JOB_MAX_RPS, max_concurrency=JOB_MAX_CONCURRENCY,
+                 max_processes=JOB_MAX_PROCESSES, timeout=JOB_TIMEOUT):
+        self.max_rps = max_rps
+        self.max_concurrency = max_concurrency
+        self.max_processes = max_processes
+        self.timeout = timeout or None
+
+    def apply(self, params):
+        """Cópia dos params dentro dos limites e a lista de ajustes feitos."""
+        params = dict(params)
+        adjusted = []
+
+        def clamp(key, limit, default=None):
+            value = params.get(key, default)
+            if limit and value is not None and value > limit:
+                params[key] = limit
+                adjusted.append(f"{key} {value:g} → {limit:g}")
+
+        # Sem teto explícito vale o padrão do Pacer; 0 (sem teto) também é limitado
+        if self.max_rps and not params.get('max_rps', PACING_MAX_RPS):
+            params['max_rps'] = self.max_rps
+            adjusted.append(f"max_rps sem teto → {self.max_rps:g}")
+        clamp('max_rps', self.max_rps, PACING_MAX_RPS)
+        clamp('concurrency', self.max_concurrency)
+        clamp('max_per_host', self.max_concurrency)
+        clamp('blind_workers', self.max_concurrency)
+        clamp('crawl_workers', self.max_concurrency)
+        clamp('processes', self.max_processes)
+        return params, adjusted
+
+
+class JobProgress:
+    """
+    Destino dos logs em tempo real de um job. Tem a mesma interface dos
+    containers do Streamlit usada pelo LiveLogSink (text_area, progress,
+    text), então os módulos de ataque funcionam sem mudanças; a interface
+    apenas lê o último estado.
+    """
+
+    def __init__(self):
+        self.lines = ""
+        self.value = 0
+        self.status = ""
+
+    def text_area(self, label, value="", height=None, key=None):
+        self.lines = value
+
+    def progress(self, value):
+        self.value = value
+
+    def text(self, message):
+        self.status = message
+
+
+class Job:
+    """Um ataque submetido ao JobManager, com status, progresso e resultado."""
+
+    def __init__(self, session_manager, attack_type, target_url, params, resume=False,
+                 checkpoint_name=None, timeout=None):
+        self.id = uuid.uuid4().hex[:8]
+        self.session_manager = session_manager
+        self.attack_type = attack_type
+        self.target_url = target_url
+        self.params = params
+        self.resume = resume
+        # Checkpoint próprio do job; ao retomar, o informado (None = o padrão do ataque)
+        self.checkpoint_name = checkpoint_name if resume else (checkpoint_name or self.id)
+        self.timeout = timeout
+        self.status = "queued"
+        self.submitted_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.result = None
+        self.error = None
+        self.cancel_reason = None
+        self.cancel_event = threading.Event()
+        self.progress = JobProgress()
+        self.future = None
+
+    @property
+    def finished(self):
+        return self.status in FINISHED_STATUSES
+
+    @property
+    def elapsed(self):
+        if self.started_at is None:
+            return 0.0
+        return (self.finished_at or time.time()) - self.started_at
+
+    def snapshot(self):
+        """Estado atual para exibição (sem o resultado completo)."""
+        return {
+            "id": self.id,
+            "attack_type": self.attack_type,
+            "target_url": self.target_url,
+            "status": self.status,
+            "progress": self.progress.value,
+            "message": self.progress.status,
+            "submitted_at": self.submitted_at,
+            "elapsed_s": round(self.elapsed, 1),
+            "attempts": self.result["attempts"] if self.result else None,
+            "success_count": self.result["success_count"] if self.result else None,
+            "log_file": self.result["log_file"] if self.result else None,
+            "error": self.error or self.cancel_reason,
+        }
+
+
+class JobManager:
+    """
+    Executa ataques em segundo plano, fora do script do Streamlit.
+
+    Os jobs entram em uma fila atendida por um pool de max_workers threads;
+    cada um roda com uma cópia do SessionManager (SessionManager.clone) e
+    com os params dentro dos limites de JobLimits. O cancelamento usa o
+    evento do Pacer do ataque: o módulo para na próxima requisição, gera o
+    relatório parcial e mantém o checkpoint do job para retomada. Como o
+    gerenciador vive no processo (e não na sessão do navegador), os jobs
+    continuam ao fechar ou recarregar a página.
+    """
+
+    def __init__(self, max_workers=JOBS_MAX_WORKERS, max_queued=JOBS_MAX_QUEUED,
+                 history=JOBS_HISTORY, limits=None):
+        self.max_queued = max_queued
+        self.history = history
+        self.limits = limits or JobLimits()
+        self._executor = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="attack-job")
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+
+    def submit(self, session_manager, attack_type, target_url, params, resume=False,
+               checkpoint_name=None):
+        """
+        Enfileira um ataque e retorna o Job. A sessão é copiada no momento da
+        submissão; mudanças posteriores na sessão da interface não afetam o job.
+        """
+        with self._lock:
+            queued = sum(1 for job in self._jobs.values() if job.status == "queued")
+            if queued >= self.max_queued:
+                raise RuntimeError(f"Fila de jobs cheia ({queued} aguardando)")
+            params, adjusted = self.limits.apply(params)
+            job = Job(session_manager.clone(), attack_type, target_url, params, resume=resume,
+                      checkpoint_name=checkpoint_name, timeout=self.limits.timeout)
+            if adjusted:
+                job.progress.status = f"Limites aplicados: {', '.join(adjusted)}"
+            self._jobs[job.id] = job
+            self._prune()
+            job.future = self._executor.submit(self._execute, job)
+        return job
+
+    def resume(self, job_id):
+        """Novo job que retoma um job cancelado (ou interrompido) pelo checkpoint dele."""
+        job = self.get(job_id)
+        if job is None:
+            raise KeyError(job_id)
+        return self.submit(job.session_manager, job.attack_type, job.target_url, job.params,
+                           resume=True, checkpoint_name=job.checkpoint_name)
+
+    def _execute(self, job):
+        if job.cancel_event.is_set():
+            job.status = "cancelled"
+            job.finished_at = time.time()
+            return
+        job.status = "running"
+        job.started_at = time.time()
+        timer = None
+        if job.timeout:
+            timer = threading.Timer(job.timeout, self._expire, args=(job,))
+            timer.daemon = True
+            timer.start()
+        try:
+            job.result = run_attack(job.session_manager, job.attack_type, job.target_url, job.params,
+                                    live_log_container=job.progress,
+                                    progress_container=(job.progress, job.progress),
+                                    resume=job.resume, cancel_event=job.cancel_event,
+                                    checkpoint_name=job.checkpoint_name)
+            job.status = job.result.get("status", "completed")
+        except Exception as e:
+            job.error = f"{e.__class__.__name__}: {e}"
+            job.status = "failed"
+            print(f"Erro no job {job.id} ({job.attack_type}):\n{traceback.format_exc()}")
+        finally:
+            if timer is not None:
+                timer.cancel()
+            job.finished_at = time.time()
+
+    def _expire(self, job):
+        self._cancel(job, f"Tempo limite de {job.timeout:g}s atingido")
+
+    def _cancel(self, job, reason):
+        if job.finished:
+            return False
+        job.cancel_reason = reason
+        job.cancel_event.set()
+        # Ainda na fila: sai sem executar
+        if job.future is not None and job.future.cancel():
+            job.status = "cancelled"
+            job.finished_at = time.time()
+        return True
+
+    def cancel(self, job_id):
+        """Pede o cancelamento; retorna False se o job não existe ou já terminou."""
+        job = self.get(job_id)
+        return job is not None and self._cancel(job, "Cancelado pelo usuário")
+
+    def _prune(self):
+        finished = [job_id for job_id, job in self._jobs.items() if job.finished]
+        for job_id in finished[:max(0, len(finished) - self.history)]:
+            del self._jobs[job_id]
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def list_jobs(self):
+        """Jobs mais recentes primeiro."""
+        with self._lock:
+            return list(reversed(self._jobs.values()))
+
+    def active_count(self):
+        with self._lock:
+            return sum(1 for job in self._jobs.values() if not job.finished)
+
+    def shutdown(self, cancel=True):
+        """Cancela (opcionalmente) os jobs pendentes e aguarda os que estão rodando."""
+        if cancel:
+            for job in self.list_jobs():
+                self._cancel(job, "Encerramento do gerenciador")
+        self._executor.shutdown(wait=True)
+
+
+_manager = None
+_manager_lock = threading.Lock()
+
+
+def get_job_manager():
+    """Gerenciador compartilhado pelo processo."""
+    global _manager
+    with _manager_lock:
+        if _manager is None:
+            _manager = JobManager()
+        return _manager
@@ -0,0 +1,98 @@
+import threading
+import time
+from collections import deque
+from datetime import datetime
+
+from config import log_result, BR_TIMEZONE, LIVE_LOG_LINES, LIVE_LOG_MAX_FPS
+
+
+class LiveLogSink:
+    """
+    Sink compartilhado de logs em tempo real para os módulos de ataque.
+
+    Cada mensagem vai para o arquivo de log imediatamente, mas a interface
+    do Streamlit só é redesenhada no máximo max_fps vezes por segundo: as
+    linhas intermediárias ficam acumuladas em um deque de tamanho fixo e
+    aparecem juntas no próximo flush.
+    """
+
+    def __init__(self, log_file, live_log_container=None, progress_container=None,
+                 key_prefix="live_logs", max_lines=LIVE_LOG_LINES, max_fps=LIVE_LOG_MAX_FPS):
+        self.log_file = log_file
+        self.live_log_container = live_log_container
+        self.progress_bar = None
+        self.status_text = None
+        if progress_container:
+            self.progress_bar, self.status_text = progress_container
+
+        self.key_prefix = key_prefix
+        self.lines = deque(maxlen=max_lines)
+        self.total = 0
+        self.min_interval = 1.0 / max_fps if max_fps else 0.0
+
+        self._lock = threading.Lock()
+        self._owner = threading.get_ident()
+        self._last_flush = 0.0
+        self._flushes = 0
+        self._dirty = False
+        self._status = None
+        self._progress = None
+        self._rendered_progress = None
+
+    def add_log(self, message, update_progress=None):
+        """Registra uma mensagem (arquivo + buffer da interface) e atualiza o progresso."""
+        timestamp = datetime.now(BR_TIMEZONE).strftime("%H:%M:%S")
+        with self._lock:
+            self.lines.append(f"[{timestamp}] {message}")
+            self.total += 1
+            self._status = message
+            if update_progress is not None:
+                self._progress = update_progress
+            self._dirty = True
+
+        log_result(message, self.log_file)
+
+        if time.monotonic() - self._last_flush >= self.min_interval:
+            self.flush()
+
+    __call__ = add_log
+
+    def sleep(self, seconds):
+        """Mostra as linhas pendentes e aguarda (evita interface parada durante o delay)."""
+        self.flush()
+        time.sleep(seconds)
+
+    def flush(self):
+        """
+        Redesenha a interface com as linhas acumuladas. Só tem efeito na
+        thread que criou o sink (a thread do script Streamlit).
+        """
+        if threading.get_ident() != self._owner:
+            return
+
+        with self._lock:
+            if not self._dirty:
+                return
+            lines = list(self.lines)
+            total = self.total
+            status = self._status
+            progress = self._progress
+            self._dirty = False
+            self._flushes += 1
+            flush_id = self._flushes
+        self._last_flush = time.monotonic()
+
+        if self.live_log_container:
+            self.live_log_container.text_area(
+                f"📋 Logs em Tempo Real ({total} total):",
+                value="\n".join(lines),
+                height=300,
+                key=f"{self.key_prefix}_{flush_id}"
+            )
+
+        if self.progress_bar and progress is not None and progress != self._rendered_progress:
+            self.progress_bar.progress(progress)
+            self._rendered_progress = progress
+
+        if self.status_text and status is not None:
+            self.status_text.text(f"🔄 {status}")
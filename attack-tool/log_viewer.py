@@ -0,0 +1,179 @@
+import glob
+import os
+import threading
+import time
+from array import array
+from collections import namedtuple
+from itertools import accumulate, islice
+
+TAIL_BLOCK_SIZE = 64 * 1024      # Bloco lido a cada passo de trás para frente
+INDEX_CHUNK_SIZE = 4 * 1024 * 1024  # Bloco lido a cada passo da indexação
+RAW_VIEW_MAX_BYTES = 1024 * 1024  # Máximo exibido na visualização bruta
+LISTING_TTL = 5.0                # Tempo (s) que a listagem do diretório é reaproveitada
+
+LogFileInfo = namedtuple("LogFileInfo", ["path", "name", "mtime", "size"])
+
+
+def _decode_lines(data):
+    """Divide em \\n (como o índice) e decodifica, sem a quebra final."""
+    lines = data.split(b"\n")
+    if lines and not lines[-1]:
+        lines.pop()
+    return [line.decode("utf-8", errors="replace").rstrip("\r") for line in lines]
+
+
+def tail_lines(path, count, block_size=TAIL_BLOCK_SIZE):
+    """
+    Últimas count linhas do arquivo, lendo blocos a partir do fim: o custo
+    depende do tamanho das linhas pedidas, não do tamanho do arquivo.
+    """
+    if count <= 0:
+        return []
+    with open(path, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        position = f.tell()
+        data = b""
+        # count + 1 quebras garantem que a primeira linha retornada está completa
+        while position > 0 and data.count(b"\n") <= count:
+            step = min(block_size, position)
+            position -= step
+            f.seek(position)
+            data = f.read(step) + data
+    return _decode_lines(data)[-count:]
+
+
+def read_tail(path, max_bytes=RAW_VIEW_MAX_BYTES):
+    """Fim do arquivo (até max_bytes, a partir de uma linha inteira) e se foi truncado."""
+    size = os.path.getsize(path)
+    with open(path, "rb") as f:
+        f.seek(max(0, size - max_bytes))
+        data = f.read()
+    truncated = size > max_bytes
+    if truncated and b"\n" in data:
+        data = data[data.index(b"\n") + 1:]
+    return data.decode("utf-8", errors="replace"), truncated
+
+
+class LineIndex:
+    """
+    Índice de deslocamentos de linha de um arquivo de log, para paginação.
+
+    Guarda a posição final de cada linha completa (array de inteiros de 8
+    bytes) e a posição já indexada; refresh() lê apenas o que foi anexado
+    desde a última chamada. Se o arquivo encolher (recriado/truncado), o
+    índice é refeito do zero.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._ends = array("Q")
+        self._scanned = 0
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def refresh(self):
+        with self._lock:
+            size = os.path.getsize(self.path)
+            if size < self._scanned:
+                self._ends = array("Q")
+                self._scanned = 0
+            if size > self._scanned:
+                with open(self.path, "rb") as f:
+                    f.seek(self._scanned)
+                    remaining = size - self._scanned
+                    partial = 0  # Bytes da linha ainda sem \n no fim do bloco anterior
+                    while remaining > 0:
+                        chunk = f.read(min(INDEX_CHUNK_SIZE, remaining))
+                        if not chunk:
+                            break
+                        remaining -= len(chunk)
+                        pieces = chunk.split(b"\n")
+                        if len(pieces) > 1:
+                            lengths = [len(piece) + 1 for piece in pieces[:-1]]
+                            lengths[0] += partial
+                            self._ends.extend(islice(accumulate(lengths, initial=self._scanned), 1, None))
+                            self._scanned = self._ends[-1]
+                            partial = len(pieces[-1])
+                        else:
+                            partial += len(chunk)
+            self._size = size
+        return self
+
+    @property
+    def line_count(self):
+        """Linhas completas mais uma eventual linha final ainda sem quebra."""
+        return len(self._ends) + (1 if self._size > self._scanned else 0)
+
+    def read_lines(self, start, count):
+        """Linhas [start, start + count) lidas diretamente de suas posições."""
+        with self._lock:
+            total = len(self._ends) + (1 if self._size > self._scanned else 0)
+            start = max(0, min(start, total))
+            stop = min(total, start + max(0, count))
+            if start >= stop:
+                return []
+            begin = self._ends[start - 1] if start > 0 else 0
+            end = self._ends[stop - 1] if stop <= len(self._ends) else self._size
+        with open(self.path, "rb") as f:
+            f.seek(begin)
+            data = f.read(end - begin)
+        return _decode_lines(data)
+
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+
+def get_line_index(path):
+    """Índice (atualizado) do arquivo, reaproveitado entre reexecuções da interface."""
+    with _indexes_lock:
+        index = _indexes.get(path)
+        if index is None:
+            index = _indexes[path] = LineIndex(path)
+    return index.refresh()
+
+
+def forget_line_index(path):
+    with _indexes_lock:
+        _indexes.pop(path, None)
+
+
+class LogDirectory:
+    """
+    Listagem dos arquivos .log de um diretório, mais recentes primeiro,
+    com mtime/tamanho lidos uma vez por listagem. A listagem é refeita
+    quando o diretório muda (arquivo criado/removido) ou após o TTL.
+    """
+
+    def __init__(self, log_dir, ttl=LISTING_TTL):
+        self.log_dir = log_dir
+        self.ttl = ttl
+        self._files = []
+        self._dir_mtime = None
+        self._listed_at = 0.0
+        self._lock = threading.Lock()
+
+    def invalidate(self):
+        with self._lock:
+            self._dir_mtime = None
+
+    def files(self):
+        if not os.path.isdir(self.log_dir):
+            return []
+        dir_mtime = os.stat(self.log_dir).st_mtime
+        with self._lock:
+            fresh = (dir_mtime == self._dir_mtime
+                     and time.monotonic() - self._listed_at < self.ttl)
+            if not fresh:
+                files = []
+                for path in glob.glob(os.path.join(self.log_dir, "*.log")):
+                    try:
+                        stat = os.stat(path)
+                    except OSError:
+                        continue
+                    files.append(LogFileInfo(path, os.path.basename(path), stat.st_mtime, stat.st_size))
+                files.sort(key=lambda info: info.mtime, reverse=True)
+                self._files = files
+                self._dir_mtime = dir_mtime
+                self._listed_at = time.monotonic()
+            return list(self._files)
@@ -0,0 +1,131 @@
+import os
+import queue
+import threading
+import time
+
+
+class _FlushRequest:
+    def __init__(self):
+        self.done = threading.Event()
+
+
+_STOP = object()
+
+
+class BufferedLogWriter:
+    """
+    Escritor de logs em segundo plano.
+
+    write() apenas enfileira a linha em memória; uma thread dedicada agrupa
+    as linhas pendentes e as grava em lote (um open/append por arquivo a cada
+    flush_interval segundos ou a cada max_batch linhas).
+
+    Política de fsync:
+        "never" - deixa o sistema operacional decidir (padrão)
+        "batch" - fsync após cada lote gravado
+        "close" - fsync apenas em flush()/close()
+    """
+
+    def __init__(self, flush_interval=0.5, fsync="never", max_batch=2000):
+        self.flush_interval = flush_interval
+        self.fsync = fsync
+        self.max_batch = max_batch
+        self._queue = queue.SimpleQueue()
+        self._thread = None
+        self._lock = threading.Lock()
+        self._unsynced = set()
+
+    def _ensure_thread(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+                self._thread.start()
+
+    def write(self, log_file, text):
+        """Enfileira texto para ser anexado ao arquivo de log."""
+        self._ensure_thread()
+        self._queue.put((log_file, text))
+
+    def flush(self, timeout=5.0):
+        """Bloqueia até que tudo o que foi enfileirado antes da chamada esteja gravado."""
+        if self._thread is None or not self._thread.is_alive():
+            return True
+        request = _FlushRequest()
+        self._queue.put(request)
+        return request.done.wait(timeout)
+
+    def close(self, timeout=5.0):
+        """Grava as linhas pendentes e encerra a thread de escrita."""
+        if self._thread is None or not self._thread.is_alive():
+            return
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            batch = []
+            waiters = []
+            stop = False
+            deadline = time.monotonic() + self.flush_interval
+
+            while True:
+                if item is _STOP:
+                    stop = True
+                    break
+                if isinstance(item, _FlushRequest):
+                    waiters.append(item)
+                    break
+                batch.append(item)
+                if len(batch) >= self.max_batch:
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+
+            self._write_batch(batch)
+            if self.fsync == "close" and (waiters or stop):
+                self._sync_files()
+
+            for waiter in waiters:
+                waiter.done.set()
+            if stop:
+                return
+
+    def _write_batch(self, batch):
+        if not batch:
+            return
+
+        by_file = {}
+        for log_file, text in batch:
+            by_file.setdefault(log_file, []).append(text)
+
+        for log_file, texts in by_file.items():
+            try:
+                with open(log_file, "a", encoding='utf-8') as f:
+                    f.write("".join(texts))
+                    if self.fsync == "batch":
+                        f.flush()
+                        os.fsync(f.fileno())
+                    else:
+                        self._unsynced.add(log_file)
+            except Exception as e:
+                print(f"Erro ao gravar log em {log_file}: {e}")
+
+    def _sync_files(self):
+        for log_file in self._unsynced:
+            try:
+                fd = os.open(log_file, os.O_RDONLY)
+                try:
+                    os.fsync(fd)
+                finally:
+                    os.close(fd)
+            except OSError as e:
+                print(f"Erro ao sincronizar log {log_file}: {e}")
+        self._unsynced.clear()
@@ -1,22 +1,30 @@
 #!/usr/bin/env python3
 import streamlit as st
-import sys
 import os
 import time
 import pandas as pd
 from datetime import datetime, timedelta
-import glob
-import threading
 
 
 
 # Seus imports originais
-from config import log_result, get_log_filename
+from config import restore_secrets, BASE_URL, PACING_MAX_RPS, HTTP_CACHE_TTL, RESULTS_DB
 from session_manager import SessionManager
-from attacks.brute_force import BruteForceAttack
+from wordlists import Wordlist
+from checkpoint import Checkpoint
+from events import (events_filename, load_events, distinct_values, export_parquet,
+                    columnar_available, FILTER_FIELDS)
+from results_store import get_results_store
+from log_viewer import (LogDirectory, get_line_index, forget_line_index, tail_lines, read_tail,
+                        RAW_VIEW_MAX_BYTES)
+from runner import ATTACK_TYPES, ATTACK_CLASSES, CRAWL_ATTACKS
+from jobs import get_job_manager
+from distributed import DISTRIBUTED_ATTACKS
+from attacks.crawler import CRAWL_MAX_DEPTH, CRAWL_MAX_PAGES
+from pacing import PACING_MODES
+from attacks.credential_strategies import CREDENTIAL_ORDERS
 from attacks.sql_injection import SQLInjectionAttack
 from attacks.xss import XSSAttack
-from attacks.access_control import AccessControlAttack
 
 class WebSecurityTester:
     def __init__(self):
@@ -25,190 +33,196 @@ class WebSecurityTester:
             st.session_state.session_manager = SessionManager()
         self.session_manager = st.session_state.session_manager
 
-    def run_attack(self, attack_type, target_url, params, live_log_container=None, progress_container=None):
-        """Função genérica para executar ataques com logs em tempo real."""
-        result = None
-        success_count = 0
-        attempts = 0
-
-        # Passa o session_manager compartilhado para cada ataque
-        if attack_type == "Brute Force":
-            attack = BruteForceAttack(self.session_manager)
-            usernames = params.get('usernames', [])
-            passwords = params.get('passwords', [])
-            attempts = len(usernames) * len(passwords)
-            
-            log_file = get_log_filename()
-            result = attack.run(target_url, usernames, passwords, 
-                              max_attempts=params.get('max_attempts', 50),
-                              delay=params.get('delay', 1.0),
-                              log_file=log_file,
-                              live_log_container=live_log_container,
-                              progress_container=progress_container)
-            # Após o ataque, a sessão já é salva automaticamente no authenticate bem-sucedido
-            success_count = len(attack.valid_credentials)
-            st.session_state.last_log_file = log_file
-
-        elif attack_type == "SQL Injection":
-            attack = SQLInjectionAttack(self.session_manager)
-            payloads = params.get('payloads', None)
-            
-            log_file = get_log_filename()
-            result = attack.run(target_url, payloads, 
-                              log_file=log_file,
-                              live_log_container=live_log_container,
-                              progress_container=progress_container)
-            
-            # Usar contagem real de tentativas
-            attempts = attack.total_attempts
-            success_count = len(attack.vulnerabilities)
-            st.session_state.last_log_file = log_file
-
-        elif attack_type == "XSS":
-            attack = XSSAttack(self.session_manager)
-            payloads = params.get('payloads', None)
-            log_file = get_log_filename()
-            
-            # O método run agora retorna uma tupla (relatório, total_de_testes)
-            result, attempts = attack.run(target_url, payloads, log_file=log_file,
-                                          live_log_container=live_log_container,
-                                          progress_container=progress_container)
-            
-            success_count = len(attack.vulnerabilities)
-            st.session_state.last_log_file = log_file
-
-        elif attack_type == "Access Control":
-            attack = AccessControlAttack(self.session_manager)
-            endpoints = params.get('endpoints', [])
-            attempts = len(endpoints)
-            log_file = get_log_filename()
-            result = attack.run(target_url, endpoints, log_file=log_file,
-                              live_log_container=live_log_container,
-                              progress_container=progress_container)
-            success_count = len(attack.vulnerabilities)
-            st.session_state.last_log_file = log_file
+    def submit_attack(self, attack_type, target_url, params, resume=False):
+        """
+        Envia o ataque para o gerenciador de jobs (execução em segundo plano)
+        e retorna o Job. Com resume=True, retoma a última execução
+        interrompida do ataque a partir do checkpoint.
+        """
+        job = job_manager().submit(self.session_manager, attack_type, target_url, params, resume=resume)
+        st.session_state.selected_job = job.id
+        return job
 
-        else:
-            result = "Ataque não suportado."
-        
-        if not result:
-            result = "Nenhum resultado detalhado retornado, mas o ataque foi executado."
-
-        return {
-            "result": result,
-            "attempts": attempts,
-            "success_count": success_count,
-            "log_file": st.session_state.get('last_log_file', '')
-        }
+@st.cache_resource
+def job_manager():
+    """Gerenciador de jobs do processo: os ataques continuam ao recarregar/fechar a página"""
+    return get_job_manager()
 
 def initialize_session_state():
     """Inicializa o session state com valores padrão"""
-    if 'attack_executed' not in st.session_state:
-        st.session_state.attack_executed = False
-    if 'attack_result' not in st.session_state:
-        st.session_state.attack_result = None
+    if 'selected_job' not in st.session_state:
+        st.session_state.selected_job = None
     if 'last_log_file' not in st.session_state:
         st.session_state.last_log_file = ''
-    if 'live_logs' not in st.session_state:
-        st.session_state.live_logs = []
-    if 'attack_in_progress' not in st.session_state:
-        st.session_state.attack_in_progress = False
+
+@st.cache_data(show_spinner="Contando entradas da wordlist...")
+def wordlist_stats(path, mtime, size):
+    """Estatísticas da wordlist, recalculadas só quando o arquivo muda."""
+    return Wordlist(path).stats()
+
+def load_wordlist(path, container):
+    """Abre uma wordlist em arquivo e mostra tamanho, linhas e entradas únicas."""
+    if not path:
+        return None
+    if not os.path.isfile(path):
+        container.warning(f"⚠️ Arquivo não encontrado: {path}")
+        return None
+    file_info = os.stat(path)
+    stats = wordlist_stats(path, file_info.st_mtime, file_info.st_size)
+    wordlist = Wordlist(path, stats=stats)
+    container.caption(f"📏 {stats['bytes'] / 1024:.1f} KB · {stats['lines']} linhas · {stats['unique']} únicas")
+    return wordlist
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def event_filter_options(path, mtime, size):
+    """Valores distintos de módulo/fase/veredicto, recalculados só quando o arquivo muda."""
+    return {field: distinct_values(path, field) for field in FILTER_FIELDS}
+
+def display_events(events_file):
+    """Eventos estruturados da execução (JSONL), com filtros e exportação colunar"""
+    file_info = os.stat(events_file)
+    options = event_filter_options(events_file, file_info.st_mtime, file_info.st_size)
+    labels = {"module": "Módulo", "phase": "Fase", "verdict": "Veredicto"}
+
+    filters = {}
+    columns = st.columns(len(FILTER_FIELDS) + 1)
+    for column, field in zip(columns, FILTER_FIELDS):
+        with column:
+            choice = st.selectbox(labels[field], ["(todos)"] + options[field], key=f"event_filter_{field}")
+            filters[field] = None if choice == "(todos)" else choice
+    with columns[-1]:
+        search = st.text_input("Buscar em URL/campo/payload", key="event_search")
+    limit = st.number_input("Máximo de eventos exibidos", min_value=100, max_value=100000, value=2000,
+                            step=100, key="event_limit")
+
+    df = load_events(events_file, search=search or None, limit=int(limit), **filters)
+    st.caption(f"{len(df)} eventos (mais recentes)")
+    st.dataframe(df, use_container_width=True, height=300)
+
+    if columnar_available():
+        if st.button("📦 Exportar Parquet", key="export_parquet"):
+            st.success(f"Exportado para {export_parquet(events_file)}")
+    else:
+        st.caption("Instale pyarrow para filtrar em formato colunar e exportar para Parquet.")
+
+_log_directory = LogDirectory(os.path.join(os.path.dirname(os.path.abspath(__file__)), "logs"))
 
 def find_log_files():
-    """Encontra todos os arquivos de log na pasta logs"""
-    project_root = os.path.dirname(os.path.abspath(__file__))
-    log_dir = os.path.join(project_root, "logs")
-    
-    if not os.path.exists(log_dir):
-        return []
-    
-    log_files = glob.glob(os.path.join(log_dir, "*.log"))
-    log_files.sort(key=lambda x: os.path.getmtime(x), reverse=True)
-    return log_files
+    """Arquivos de log da pasta logs (LogFileInfo), mais recentes primeiro; listagem em cache"""
+    return _log_directory.files()
+
+def _format_mtime(mtime, fmt='%d/%m/%Y %H:%M:%S'):
+    return (datetime.fromtimestamp(mtime) - timedelta(hours=3)).strftime(fmt)
+
+def _log_lines_table(lines, first_line_number):
+    """DataFrame só com as linhas exibidas (timestamp separado da mensagem)"""
+    log_data = []
+    for i, line in enumerate(lines):
+        line = line.strip()
+        if line:
+            if line.startswith('[') and ']' in line:
+                timestamp_end = line.find(']')
+                timestamp = line[1:timestamp_end]
+                message = line[timestamp_end + 2:]
+            else:
+                timestamp = f"Linha {first_line_number + i}"
+                message = line
+
+            log_data.append({
+                "⏰ Timestamp": timestamp,
+                "📝 Mensagem": message
+            })
+    return pd.DataFrame(log_data)
 
 def display_logs():
     """Função separada para exibir logs sem reexecutar ataque"""
     st.subheader("📄 Logs Salvos:")
     
-    log_files = find_log_files()
+    log_files = {info.path: info for info in find_log_files()}
     
     if log_files:
         if len(log_files) > 1:
             selected_log = st.selectbox(
                 "Selecione o arquivo de log:",
-                log_files,
-                format_func=lambda x: f"{os.path.basename(x)} ({(datetime.fromtimestamp(os.path.getmtime(x)) - timedelta(hours=3)).strftime('%d/%m/%Y %H:%M:%S')})",
+                list(log_files),
+                format_func=lambda x: f"{log_files[x].name} ({_format_mtime(log_files[x].mtime)})",
                 key="log_selector"
             )
         else:
-            selected_log = log_files[0]
+            selected_log = next(iter(log_files))
         
         try:
-            with open(selected_log, 'r', encoding='utf-8') as f:
-                logs = f.readlines()
-            
             file_info = os.stat(selected_log)
             col1, col2, col3 = st.columns(3)
             with col1:
                 st.metric("📄 Arquivo", os.path.basename(selected_log))
             with col2:
-                st.metric("📏 Linhas", len(logs))
+                st.metric("💾 Tamanho", f"{file_info.st_size / 1024 / 1024:.2f} MB")
             with col3:
-                st.metric("📅 Modificado", (datetime.fromtimestamp(file_info.st_mtime) - timedelta(hours=3)).strftime('%H:%M:%S'))
+                st.metric("📅 Modificado", _format_mtime(file_info.st_mtime, '%H:%M:%S'))
             
-            show_all = st.checkbox("Mostrar todos os logs", value=False, key="show_all_logs")
+            # Últimas linhas: leitura a partir do fim do arquivo, sem indexar.
+            # Paginado: índice de posições das linhas, atualizado incrementalmente.
+            view_mode = st.radio("Visualização", ["Últimas linhas", "Paginado"], horizontal=True,
+                                 key="log_view_mode")
             
-            if show_all:
-                display_logs_content = logs
+            if view_mode == "Paginado":
+                index = get_line_index(selected_log)
+                col1, col2 = st.columns(2)
+                with col1:
+                    page_size = st.selectbox("Linhas por página", [50, 200, 1000], index=1, key="log_page_size")
+                total_pages = max(1, -(-index.line_count // page_size))
+                with col2:
+                    page = st.number_input("Página", min_value=1, max_value=total_pages, value=total_pages,
+                                           key="log_page")
+                first_line = (page - 1) * page_size
+                display_logs_content = index.read_lines(first_line, page_size)
+                st.info(f"Linhas {first_line + 1}–{first_line + len(display_logs_content)} "
+                        f"de {index.line_count} (página {page}/{total_pages}).")
             else:
-                display_logs_content = logs[-20:] if len(logs) > 20 else logs
-                if len(logs) > 20:
-                    st.info(f"Mostrando os últimos 20 logs de {len(logs)} total.")
+                tail_size = st.number_input("Quantidade de linhas", min_value=1, max_value=5000, value=20,
+                                            key="log_tail_size")
+                display_logs_content = tail_lines(selected_log, tail_size)
+                first_line = 0
+                st.info(f"Mostrando as últimas {len(display_logs_content)} linhas.")
             
-            log_data = []
-            for i, line in enumerate(display_logs_content):
-                line = line.strip()
-                if line:
-                    if line.startswith('[') and ']' in line:
-                        timestamp_end = line.find(']')
-                        timestamp = line[1:timestamp_end]
-                        message = line[timestamp_end + 2:]
-                    else:
-                        timestamp = f"Linha {i+1}"
-                        message = line
-                    
-                    log_data.append({
-                        "⏰ Timestamp": timestamp,
-                        "📝 Mensagem": message
-                    })
-
-            if log_data:
+            df = _log_lines_table(display_logs_content, first_line + 1)
+
+            if not df.empty:
                 with st.container():
                     # Tabela de logs
-                    df = pd.DataFrame(log_data)
                     st.dataframe(df, use_container_width=True, height=300)
 
                     # Botões em uma linha compacta
                     col1, col2, col3 = st.columns([1, 1, 1])
 
                     with col1:
-                        st.download_button(
-                            label="📥 Baixar",
-                            data="\n".join(logs),
-                            file_name=os.path.basename(selected_log),
-                            mime="text/plain",
-                            key="download_log",
-                            use_container_width=True
-                        )
+                        # O arquivo só é lido quando o download é pedido
+                        if st.session_state.get("download_log_ready") == selected_log:
+                            with open(selected_log, 'rb') as f:
+                                st.download_button(
+                                    label="📥 Baixar",
+                                    data=f.read(),
+                                    file_name=os.path.basename(selected_log),
+                                    mime="text/plain",
+                                    key="download_log",
+                                    use_container_width=True
+                                )
+                        elif st.button("📦 Preparar download", key="prepare_download_log", use_container_width=True):
+                            st.session_state.download_log_ready = selected_log
+                            st.rerun()
 
                     with col2:
                         if st.button("🔄 Atualizar", key="refresh_logs", use_container_width=True):
+                            _log_directory.invalidate()
                             st.rerun()
 
                     with col3:
                         if st.button("❌ Deletar", key="delete_log", use_container_width=True):
                             try:
                                 os.remove(selected_log)
+                                forget_line_index(selected_log)
+                                _log_directory.invalidate()
                                 st.success("Arquivo deletado!")
                                 time.sleep(1)
                                 st.rerun()
@@ -216,14 +230,24 @@ def display_logs():
                                 st.error(f"Erro: {e}")
             else:
                 st.warning("O arquivo de log está vazio.")
-                
+
+            events_file = events_filename(selected_log)
+            if os.path.exists(events_file):
+                with st.expander("🔎 Eventos estruturados"):
+                    display_events(events_file)
+
             with st.expander("📋 Ver Log Bruto"):
-                st.text_area(
-                    "Conteúdo completo:",
-                    value="\n".join(logs),
-                    height=200,
-                    key="raw_log_view"
-                )
+                if st.checkbox("Carregar conteúdo", value=False, key="load_raw_log"):
+                    raw_content, truncated = read_tail(selected_log)
+                    if truncated:
+                        st.caption(f"Exibindo apenas o último {RAW_VIEW_MAX_BYTES // 1024 // 1024} MB; "
+                                   "use o download para o arquivo completo.")
+                    st.text_area(
+                        "Conteúdo:",
+                        value=raw_content,
+                        height=200,
+                        key="raw_log_view"
+                    )
         
         except Exception as e:
             st.error(f"❌ Erro ao ler arquivo: {e}")
@@ -231,11 +255,163 @@ def display_logs():
     else:
         st.warning("⚠️ Nenhum arquivo de log encontrado.")
         with st.expander("🔍 Debug"):
-            project_root = os.path.dirname(os.path.abspath(__file__))
-            log_dir = os.path.join(project_root, "logs")
+            log_dir = _log_directory.log_dir
             st.write(f"**Pasta esperada:** `{log_dir}`")
             st.write(f"**Existe:** {os.path.exists(log_dir)}")
 
+JOB_STATUS_LABELS = {
+    "queued": "⏳ Na fila",
+    "running": "⚡ Executando",
+    "completed": "✅ Concluído",
+    "cancelled": "⛔ Cancelado",
+    "failed": "🔥 Falhou",
+}
+JOBS_REFRESH_INTERVAL = 2  # Intervalo (s) entre atualizações do painel de jobs
+
+def display_attack_result(attack_result):
+    """Relatório, gráfico e estatísticas de transporte de uma execução concluída"""
+    st.subheader("📊 Resultados Detalhados:")
+    if attack_result["result"]:
+        with st.expander("Ver detalhes completos", expanded=True):
+            st.code(attack_result["result"], language="text")
+    
+    # Gráfico de resultados
+    if attack_result["attempts"] > 0:
+        st.subheader("📈 Resumo em Gráfico:")
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            data = pd.DataFrame({
+                "Métrica": ["Tentativas", "Sucessos"],
+                "Valor": [attack_result["attempts"], attack_result["success_count"]]
+            })
+            st.bar_chart(data.set_index("Métrica"))
+        
+        with col2:
+            st.metric("Total de Tentativas", attack_result["attempts"])
+            st.metric("Sucessos", attack_result["success_count"], 
+                     delta=f"{(attack_result['success_count']/attack_result['attempts']*100):.1f}% taxa de sucesso")
+
+    if attack_result.get("extracted"):
+        st.subheader("🔓 Dados Extraídos (Blind):")
+        st.dataframe(pd.DataFrame(attack_result["extracted"]), use_container_width=True)
+
+    transport = attack_result.get("transport")
+    if transport and transport["requests"]:
+        st.subheader("🌐 Conexões HTTP:")
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric("Requisições", transport["requests"])
+        col2.metric("Conexões novas", transport["new_connections"])
+        col3.metric("Conexões reutilizadas", transport["reused_connections"])
+        col4.metric("Tráfego (in/out)", f"{transport['bytes_in'] / 1024:.1f} / {transport['bytes_out'] / 1024:.1f} KB")
+
+@st.fragment(run_every=JOBS_REFRESH_INTERVAL)
+def display_jobs():
+    """Painel de jobs: atualizado sozinho, sem bloquear o resto da página"""
+    st.subheader("🗂️ Jobs:")
+    manager = job_manager()
+    jobs = manager.list_jobs()
+    if not jobs:
+        st.info("Nenhum ataque enviado. Os ataques executados aparecem aqui.")
+        return
+
+    rows = []
+    for job in jobs:
+        snapshot = job.snapshot()
+        rows.append({
+            "Job": snapshot["id"],
+            "Ataque": snapshot["attack_type"],
+            "Status": JOB_STATUS_LABELS.get(snapshot["status"], snapshot["status"]),
+            "Progresso": snapshot["progress"],
+            "Tempo (s)": snapshot["elapsed_s"],
+            "Tentativas": snapshot["attempts"],
+            "Sucessos": snapshot["success_count"],
+            "Enviado em": _format_mtime(snapshot["submitted_at"], '%H:%M:%S'),
+        })
+    st.dataframe(pd.DataFrame(rows), use_container_width=True, hide_index=True,
+                 column_config={"Progresso": st.column_config.ProgressColumn(min_value=0, max_value=100)})
+
+    ids = [job.id for job in jobs]
+    selected = st.session_state.selected_job
+    job_id = st.selectbox("Detalhes do job", ids, index=ids.index(selected) if selected in ids else 0,
+                          format_func=lambda i: f"{i} · {manager.get(i).attack_type if manager.get(i) else ''}")
+    st.session_state.selected_job = job_id
+    job = manager.get(job_id)
+    if job is None:
+        return
+
+    if not job.finished:
+        if job.status == "queued":
+            st.info("⏳ Aguardando uma vaga no executor...")
+        st.progress(job.progress.value)
+        if job.progress.status:
+            st.text(job.progress.status)
+        if job.progress.lines:
+            st.code(job.progress.lines, language="text")
+        if st.button("⛔ Cancelar job", key=f"cancel_{job.id}"):
+            manager.cancel(job.id)
+            st.toast(f"⛔ Cancelamento do job {job.id} solicitado")
+        return
+
+    if job.error:
+        st.error(f"❌ {job.error}" if job.status == "failed" else f"⛔ {job.error}")
+    if job.result:
+        st.session_state.last_log_file = job.result["log_file"]
+        display_attack_result(job.result)
+    if job.status == "cancelled" and Checkpoint(job.attack_type, name=job.checkpoint_name).can_resume():
+        if st.button("▶️ Retomar job", key=f"resume_{job.id}"):
+            try:
+                st.session_state.selected_job = manager.resume(job.id).id
+                st.rerun()
+            except RuntimeError as e:
+                st.error(f"❌ {e}")
+
+def display_history():
+    """Histórico de execuções consultado no banco de resultados (sem reler os logs)"""
+    st.subheader("🗃️ Histórico de Execuções:")
+    store = get_results_store(RESULTS_DB)
+
+    col1, col2 = st.columns(2)
+    with col1:
+        attack_filter = st.selectbox("Ataque", ["(todos)"] + ATTACK_TYPES, key="history_attack")
+    with col2:
+        days = st.number_input("Achados dos últimos N dias", min_value=1, max_value=3650, value=7,
+                               key="history_days")
+
+    runs = store.list_runs(limit=100, attack_type=None if attack_filter == "(todos)" else attack_filter)
+    if not runs:
+        st.info("Nenhuma execução registrada ainda.")
+        return
+
+    runs_df = pd.DataFrame(runs)
+    for column in ("started_at", "finished_at"):
+        runs_df[column] = pd.to_datetime(runs_df[column], unit="s") - timedelta(hours=3)
+    st.dataframe(runs_df, use_container_width=True, height=250)
+
+    st.markdown("**Campos vulneráveis no período:**")
+    since = time.time() - days * 86400
+    fields = store.vulnerable_fields(since=since)
+    if fields:
+        fields_df = pd.DataFrame(fields)
+        fields_df["last_found"] = pd.to_datetime(fields_df["last_found"], unit="s") - timedelta(hours=3)
+        st.dataframe(fields_df, use_container_width=True)
+    else:
+        st.caption("Nenhum achado no período.")
+
+    selected_run = st.selectbox("Detalhes da execução", [run["run_id"] for run in runs],
+                                format_func=lambda run_id: f"{run_id} ({next(r['attack_type'] for r in runs if r['run_id'] == run_id)})",
+                                key="history_run")
+    timings = store.timings(selected_run)
+    if timings:
+        st.caption(" · ".join(f"{name}: {seconds:.1f}s" for name, seconds in timings.items()))
+    col1, col2 = st.columns(2)
+    with col1:
+        st.markdown("**Tentativas por fase/veredicto**")
+        st.dataframe(pd.DataFrame(store.attempt_stats(selected_run)), use_container_width=True)
+    with col2:
+        st.markdown("**Achados**")
+        st.dataframe(pd.DataFrame(store.findings(run_id=selected_run)), use_container_width=True)
+
 def main():
     st.set_page_config(page_title="Web Security Tester", page_icon="🔒", layout="wide")
     
@@ -248,7 +424,7 @@ def main():
     st.markdown("Bem-vindo! Esta é uma interface web para testar vulnerabilidades em sites. **Use apenas em ambientes autorizados.**")
     
     st.sidebar.header("Menu de Opções")
-    attack_options = ["Brute Force", "SQL Injection", "XSS", "Access Control"]
+    attack_options = ATTACK_TYPES
     selected_attack = st.sidebar.selectbox("Selecione o tipo de ataque:", attack_options)
     
     # Opções de sessão na sidebar
@@ -265,6 +441,22 @@ def main():
         else:
             st.sidebar.info("Nenhuma sessão salva para limpar.")
 
+    st.sidebar.subheader("Cache HTTP")
+    use_http_cache = st.sidebar.checkbox(
+        "Reaproveitar páginas de descoberta", value=tester.session_manager.http_cache is not None,
+        help="GETs de descoberta (formulários, crawler, endpoints) usam ETag/Last-Modified e TTL; "
+             "páginas inalteradas custam um 304 ou nenhuma requisição.")
+    http_cache_ttl = st.sidebar.number_input("TTL do cache (s)", min_value=0, max_value=86400,
+                                             value=HTTP_CACHE_TTL, disabled=not use_http_cache)
+    if use_http_cache:
+        http_cache = tester.session_manager.enable_http_cache(ttl=http_cache_ttl)
+        st.sidebar.caption(f"🗄️ {len(http_cache)} páginas em cache")
+        if st.sidebar.button("Limpar cache HTTP", key="clear_http_cache"):
+            http_cache.clear()
+            st.sidebar.success("Cache HTTP limpo!")
+    elif tester.session_manager.http_cache is not None:
+        tester.session_manager.disable_http_cache()
+
     st.sidebar.markdown("---")
 
     target_url = st.text_input("URL Alvo (ex: http://web:80)", 
@@ -274,21 +466,54 @@ def main():
     params = {}
     if selected_attack == "Brute Force":
         st.subheader("⚡ Configurações para Brute Force")
+        wordlist_source = st.radio("Origem das listas", ["Texto", "Arquivo (wordlist)"], horizontal=True,
+                                   help="Arquivos são lidos sob demanda, sem carregar a lista inteira em memória.")
         col1, col2 = st.columns(2)
-        with col1:
-            usernames = st.text_area("Lista de usernames (um por linha)", 
-                                   value="admin\nuser\ntest\nroot\nadministrator")
-        with col2:
-            passwords = st.text_area("Lista de passwords (um por linha)", 
-                                   value="password\n123456\nadmin\nroot\npassword123")
-        params['usernames'] = [u.strip() for u in usernames.split('\n') if u.strip()]
-        params['passwords'] = [p.strip() for p in passwords.split('\n') if p.strip()]
+        if wordlist_source == "Texto":
+            with col1:
+                usernames = st.text_area("Lista de usernames (um por linha)", 
+                                       value="admin\nuser\ntest\nroot\nadministrator")
+            with col2:
+                passwords = st.text_area("Lista de passwords (um por linha)", 
+                                       value="password\n123456\nadmin\nroot\npassword123")
+            params['usernames'] = [u.strip() for u in usernames.split('\n') if u.strip()]
+            params['passwords'] = [p.strip() for p in passwords.split('\n') if p.strip()]
+        else:
+            with col1:
+                usernames_path = st.text_input("Arquivo de usernames (caminho no contêiner)", value="",
+                                               placeholder="/app/wordlists/usernames.txt")
+            with col2:
+                passwords_path = st.text_input("Arquivo de passwords (caminho no contêiner)", value="",
+                                               placeholder="/app/wordlists/passwords.txt")
+            params['usernames'] = load_wordlist(usernames_path, col1)
+            params['passwords'] = load_wordlist(passwords_path, col2)
         
         with st.expander("⚙️ Configurações Avançadas"):
-            max_attempts = st.number_input("Máximo de tentativas", min_value=1, max_value=1000, value=50)
-            delay = st.slider("Delay entre tentativas (segundos)", 0.1, 5.0, 1.0, 0.1)
+            max_attempts = st.number_input("Máximo de tentativas", min_value=1, max_value=100_000_000, value=50)
+            delay = st.slider("Delay entre tentativas (segundos)", 0.1, 5.0, 1.0, 0.1,
+                              help="Usado no ritmo fixo (varia entre metade e 1,5× o valor).")
+            concurrency = st.number_input("Requisições concorrentes (workers)", min_value=1, max_value=64, value=1,
+                                          help="1 mantém o modo sequencial original.")
+            max_per_host = st.number_input("Máximo de requisições simultâneas por host", min_value=1, max_value=64,
+                                           value=int(concurrency))
             params['max_attempts'] = max_attempts
             params['delay'] = delay
+            params['concurrency'] = int(concurrency)
+            params['max_per_host'] = int(max_per_host)
+
+        with st.expander("🧮 Estratégia de busca"):
+            order_labels = {"user": "Por usuário (todas as senhas de cada usuário)",
+                            "spray": "Spray (cada senha em todos os usuários)"}
+            params['credential_order'] = st.radio("Ordem das tentativas", CREDENTIAL_ORDERS,
+                                                  format_func=order_labels.get, horizontal=True)
+            params['stop_on_success'] = st.checkbox("Parar de testar um usuário após a senha válida", value=True)
+            params['frequency_order'] = st.checkbox(
+                "Senhas mais frequentes primeiro", value=False,
+                help="Ordena pela frequência na lista (repetições em listas combinadas) e pelas senhas mais comuns. "
+                     "A wordlist inteira é lida antes da primeira tentativa.")
+            params['dedup'] = st.checkbox("Descartar usernames/senhas repetidos", value=True,
+                                          help="Mantém em memória as senhas únicas já vistas; "
+                                               "desmarque para wordlists muito grandes.")
     
     elif selected_attack == "SQL Injection":
         st.subheader("💉 Configurações para SQL Injection")
@@ -318,6 +543,19 @@ def main():
                 height=150
             )
             params['payloads'] = [p.strip() for p in payloads.split('\n') if p.strip()]
+
+        with st.expander("🕳️ Extração Blind (Boolean-based)"):
+            blind_extraction = st.checkbox("Extrair Forum.Usuario (Login/Senha) após a detecção", value=False,
+                                           help="Busca binária sobre o código de cada caractere (~7 requisições por caractere).")
+            col1, col2 = st.columns(2)
+            with col1:
+                blind_workers = st.number_input("Caracteres em paralelo", min_value=1, max_value=32, value=4)
+            with col2:
+                blind_max_rows = st.number_input("Máximo de linhas", min_value=1, max_value=1000, value=10)
+            if blind_extraction:
+                params['blind_extraction'] = True
+                params['blind_workers'] = int(blind_workers)
+                params['blind_max_rows'] = int(blind_max_rows)
     
     elif selected_attack == "XSS":
         st.subheader("🎭 Configurações para XSS")
@@ -341,142 +579,146 @@ def main():
                                 value="/view/admin/dashboard.php\n/view/user/details.php?id=1\n/logout.php",
                                 height=150)
         params['endpoints'] = [e.strip() for e in endpoints.split('\n') if e.strip()]
+
+        mode_labels = {"session": "Sessão atual (uma identidade)",
+                       "matrix": "Matriz: anônimo × usuário × admin (comparação das respostas)"}
+        ac_mode = st.radio("Modo", list(mode_labels), format_func=mode_labels.get, horizontal=True,
+                           key="ac_mode")
+        if ac_mode == "matrix":
+            st.caption("Cada endpoint é buscado pelas três identidades em paralelo; é sinalizado quando "
+                       "a resposta do anônimo ou do usuário é igual à do admin (status, URL final e corpo).")
+            col1, col2 = st.columns(2)
+            with col1:
+                user_login = st.text_input("Usuário comum", value="user", key="ac_user_login")
+                user_password = st.text_input("Senha do usuário comum", type="password", key="ac_user_password")
+            with col2:
+                admin_login = st.text_input("Admin", value="admin", key="ac_admin_login")
+                admin_password = st.text_input("Senha do admin", type="password", key="ac_admin_password")
+            concurrency = st.number_input("Requisições em paralelo", min_value=1, max_value=64, value=6,
+                                          key="ac_concurrency")
+            params['matrix'] = True
+            params['user_credentials'] = [user_login.strip(), user_password] if user_login.strip() else None
+            params['admin_credentials'] = [admin_login.strip(), admin_password]
+            params['concurrency'] = int(concurrency)
     
-    # Verificar se ataque está em progresso e mostrar aviso
-    if st.session_state.attack_in_progress:
-        st.warning("⚡ **Ataque em andamento!** Aguarde a conclusão antes de executar outro ataque.")
+    # Descoberta automática de pontos de injeção / endpoints
+    if selected_attack in CRAWL_ATTACKS:
+        with st.expander("🕸️ Crawler (descoberta automática)"):
+            crawl = st.checkbox("Percorrer a aplicação a partir da URL base e testar todas as páginas encontradas",
+                                value=False, key="crawl",
+                                help="Usa a sessão atual: faça login antes para alcançar as páginas autenticadas.")
+            crawl_start = st.text_input("URL inicial do crawler", value=BASE_URL)
+            col1, col2 = st.columns(2)
+            with col1:
+                crawl_depth = st.number_input("Profundidade máxima", min_value=0, max_value=10, value=CRAWL_MAX_DEPTH)
+            with col2:
+                crawl_max_pages = st.number_input("Máximo de páginas", min_value=1, max_value=5000, value=CRAWL_MAX_PAGES)
+            if crawl:
+                params['crawl'] = True
+                params['crawl_start'] = crawl_start
+                params['crawl_depth'] = int(crawl_depth)
+                params['crawl_max_pages'] = int(crawl_max_pages)
+
+    # Divisão do ataque em shards entre processos (e workers remotos)
+    if selected_attack in DISTRIBUTED_ATTACKS:
+        with st.expander("🧩 Execução distribuída"):
+            processes = st.number_input("Processos locais", min_value=1, max_value=32, value=1,
+                                        help="Com mais de 1, credenciais/payloads são divididos em shards "
+                                             "e o teto de requisições por segundo é repartido entre os processos.")
+            shard_size = st.number_input("Itens por shard (0 = automático)", min_value=0, value=0)
+            listen = st.text_input("Aceitar workers remotos em (host:porta, opcional)", value="",
+                                   help="Workers: python distributed.py --connect host:porta "
+                                        "(chave em ATTACK_DISTRIBUTED_AUTHKEY)")
+            if processes > 1 or listen.strip():
+                params['processes'] = int(processes)
+                if shard_size:
+                    params['shard_size'] = int(shard_size)
+                if listen.strip():
+                    params['listen'] = listen.strip()
+
+    # Ritmo das requisições (comum a todos os ataques)
+    pacing_params = {}
+    with st.expander("🚦 Ritmo das Requisições"):
+        pacing_labels = {"adaptive": "Adaptativo (ajusta pela latência/erros)", "fixed": "Fixo (delay aleatório)"}
+        pacing_mode = st.radio("Modo", PACING_MODES, format_func=pacing_labels.get, horizontal=True,
+                               key="pacing_mode")
+        pacing_params['pacing'] = pacing_mode
+        pacing_params['max_rps'] = st.number_input("Teto de requisições por segundo", min_value=0.1,
+                                                   max_value=1000.0, value=float(PACING_MAX_RPS), step=1.0)
+        if pacing_mode == "fixed" and selected_attack != "Brute Force":
+            default_range = tuple(ATTACK_CLASSES[selected_attack].DEFAULT_DELAY_RANGE)
+            pacing_params['delay_range'] = st.slider("Delay entre requisições (segundos)", 0.0, 5.0,
+                                                     default_range, 0.1)
 
-    # Botão para executar
+    # Botão para executar: o ataque vira um job em segundo plano
     button_clicked = st.button(
-        f"🚀 Executar {selected_attack}" if not st.session_state.attack_in_progress else "⏳ Executando...", 
-        type="primary", 
+        f"🚀 Executar {selected_attack}",
+        type="primary",
         key="execute_attack",
-        disabled=st.session_state.attack_in_progress,
-        help="Clique para iniciar o ataque" if not st.session_state.attack_in_progress else "Aguarde o ataque atual terminar"
+        help="O ataque roda em segundo plano; acompanhe o progresso em Jobs"
     )
 
-    if button_clicked and not st.session_state.attack_in_progress:
+    if button_clicked:
         if not target_url:
             st.error("❌ Por favor, forneça uma URL válida.")
+        elif selected_attack == "Brute Force" and (not params.get('usernames') or not params.get('passwords')):
+            st.error("❌ Por favor, forneça listas de usernames e passwords (texto ou arquivos existentes).")
         elif not any(params.values()) and selected_attack != "SQL Injection":
             st.error("❌ Por favor, forneça parâmetros para o ataque.")
         elif selected_attack == "SQL Injection" and not use_default_sql and not params.get('payloads'):
             st.error("❌ Por favor, forneça payloads SQL ou use os padrão.")
         elif selected_attack == "XSS" and not use_default_xss and not params.get('payloads'):
             st.error("❌ Por favor, forneça payloads XSS ou use os padrão.")
+        elif params.get('matrix') and not params['admin_credentials'][0]:
+            st.error("❌ O modo matriz precisa das credenciais do admin.")
         else:
-            # Marcar que ataque está em progresso IMEDIATAMENTE
-            st.session_state.attack_in_progress = True
-            
-            # Carregar sessão se solicitado
+            # Carregar sessão se solicitado (o job recebe uma cópia da sessão atual)
             if load_session:
                 if tester.session_manager.load_session():
                     st.toast("✅ Sessão carregada com sucesso!", icon="🎉")
                 else:
                     st.toast("⚠️ Não foi possível carregar a sessão. Iniciando uma nova.", icon="🤷")
-            
-            # Forçar atualização da interface
-            st.rerun()
+            try:
+                job = tester.submit_attack(selected_attack, target_url, {**params, **pacing_params})
+                st.toast(f"🚀 Job {job.id} enviado para a fila", icon="🗂️")
+            except RuntimeError as e:
+                st.error(f"❌ {e}")
+
+    # Oferecer retomada da última execução interrompida deste ataque
+    last_checkpoint = Checkpoint(selected_attack)
+    resuming = any(not job.finished and job.attack_type == selected_attack and job.checkpoint_name is None
+                   for job in job_manager().list_jobs())
+    if not resuming and last_checkpoint.can_resume():
+        state = last_checkpoint.state
+        total = state.get("total") or "?"
+        st.info(f"♻️ Existe uma execução interrompida de **{selected_attack}** "
+                f"(posição {state.get('position', 0)}/{total}, atualizada em {state.get('updated_at', '-')}).")
+        if st.button("▶️ Retomar última execução", key="resume_attack"):
+            # Senhas não ficam no checkpoint: usa as do formulário atual
+            resume_params = restore_secrets(last_checkpoint.params, params)
+            try:
+                tester.submit_attack(selected_attack, state["target_url"], resume_params, resume=True)
+                st.rerun()
+            except RuntimeError as e:
+                st.error(f"❌ {e}")
+
+    st.markdown("---")
+    display_jobs()
 
-    # Se o ataque está em progresso, executar o ataque
-    if st.session_state.attack_in_progress and not st.session_state.get('attack_executing', False):
-        # Evitar execução dupla
-        st.session_state.attack_executing = True
-        
-        # Container principal para toda a seção de logs em tempo real
-        realtime_section = st.empty()
-        
-        with realtime_section.container():
-            st.subheader("📺 Logs em Tempo Real:")
-            live_log_container = st.empty()
-        
-        # Container para progresso
-        st.subheader("📊 Progresso do Ataque:")
-        progress_container = st.container()
-        with progress_container:
-            progress_bar = st.progress(0)
-            status_text = st.empty()
-            status_text.text("🚀 Iniciando ataque...")
-        
-        # Executar ataque
-        attack_result = tester.run_attack(
-            selected_attack, 
-            target_url, 
-            params, 
-            live_log_container=live_log_container,
-            progress_container=(progress_bar, status_text)
-        )
-        
-        # Finalizar progresso
-        progress_bar.progress(100)
-        status_text.text("✅ Ataque concluído!")
-        
-        # Marcar que ataque terminou
-        st.session_state.attack_in_progress = False
-        st.session_state.attack_executing = False
-        
-        # Salvar resultado no session state
-        st.session_state.attack_result = attack_result
-        st.session_state.attack_executed = True
-        
-        st.success("🎉 Ataque executado com sucesso!")
-        
-        # Limpar toda a seção de logs em tempo real após execução
-        time.sleep(2)
-        realtime_section.empty()
-        
-        # Forçar atualização da interface para mostrar o botão desbloqueado
-        st.rerun()    
-    
-    # Exibir resultados se ataque foi executado
-    if st.session_state.attack_executed and st.session_state.attack_result and not st.session_state.attack_in_progress:
-        attack_result = st.session_state.attack_result
-        
-        st.subheader("📊 Resultados Detalhados:")
-        if attack_result["result"]:
-            with st.expander("Ver detalhes completos", expanded=True):
-                st.code(attack_result["result"], language="text")
-        
-        # Gráfico de resultados
-        if attack_result["attempts"] > 0:
-            st.subheader("📈 Resumo em Gráfico:")
-            col1, col2 = st.columns(2)
-            
-            with col1:
-                data = pd.DataFrame({
-                    "Métrica": ["Tentativas", "Sucessos"],
-                    "Valor": [attack_result["attempts"], attack_result["success_count"]]
-                })
-                st.bar_chart(data.set_index("Métrica"))
-            
-            with col2:
-                st.metric("Total de Tentativas", attack_result["attempts"])
-                st.metric("Sucessos", attack_result["success_count"], 
-                         delta=f"{(attack_result['success_count']/attack_result['attempts']*100):.1f}% taxa de sucesso")
-    
     # Separador visual
     st.markdown("---")
-    
-    # Exibir logs salvos (só se não estiver executando ataque)
-    if not st.session_state.attack_in_progress:
-        display_logs()
-    
-    # Botão para limpar resultados
-    if st.session_state.attack_executed and not st.session_state.attack_in_progress:
-        if st.button("🧹 Limpar Resultados", key="clear_results"):
-            st.session_state.attack_executed = False
-            st.session_state.attack_result = None
-            st.session_state.live_logs = []
-            st.rerun()
-    
+
+    display_logs()
+    st.markdown("---")
+    display_history()
+
     # Sidebar com informações
     st.sidebar.markdown("---")
 
     # Status na sidebar
-    if st.session_state.attack_in_progress:
-        st.sidebar.warning("⚡ Ataque em andamento...")
-    elif st.session_state.attack_executed:
-        st.sidebar.success("✅ Ataque concluído")
+    active = job_manager().active_count()
+    if active:
+        st.sidebar.warning(f"⚡ {active} job(s) na fila ou em andamento")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
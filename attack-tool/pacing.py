@@ -0,0 +1,149 @@
+import random
+import threading
+import time
+
+from config import (PACING_MODE, PACING_MAX_RPS, PACING_INITIAL_RPS, PACING_MIN_RPS,
+                    PACING_INCREASE, PACING_DECREASE, PACING_LATENCY_FACTOR)
+
+PACING_MODES = ["fixed", "adaptive"]
+
+# Respostas que indicam alvo sobrecarregado (contam como erro para o controle)
+OVERLOAD_STATUS = frozenset([429, 502, 503, 504])
+
+# Crescimento relativo da taxa por resposta antes da primeira redução
+SLOW_START_GROWTH = 0.1
+
+
+class Pacer:
+    """
+    Controle de ritmo compartilhado pelos módulos de ataque.
+
+    Modo "fixed" (padrão): delay aleatório uniforme em delay_range após
+    cada requisição (o comportamento original de cada módulo).
+
+    Modo "adaptive" (opcional): controle AIMD sobre a taxa de requisições. Até a
+    primeira redução a taxa cresce 10% por resposta saudável (como o slow
+    start do TCP); depois disso, cada resposta rápida e sem erro soma
+    `increase` req/s. Erros, status de sobrecarga (429/5xx) ou latência
+    acima de `latency_factor` × a menor latência observada multiplicam a
+    taxa por `decrease` (no máximo uma vez por latência suavizada, para uma
+    rajada de falhas não derrubar a taxa várias vezes). A taxa fica entre
+    min_rps e max_rps.
+
+    Em ambos os modos, max_rps é respeitado entre todas as threads: wait()
+    reserva o próximo horário livre.
+
+    cancel() sinaliza que o ataque deve parar: a partir daí não há mais
+    espera, e os loops dos módulos verificam `cancelled` antes de cada
+    requisição para encerrar com um relatório parcial.
+    """
+
+    def __init__(self, mode=PACING_MODE, delay_range=(0.0, 0.0), max_rps=PACING_MAX_RPS,
+                 initial_rps=PACING_INITIAL_RPS, min_rps=PACING_MIN_RPS,
+                 increase=PACING_INCREASE, decrease=PACING_DECREASE,
+                 latency_factor=PACING_LATENCY_FACTOR, cancel_event=None):
+        if mode not in PACING_MODES:
+            raise ValueError(f"Modo de pacing inválido: {mode}")
+        self.mode = mode
+        self.delay_range = tuple(delay_range)
+        self.max_rps = max_rps or None
+        self.min_rps = min_rps
+        self.increase = increase
+        self.decrease = decrease
+        self.latency_factor = latency_factor
+
+        self.rate = min(initial_rps, self.max_rps) if self.max_rps else initial_rps
+        self.min_latency = None
+        self.smoothed_latency = None
+        self.increases = 0
+        self.decreases = 0
+
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+        self._last_decrease = 0.0
+        # Evento compartilhado com quem pode cancelar o ataque (ex.: um job)
+        self._cancel = cancel_event or threading.Event()
+
+    @classmethod
+    def unlimited(cls):
+        """Sem delay e sem teto (benchmarks e alvos locais)."""
+        return cls(mode="fixed", delay_range=(0.0, 0.0), max_rps=None)
+
+    def cancel(self):
+        self._cancel.set()
+
+    @property
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    @property
+    def interval(self):
+        """Intervalo mínimo (s) entre o início de duas requisições."""
+        if self.mode == "adaptive":
+            return 1.0 / self.rate
+        return 1.0 / self.max_rps if self.max_rps else 0.0
+
+    def next_delay(self):
+        """
+        Reserva a vez da próxima requisição e retorna quanto o chamador
+        deve aguardar antes de enviá-la.
+        """
+        if self._cancel.is_set():
+            return 0.0
+        extra = random.uniform(*self.delay_range) if self.mode == "fixed" else 0.0
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now + extra, self._next_slot)
+            self._next_slot = slot + self.interval
+        return slot - now
+
+    def wait(self):
+        """Aguarda a vez da próxima requisição (para workers de um pool)."""
+        delay = self.next_delay()
+        if delay > 0:
+            # Interrompida por cancel()
+            self._cancel.wait(delay)
+        return delay
+
+    def record(self, response=None, error=None):
+        """Alimenta o controle com o resultado de uma requisição."""
+        if self.mode != "adaptive":
+            return
+        latency = response.elapsed.total_seconds() if response is not None else None
+        overloaded = error is not None or (response is not None and response.status_code in OVERLOAD_STATUS)
+
+        with self._lock:
+            if latency is not None:
+                self.min_latency = latency if self.min_latency is None else min(self.min_latency, latency)
+                self.smoothed_latency = (latency if self.smoothed_latency is None
+                                         else 0.8 * self.smoothed_latency + 0.2 * latency)
+                # Latência muito acima da melhor já vista indica fila no servidor
+                slow = latency > self.latency_factor * max(self.min_latency, 0.01)
+            else:
+                slow = False
+
+            if overloaded or slow:
+                now = time.monotonic()
+                if now - self._last_decrease >= (self.smoothed_latency or 0.0):
+                    self.rate = max(self.min_rps, self.rate * self.decrease)
+                    self._last_decrease = now
+                    self.decreases += 1
+            else:
+                if self.decreases:
+                    self.rate += self.increase
+                else:
+                    self.rate += max(self.increase, self.rate * SLOW_START_GROWTH)
+                if self.max_rps:
+                    self.rate = min(self.rate, self.max_rps)
+                self.increases += 1
+
+    def describe(self):
+        """Resumo do ritmo para os logs."""
+        if self.mode == "fixed":
+            low, high = self.delay_range
+            ceiling = f", teto {self.max_rps:g} req/s" if self.max_rps else ""
+            return f"delay fixo {low:g}-{high:g}s{ceiling}"
+        ceiling = f"{self.max_rps:g}" if self.max_rps else "∞"
+        latency = f", latência média {self.smoothed_latency * 1000:.0f}ms" if self.smoothed_latency else ""
+        return (f"adaptativo {self.rate:.1f} req/s (teto {ceiling}){latency}, "
+                f"{self.increases} aumentos / {self.decreases} reduções")
@@ -0,0 +1,309 @@
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+from contextlib import closing
+
+from checkpoint import serialize_params
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id TEXT PRIMARY KEY,
+    attack_type TEXT NOT NULL,
+    target_url TEXT,
+    params TEXT,
+    log_file TEXT,
+    events_file TEXT,
+    started_at REAL NOT NULL,
+    finished_at REAL,
+    status TEXT NOT NULL DEFAULT 'running',
+    attempts INTEGER,
+    success_count INTEGER,
+    transport TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_runs_started ON runs (started_at);
+
+CREATE TABLE IF NOT EXISTS attempts (
+    id INTEGER PRIMARY KEY,
+    run_id TEXT NOT NULL,
+    ts REAL,
+    module TEXT,
+    phase TEXT,
+    url TEXT,
+    field TEXT,
+    payload TEXT,
+    status INTEGER,
+    latency_ms REAL,
+    size INTEGER,
+    verdict TEXT,
+    detail TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_attempts_run ON attempts (run_id, verdict);
+CREATE INDEX IF NOT EXISTS idx_attempts_field ON attempts (field);
+
+CREATE TABLE IF NOT EXISTS findings (
+    id INTEGER PRIMARY KEY,
+    run_id TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    url TEXT,
+    field TEXT,
+    payload TEXT,
+    detail TEXT,
+    found_at REAL
+);
+CREATE INDEX IF NOT EXISTS idx_findings_run ON findings (run_id);
+CREATE INDEX IF NOT EXISTS idx_findings_field ON findings (field, found_at);
+
+CREATE TABLE IF NOT EXISTS timings (
+    run_id TEXT NOT NULL,
+    name TEXT NOT NULL,
+    seconds REAL NOT NULL,
+    PRIMARY KEY (run_id, name)
+);
+"""
+
+ATTEMPT_COLUMNS = ["run_id", "ts", "module", "phase", "url", "field", "payload",
+                   "status", "latency_ms", "size", "verdict", "detail"]
+
+
+class _FlushRequest:
+    def __init__(self):
+        self.done = threading.Event()
+
+
+# Tipo de achado por ataque
+FINDING_KINDS = {
+    "Brute Force": "credential",
+    "SQL Injection": "sql_injection",
+    "XSS": "xss",
+    "Access Control": "access_control",
+}
+
+
+def finding_row(run_id, attack_type, finding, found_at):
+    """
+    Normaliza um achado (VulnerabilityResult serializado, dicionários de
+    XSS/controle de acesso ou credencial válida) para a tabela findings.
+    """
+    field = (finding.get("field") or finding.get("param") or finding.get("username")
+             or finding.get("role"))
+    payload = finding.get("payload") or finding.get("password")
+    url = finding.get("response_url") or finding.get("url") or finding.get("endpoint")
+    return (run_id, FINDING_KINDS.get(attack_type, attack_type), url, field,
+            None if payload is None else str(payload),
+            json.dumps(finding, ensure_ascii=False, default=str), found_at)
+
+
+class ResultsStore:
+    """
+    Banco SQLite local com execuções, tentativas, achados e tempos.
+
+    As tentativas chegam dos loops de ataque (via EventLog) e só são
+    enfileiradas; uma thread dedicada com sua própria conexão grava em lote
+    (uma transação a cada flush_interval segundos ou max_batch registros).
+    Consultas abrem conexões de leitura separadas; o modo WAL permite ler
+    enquanto um ataque está gravando.
+    """
+
+    def __init__(self, path, flush_interval=0.5, max_batch=1000):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+        self._queue = queue.SimpleQueue()
+        self._thread = None
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with closing(self._connect()) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    # --- Escrita em lote ---
+
+    def _ensure_thread(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="results-store", daemon=True)
+                self._thread.start()
+
+    def _submit(self, sql, params):
+        self._ensure_thread()
+        self._queue.put((sql, params))
+
+    def _run(self):
+        conn = self._connect()
+        conn.execute("PRAGMA synchronous=NORMAL")
+        while True:
+            item = self._queue.get()
+            batch = [item]
+            deadline = time.monotonic() + self.flush_interval
+            # Agrupa o que chegar até o prazo (ou até um pedido de flush)
+            while len(batch) < self.max_batch and not isinstance(batch[-1], _FlushRequest):
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=timeout))
+                except queue.Empty:
+                    break
+            self._write_batch(conn, batch)
+
+    def _write_batch(self, conn, batch):
+        # Comandos iguais consecutivos (em geral tentativas) viram um executemany;
+        # a ordem entre comandos diferentes é preservada
+        groups = []
+        flushes = []
+        for item in batch:
+            if isinstance(item, _FlushRequest):
+                flushes.append(item)
+                continue
+            sql, params = item
+            if groups and groups[-1][0] == sql:
+                groups[-1][1].append(params)
+            else:
+                groups.append((sql, [params]))
+        try:
+            with conn:
+                for sql, rows in groups:
+                    conn.executemany(sql, rows)
+        except sqlite3.Error as e:
+            print(f"Erro ao gravar resultados: {e}")
+        for request in flushes:
+            request.done.set()
+
+    def flush(self, timeout=5.0):
+        """Bloqueia até que tudo o que foi enfileirado antes da chamada esteja gravado."""
+        if self._thread is None or not self._thread.is_alive():
+            return True
+        request = _FlushRequest()
+        self._queue.put(request)
+        return request.done.wait(timeout)
+
+    # --- Execuções ---
+
+    def start_run(self, run_id, attack_type, target_url, params, log_file, events_file, replay_from=None):
+        """
+        Registra o início da execução (na retomada, a linha existente é mantida).
+        replay_from: na retomada, epoch da última gravação do checkpoint; as
+        tentativas posteriores a ele são descartadas, pois serão refeitas.
+        """
+        self._submit(
+            "INSERT INTO runs (run_id, attack_type, target_url, params, log_file, events_file, started_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT(run_id) DO UPDATE SET status = 'running', finished_at = NULL",
+            (run_id, attack_type, target_url, json.dumps(serialize_params(params), ensure_ascii=False, default=str),
+             log_file, events_file, time.time()),
+        )
+        if replay_from is not None:
+            self._submit("DELETE FROM attempts WHERE run_id = ? AND ts > ?", (run_id, replay_from))
+
+    def record_event(self, record):
+        """Listener do EventLog: cada evento vira uma linha em attempts."""
+        self._submit(
+            f"INSERT INTO attempts ({', '.join(ATTEMPT_COLUMNS)}) VALUES ({', '.join('?' * len(ATTEMPT_COLUMNS))})",
+            tuple(record.get(column) for column in ATTEMPT_COLUMNS),
+        )
+
+    def finish_run(self, run_id, attack_type, findings, attempts, success_count,
+                   transport=None, timings=None, status="completed"):
+        """Grava achados (substituindo os de uma execução retomada), tempos e totais."""
+        now = time.time()
+        self._submit("DELETE FROM findings WHERE run_id = ?", (run_id,))
+        for finding in findings:
+            self._submit(
+                "INSERT INTO findings (run_id, kind, url, field, payload, detail, found_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                finding_row(run_id, attack_type, finding, now),
+            )
+        for name, seconds in (timings or {}).items():
+            self._submit("INSERT OR REPLACE INTO timings (run_id, name, seconds) VALUES (?, ?, ?)",
+                         (run_id, name, seconds))
+        self._submit(
+            "UPDATE runs SET finished_at = ?, status = ?, attempts = ?, success_count = ?, transport = ? "
+            "WHERE run_id = ?",
+            (now, status, attempts, success_count, json.dumps(transport or {}), run_id),
+        )
+        self.flush()
+
+    # --- Consultas ---
+
+    def _query(self, sql, params=()):
+        with closing(self._connect()) as conn:
+            return [dict(row) for row in conn.execute(sql, params)]
+
+    def list_runs(self, limit=50, attack_type=None):
+        sql = ("SELECT run_id, attack_type, target_url, status, attempts, success_count, "
+               "started_at, finished_at, finished_at - started_at AS duration_s FROM runs")
+        params = []
+        if attack_type:
+            sql += " WHERE attack_type = ?"
+            params.append(attack_type)
+        sql += " ORDER BY started_at DESC LIMIT ?"
+        params.append(limit)
+        return self._query(sql, params)
+
+    def get_run(self, run_id):
+        rows = self._query("SELECT * FROM runs WHERE run_id = ?", (run_id,))
+        return rows[0] if rows else None
+
+    def findings(self, run_id=None, kind=None, field=None, since=None, limit=1000):
+        """Achados filtrados por execução, tipo, campo e data (epoch)."""
+        sql = ("SELECT f.run_id, r.attack_type, f.kind, f.url, f.field, f.payload, f.found_at "
+               "FROM findings f JOIN runs r ON r.run_id = f.run_id WHERE 1 = 1")
+        params = []
+        for column, value in (("f.run_id", run_id), ("f.kind", kind), ("f.field", field)):
+            if value:
+                sql += f" AND {column} = ?"
+                params.append(value)
+        if since is not None:
+            sql += " AND f.found_at >= ?"
+            params.append(since)
+        sql += " ORDER BY f.found_at DESC LIMIT ?"
+        params.append(limit)
+        return self._query(sql, params)
+
+    def vulnerable_fields(self, since=None):
+        """Campos com achados (e em quantas execuções) desde a data indicada."""
+        sql = ("SELECT kind, field, url, COUNT(*) AS findings, COUNT(DISTINCT run_id) AS runs, "
+               "MAX(found_at) AS last_found FROM findings")
+        params = []
+        if since is not None:
+            sql += " WHERE found_at >= ?"
+            params.append(since)
+        sql += " GROUP BY kind, field, url ORDER BY last_found DESC"
+        return self._query(sql, params)
+
+    def attempt_stats(self, run_id):
+        """Tentativas da execução por fase/veredicto, com latência média e tamanho médio."""
+        return self._query(
+            "SELECT module, phase, verdict, COUNT(*) AS attempts, AVG(latency_ms) AS avg_latency_ms, "
+            "AVG(size) AS avg_size FROM attempts WHERE run_id = ? "
+            "GROUP BY module, phase, verdict ORDER BY module, phase, verdict",
+            (run_id,),
+        )
+
+    def timings(self, run_id):
+        return {row["name"]: row["seconds"] for row in
+                self._query("SELECT name, seconds FROM timings WHERE run_id = ?", (run_id,))}
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def get_results_store(path):
+    """Store compartilhado por caminho (uma thread de escrita por banco)."""
+    with _stores_lock:
+        store = _stores.get(path)
+        if store is None:
+            store = _stores[path] = ResultsStore(path)
+        return store
@@ -0,0 +1,294 @@
+import os
+import time
+from dataclasses import asdict
+
+from config import (get_log_filename, log_result, flush_logs, restore_secrets, BASE_URL, PACING_MODE,
+                    PACING_MAX_RPS, RESULTS_DB)
+from checkpoint import Checkpoint
+from events import EventLog, events_filename
+from results_store import get_results_store
+from distributed import Coordinator, DISTRIBUTED_ATTACKS
+from live_log import LiveLogSink
+from pacing import Pacer
+from session_pool import Identity, SessionPool
+from attacks.crawler import Crawler, CRAWL_MAX_DEPTH, CRAWL_MAX_PAGES, CRAWL_WORKERS
+from attacks.brute_force import BruteForceAttack
+from attacks.credential_strategies import CredentialStrategy
+from attacks.sql_injection import SQLInjectionAttack
+from attacks.xss import XSSAttack
+from attacks.access_control import AccessControlAttack
+
+ATTACK_TYPES = ["Brute Force", "SQL Injection", "XSS", "Access Control"]
+
+ATTACK_CLASSES = {
+    "Brute Force": BruteForceAttack,
+    "SQL Injection": SQLInjectionAttack,
+    "XSS": XSSAttack,
+    "Access Control": AccessControlAttack,
+}
+
+
+def build_pacer(attack_type, params, cancel_event=None):
+    """
+    Cria o Pacer de um ataque a partir dos params: 'pacing' (modo),
+    'max_rps' (teto) e 'delay_range' (modo fixo). No Brute Force, 'delay'
+    mantém o significado original (delay/2 a delay*1.5). cancel_event
+    (threading.Event), quando definido, interrompe o ataque.
+    """
+    delay_range = params.get('delay_range')
+    if delay_range is None and params.get('delay') is not None:
+        delay = params['delay']
+        delay_range = (delay / 2, delay * 1.5)
+    if delay_range is None:
+        delay_range = ATTACK_CLASSES[attack_type].DEFAULT_DELAY_RANGE
+    return Pacer(mode=params.get('pacing', PACING_MODE),
+                 delay_range=delay_range,
+                 max_rps=params.get('max_rps', PACING_MAX_RPS),
+                 cancel_event=cancel_event)
+
+
+# Ataques que aceitam o catálogo do crawler
+CRAWL_ATTACKS = ["SQL Injection", "XSS", "Access Control"]
+
+
+def build_session_pool(session_manager, params, log_file):
+    """
+    Identidades do modo matriz do controle de acesso: anônima e as
+    credenciais (username, password) de params['user_credentials'] e
+    params['admin_credentials'].
+    """
+    identities = [Identity("anonymous")]
+    for role in ("user", "admin"):
+        credentials = params.get(f'{role}_credentials')
+        if credentials and credentials[0]:
+            if credentials[1] is None:
+                log_result(f"🔑 Senha de {credentials[0]} ausente (não é salva no checkpoint): "
+                           f"informe as credenciais novamente para retomar", log_file)
+            identities.append(Identity(role, *credentials))
+    return SessionPool(session_manager, identities, log_file=log_file)
+
+
+def crawl_site(session_manager, params, log_file, pacer=None, live_log_container=None,
+               progress_container=None, events=None):
+    """
+    Executa o crawler a partir de params['crawl_start'] (ou BASE_URL) com a
+    sessão atual e retorna o SiteCatalogue. Os logs vão para o mesmo
+    arquivo do ataque.
+    """
+    sink = LiveLogSink(log_file, live_log_container, progress_container, key_prefix="live_logs_crawl")
+    start_url = params.get('crawl_start') or BASE_URL
+    sink.add_log(f"🕸️ Crawler a partir de {start_url}", 0)
+    crawler = Crawler(session_manager,
+                      max_depth=params.get('crawl_depth', CRAWL_MAX_DEPTH),
+                      max_pages=params.get('crawl_max_pages', CRAWL_MAX_PAGES),
+                      workers=params.get('crawl_workers', CRAWL_WORKERS),
+                      pacer=pacer, add_log=sink.add_log, events=events)
+    catalogue = crawler.crawl(start_url)
+    sink.flush()
+    return catalogue
+
+
+def run_attack(session_manager, attack_type, target_url, params, live_log_container=None,
+               progress_container=None, resume=False, cancel_event=None, checkpoint_name=None):
+    """
+    Executa um ataque e retorna um dicionário com relatório, contadores e achados.
+
+    Não depende do Streamlit: os containers de log/progresso são opcionais,
+    o que permite usar o mesmo fluxo pela interface web e pela linha de comando.
+    Com resume=True, retoma a última execução interrompida a partir do checkpoint.
+    cancel_event (threading.Event) encerra o ataque com resultados parciais
+    (status "cancelled", checkpoint mantido); checkpoint_name separa o
+    checkpoint desta execução do padrão do ataque.
+    """
+    try:
+        return _run_attack(session_manager, attack_type, target_url, params,
+                           live_log_container, progress_container, resume,
+                           cancel_event, checkpoint_name)
+    finally:
+        # Garante que o log do ataque está completo em disco (inclusive em caso de erro)
+        flush_logs()
+
+
+def _run_attack(session_manager, attack_type, target_url, params, live_log_container=None,
+                progress_container=None, resume=False, cancel_event=None, checkpoint_name=None):
+    result = None
+    success_count = 0
+    attempts = 0
+    findings = []
+    extracted = []
+    session_manager.transport_stats.reset()
+    if session_manager.http_cache is not None:
+        session_manager.http_cache.reset_stats()
+
+    if attack_type not in ATTACK_TYPES:
+        return {
+            "result": "Ataque não suportado.",
+            "attempts": 0,
+            "success_count": 0,
+            "findings": [],
+            "extracted": [],
+            "log_file": "",
+            "events_file": "",
+            "run_id": "",
+            "status": "failed",
+            "transport": session_manager.get_transport_stats()
+        }
+
+    checkpoint = Checkpoint(attack_type, name=checkpoint_name)
+    replay_from = None
+    if resume and checkpoint.can_resume():
+        # Retomada: alvo, parâmetros e arquivo de log vêm do checkpoint
+        target_url = checkpoint.state["target_url"]
+        # Senhas não são salvas no checkpoint: vêm dos params informados agora
+        params = restore_secrets(checkpoint.params, params)
+        log_file = checkpoint.state["log_file"]
+        # Tentativas gravadas depois do checkpoint serão refeitas
+        replay_from = checkpoint.saved_at
+    else:
+        log_file = get_log_filename()
+        checkpoint.start(target_url, params, log_file)
+
+    pacer = build_pacer(attack_type, params, cancel_event)
+    # Registros estruturados ao lado do log de texto e no banco de resultados;
+    # a retomada continua no mesmo arquivo e na mesma execução
+    run_id = os.path.splitext(os.path.basename(log_file))[0]
+    store = get_results_store(RESULTS_DB)
+    events = EventLog(events_filename(log_file), run_id=run_id, listeners=[store.record_event])
+    store.start_run(run_id, attack_type, target_url, params, log_file, events.path, replay_from=replay_from)
+    timings = {}
+
+    catalogue = None
+    if params.get('crawl') and attack_type in CRAWL_ATTACKS:
+        started = time.monotonic()
+        catalogue = crawl_site(session_manager, params, log_file, pacer,
+                               live_log_container, progress_container, events=events)
+        timings["crawl"] = time.monotonic() - started
+
+    started = time.monotonic()
+
+    distributed = attack_type in DISTRIBUTED_ATTACKS and (
+        params.get('processes', 1) > 1 or params.get('listen'))
+
+    # Passa o session_manager compartilhado para cada ataque
+    if distributed:
+        # Execução em shards por vários processos/máquinas (sem checkpoint por posição)
+        sink = LiveLogSink(log_file, live_log_container, progress_container, key_prefix="live_logs_dist")
+        coordinator = Coordinator(session_manager, attack_type, target_url, params,
+                                  processes=params.get('processes', 1),
+                                  shard_size=params.get('shard_size'),
+                                  listen=params.get('listen'),
+                                  add_log=sink.add_log,
+                                  should_stop=lambda: pacer.cancelled,
+                                  pacer=pacer)
+        merged = coordinator.run(log_file, run_id=run_id, catalogue=catalogue, events=events)
+        sink.flush()
+        checkpoint.complete()
+        result = merged["result"]
+        attempts = merged["attempts"]
+        success_count = merged["success_count"]
+        findings = merged["findings"]
+
+    elif attack_type == "Brute Force":
+        attack = BruteForceAttack(session_manager)
+        usernames = params.get('usernames') or []
+        passwords = params.get('passwords') or []
+
+        result = attack.run(target_url, usernames, passwords,
+                            max_attempts=params.get('max_attempts', 50),
+                            pacer=pacer,
+                            concurrency=params.get('concurrency', 1),
+                            max_per_host=params.get('max_per_host'),
+                            log_file=log_file,
+                            live_log_container=live_log_container,
+                            progress_container=progress_container,
+                            checkpoint=checkpoint,
+                            events=events,
+                            strategy=CredentialStrategy.from_params(params))
+        attempts = attack.total_attempts
+        # Após o ataque, a sessão já é salva automaticamente no authenticate bem-sucedido
+        success_count = len(attack.valid_credentials)
+        findings = [{"username": u, "password": p} for u, p in attack.valid_credentials]
+
+    elif attack_type == "SQL Injection":
+        attack = SQLInjectionAttack(session_manager)
+        payloads = params.get('payloads', None)
+
+        result = attack.run(target_url, payloads,
+                            log_file=log_file,
+                            pacer=pacer,
+                            blind_extraction=params.get('blind_extraction', False),
+                            blind_workers=params.get('blind_workers', 4),
+                            blind_max_rows=params.get('blind_max_rows', 10),
+                            catalogue=catalogue,
+                            events=events,
+                            live_log_container=live_log_container,
+                            progress_container=progress_container,
+                            checkpoint=checkpoint)
+
+        # Usar contagem real de tentativas
+        attempts = attack.total_attempts
+        success_count = len(attack.vulnerabilities)
+        findings = [asdict(v) for v in attack.vulnerabilities]
+        extracted = attack.extracted_rows
+
+    elif attack_type == "XSS":
+        attack = XSSAttack(session_manager)
+        payloads = params.get('payloads', None)
+
+        # O método run retorna uma tupla (relatório, total_de_testes)
+        result, attempts = attack.run(target_url, payloads, log_file=log_file, pacer=pacer,
+                                      catalogue=catalogue, events=events,
+                                      live_log_container=live_log_container,
+                                      progress_container=progress_container,
+                                      checkpoint=checkpoint)
+
+        success_count = len(attack.vulnerabilities)
+        findings = list(attack.vulnerabilities)
+
+    elif attack_type == "Access Control":
+        attack = AccessControlAttack(session_manager)
+        endpoints = params.get('endpoints', [])
+        session_pool = build_session_pool(session_manager, params, log_file) if params.get('matrix') else None
+        result = attack.run(target_url, endpoints, log_file=log_file, pacer=pacer,
+                            catalogue=catalogue, events=events,
+                            live_log_container=live_log_container,
+                            progress_container=progress_container,
+                            checkpoint=checkpoint,
+                            session_pool=session_pool,
+                            concurrency=params.get('concurrency', 1))
+        attempts = attack.total_requests
+        success_count = len(attack.vulnerabilities)
+        findings = list(attack.vulnerabilities)
+
+    timings["attack"] = time.monotonic() - started
+
+    if not result:
+        result = "Nenhum resultado detalhado retornado, mas o ataque foi executado."
+
+    if attack_type in ("Brute Force", "SQL Injection"):
+        # Os POSTs de login podem ter autenticado o PHPSESSID da sessão
+        session_manager.invalidate_http_cache()
+    if session_manager.http_cache is not None:
+        log_result(f"🗄️ Cache HTTP: {session_manager.http_cache.describe()}", log_file)
+        session_manager.http_cache.save()
+
+    status = "cancelled" if pacer.cancelled else "completed"
+    if pacer.cancelled:
+        log_result("⛔ Execução cancelada: resultados parciais.", log_file)
+
+    transport = session_manager.get_transport_stats()
+    store.finish_run(run_id, attack_type, findings, attempts, success_count,
+                     transport=transport, timings=timings, status=status)
+
+    return {
+        "result": result,
+        "attempts": attempts,
+        "success_count": success_count,
+        "findings": findings,
+        "extracted": extracted,
+        "log_file": log_file,
+        "events_file": events.path,
+        "run_id": run_id,
+        "status": status,
+        "transport": transport
+    }
@@ -1,16 +1,108 @@
-import requests
 import os
 import pickle
-from config import BASE_URL, ENDPOINTS, log_result
+from config import (BASE_URL, ENDPOINTS, log_result, HTTP_POOL_SIZE, HTTP_TIMEOUT,
+                    HTTP_RETRIES, HTTP_RETRY_STATUSES, DNS_CACHE_TTL, HTTP_CACHE_ENABLED, HTTP_CACHE_TTL,
+                    HTTP_CACHE_FILE)
+from http_cache import HTTPCache
+from transport import DNSCache, TransportStats, build_session
 
 class SessionManager:
-    def __init__(self, session_file='sessions/current_session.pkl'):
-        self.session = requests.Session()
+    def __init__(self, session_file='sessions/current_session.pkl', pool_size=HTTP_POOL_SIZE,
+                 timeout=HTTP_TIMEOUT, retries=HTTP_RETRIES, http_cache=HTTP_CACHE_ENABLED,
+                 retry_statuses=HTTP_RETRY_STATUSES):
+        self.dns_cache = DNSCache(ttl=DNS_CACHE_TTL)
+        self.transport_stats = TransportStats()
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.retries = retries
+        self.retry_statuses = tuple(retry_statuses)
+        self.session = build_session(pool_size=pool_size, timeout=timeout, retries=retries,
+                                     dns_cache=self.dns_cache, stats=self.transport_stats,
+                                     retry_statuses=self.retry_statuses)
         self.is_authenticated = False
         self.is_admin = False
         self.current_user = None
         self.valid_credentials = []
         self.session_file = session_file
+        self.http_cache = None
+        if http_cache:
+            self.enable_http_cache()
+
+    def clone(self):
+        """
+        Cópia independente (sessão HTTP, pool e estatísticas próprios) com os
+        mesmos cookies e estado de autenticação, para um ataque em segundo
+        plano não depender da sessão da interface. O cache HTTP é
+        compartilhado: as entradas são separadas por identidade de cookies, e
+        uma mudança de autenticação em qualquer cópia (invalidate_http_cache)
+        descarta as páginas daquela identidade para todas.
+        """
+        clone = SessionManager(session_file=self.session_file, pool_size=self.pool_size,
+                               timeout=self.timeout, retries=self.retries, http_cache=False,
+                               retry_statuses=self.retry_statuses)
+        clone.session.cookies.update(self.session.cookies)
+        clone.is_authenticated = self.is_authenticated
+        clone.is_admin = self.is_admin
+        clone.current_user = self.current_user
+        clone.valid_credentials = list(self.valid_credentials)
+        clone.http_cache = self.http_cache
+        return clone
+
+    def enable_http_cache(self, ttl=HTTP_CACHE_TTL, path=HTTP_CACHE_FILE):
+        """
+        Ativa o cache de GETs seguros (ETag/Last-Modified + TTL, por identidade
+        de cookies). path=None mantém o cache só em memória.
+        """
+        if self.http_cache is None or self.http_cache.path != path:
+            self.http_cache = HTTPCache(ttl=ttl, path=path)
+        self.http_cache.ttl = ttl
+        return self.http_cache
+
+    def disable_http_cache(self):
+        if self.http_cache is not None:
+            self.http_cache.save()
+        self.http_cache = None
+
+    def cached_get(self, url, **kwargs):
+        """
+        GET para descoberta/leitura: passa pelo cache HTTP quando ativo.
+        Respostas servidas pelo cache têm o atributo from_cache.
+        """
+        if self.http_cache is None:
+            return self.session.get(url, **kwargs)
+        return self.http_cache.get(self.session, url, **kwargs)
+
+    def invalidate_http_cache(self):
+        """
+        Descarta as páginas em cache da identidade atual. Chamado a cada mudança
+        no estado de autenticação; como as entradas são indexadas pelos cookies,
+        vale também para as cópias (clone) que compartilham o cache e a sessão.
+        """
+        if self.http_cache is not None:
+            self.http_cache.invalidate(self.session)
+
+    def cached_parse(self, name, response, parser):
+        """parser(response), reaproveitado pelo cache HTTP para corpos já analisados."""
+        if self.http_cache is None:
+            return parser(response)
+        return self.http_cache.parsed(name, response, parser)
+
+    def configure_transport(self, concurrency=1):
+        """
+        Redimensiona o pool de conexões para o nível de concorrência desejado.
+        Cookies e estado de autenticação são preservados.
+        """
+        pool_size = max(HTTP_POOL_SIZE, int(concurrency))
+        if pool_size != self.pool_size:
+            self.pool_size = pool_size
+            build_session(pool_size=pool_size, timeout=self.timeout, retries=self.retries,
+                          dns_cache=self.dns_cache, stats=self.transport_stats, session=self.session,
+                          retry_statuses=self.retry_statuses)
+        return self.pool_size
+
+    def get_transport_stats(self):
+        """Retorna estatísticas de conexões (novas vs. reutilizadas) e bytes trafegados."""
+        return self.transport_stats.snapshot()
 
     def save_session(self):
         """Salva os cookies da sessão atual em um arquivo."""
@@ -30,6 +122,7 @@ class SessionManager:
             if os.path.exists(self.session_file):
                 with open(self.session_file, 'rb') as f:
                     self.session.cookies = pickle.load(f)
+                self.invalidate_http_cache()
                 self.is_authenticated = True  # Assume que a sessão salva é autenticada
                 print(f"Sessão carregada de {self.session_file}")
                 return True
@@ -70,6 +163,8 @@ class SessionManager:
         
         try:
             response = self.session.post(login_url, data=payload, allow_redirects=True)
+            # Mesmo PHPSESSID, estado de autenticação possivelmente novo
+            self.invalidate_http_cache()
             
             if any(indicator in response.text for indicator in ["Bem-vindo", "Home"]):
                 self.is_authenticated = True
@@ -114,6 +209,7 @@ class SessionManager:
     
     def logout(self, log_file):
         """Faz logout e remove o arquivo de sessão"""
+        self.invalidate_http_cache()
         self.session.cookies.clear()
         self.is_authenticated = False
         self.is_admin = False
@@ -0,0 +1,198 @@
+import os
+import threading
+import time
+
+import requests
+
+from concurrency import bounded_map
+from config import get_log_filename, log_result, BASE_URL, SESSION_POOL_DIR, SESSION_POOL_PROBE
+from session_manager import SessionManager
+
+# Página de login reconhecida em uma resposta (sessão expirada ou ausente)
+LOGIN_FORM_MARKERS = ('name="Senha"', 'value="Login"')
+
+
+def is_login_page(response):
+    """A resposta é o formulário de login."""
+    text = response.text if "html" in response.headers.get("Content-Type", "text/html") else ""
+    return all(marker in text for marker in LOGIN_FORM_MARKERS)
+
+
+def is_expired(response):
+    """
+    A requisição foi redirecionada para o formulário de login: sessão
+    expirada ou acesso negado àquela página (SessionPool.request distingue).
+    """
+    return bool(response.history) and is_login_page(response)
+
+
+class Identity:
+    """
+    Uma identidade do pool: credenciais (ou anônima), cookies da última
+    autenticação e a geração, que muda a cada novo login.
+    """
+
+    def __init__(self, name, username=None, password=None):
+        self.name = name
+        self.username = username
+        self.password = password
+        self.cookies = requests.cookies.RequestsCookieJar()
+        self.is_authenticated = False
+        self.is_admin = False
+        self.generation = 0
+        self.logins = 0
+        self.failed = False
+        self.authenticated_at = None
+        # URLs que negaram acesso à geração atual com a sessão ainda válida
+        self.denied = set()
+        self.lock = threading.Lock()
+
+    @property
+    def anonymous(self):
+        return not self.username
+
+
+class SessionPool:
+    """
+    Sessões autenticadas de várias identidades para testes em paralelo.
+
+    Cada identidade faz login uma vez (login_all, em paralelo) e tem seus
+    cookies guardados. Os workers recebem com session(nome) uma sessão
+    isolada por thread, com cópia desses cookies, que compartilha o pool
+    de conexões do SessionManager principal. Quando uma resposta redireciona
+    para o login, request() busca a página autenticada probe_url: se ela
+    ainda abre, foi só acesso negado (a URL fica marcada para a geração e
+    não é sondada de novo); senão a sessão expirou e o login é refeito só
+    para aquela identidade, sob o lock dela: os outros workers continuam, e
+    quem detectou a expiração da mesma geração espera um único novo login.
+    """
+
+    def __init__(self, session_manager, identities, log_file=None, session_dir=SESSION_POOL_DIR,
+                 probe_url=None):
+        self.session_manager = session_manager
+        self.probe_url = probe_url or f"{BASE_URL}{SESSION_POOL_PROBE}"
+        self.log_file = log_file or get_log_filename("session_pool")
+        self.session_dir = session_dir
+        self.identities = {}
+        for identity in identities:
+            if not isinstance(identity, Identity):
+                identity = Identity(*identity)
+            self.identities[identity.name] = identity
+        self.reauths = 0
+        self.denials = 0
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    # --- Login ---
+
+    def _login(self, identity):
+        manager = SessionManager(session_file=os.path.join(self.session_dir, f"{identity.name}.pkl"),
+                                 http_cache=False)
+        # O login também usa o pool de conexões compartilhado
+        for prefix, adapter in self.session_manager.session.adapters.items():
+            manager.session.mount(prefix, adapter)
+        if identity.anonymous:
+            ok = True
+        else:
+            ok = manager.authenticate(identity.username, identity.password, self.log_file)
+        # Nova geração: as sessões dos workers recebem os cookies novos na próxima requisição
+        identity.cookies = manager.session.cookies.copy()
+        identity.is_authenticated = ok and not identity.anonymous
+        identity.is_admin = ok and manager.is_admin
+        identity.failed = not ok
+        identity.generation += 1
+        identity.denied = set()
+        identity.logins += 1
+        identity.authenticated_at = time.time()
+        return ok
+
+    def login_all(self, workers=4):
+        """Autentica todas as identidades (em paralelo) e retorna {nome: sucesso}."""
+        def login(identity):
+            with identity.lock:
+                return self._login(identity)
+
+        results = {}
+        for identity, ok, error in bounded_map(login, list(self.identities.values()), workers):
+            if error is not None:
+                log_result(f"🔥 Erro no login da identidade {identity.name}: {error}", self.log_file)
+                identity.failed = True
+                ok = False
+            results[identity.name] = ok
+        return results
+
+    def reauthenticate(self, name, seen_generation):
+        """
+        Refaz o login da identidade se ela ainda está na geração vista pelo
+        chamador; se outro worker já renovou a sessão, só retorna.
+        """
+        identity = self.identities[name]
+        with identity.lock:
+            if identity.generation != seen_generation:
+                return not identity.failed
+            log_result(f"🔑 Sessão de {name} expirada: novo login", self.log_file)
+            with self._lock:
+                self.reauths += 1
+            return self._login(identity)
+
+    # --- Sessões dos workers ---
+
+    def session(self, name):
+        """Sessão isolada da thread atual para a identidade (cookies da geração atual)."""
+        identity = self.identities[name]
+        sessions = getattr(self._local, "sessions", None)
+        if sessions is None:
+            sessions = self._local.sessions = {}
+        entry = sessions.get(name)
+        if entry is None:
+            shared = self.session_manager.session
+            session = requests.Session()
+            session.headers.update(shared.headers)
+            for prefix, adapter in shared.adapters.items():
+                session.mount(prefix, adapter)
+            entry = sessions[name] = [None, session]
+        if entry[0] != identity.generation:
+            with identity.lock:
+                entry[0] = identity.generation
+                entry[1].cookies = identity.cookies.copy()
+        return entry[1]
+
+    def session_alive(self, name):
+        """A sessão da identidade ainda abre a página autenticada probe_url."""
+        probe = self.session(name).get(self.probe_url, allow_redirects=True, timeout=10)
+        return not is_expired(probe)
+
+    def request(self, name, method, url, **kwargs):
+        """
+        Requisição como a identidade. Se uma identidade autenticada for
+        redirecionada para o login e a sessão não abrir mais probe_url, renova
+        a sessão e repete uma vez; com a sessão válida, é acesso negado e a
+        resposta é devolvida como está.
+        """
+        identity = self.identities[name]
+        generation = identity.generation
+        response = self.session(name).request(method, url, **kwargs)
+        if identity.anonymous or identity.failed or not is_expired(response):
+            return response
+        if (generation, url) in identity.denied:
+            return response
+        if self.session_alive(name):
+            with self._lock:
+                identity.denied.add((generation, url))
+                self.denials += 1
+            return response
+        if self.reauthenticate(name, generation):
+            response = self.session(name).request(method, url, **kwargs)
+        return response
+
+    def get(self, name, url, **kwargs):
+        return self.request(name, "GET", url, **kwargs)
+
+    def describe(self):
+        """Resumo para os logs."""
+        parts = []
+        for identity in self.identities.values():
+            state = "anônima" if identity.anonymous else ("falhou" if identity.failed else "autenticada")
+            role = " (admin)" if identity.is_admin else ""
+            parts.append(f"{identity.name}: {state}{role}, {identity.logins} login(s)")
+        return f"{'; '.join(parts)}; {self.reauths} renovações, {self.denials} acessos negados"
@@ -0,0 +1,51 @@
+import os
+import sys
+import tempfile
+
+from urllib.parse import urlparse
+
+import pytest
+
+# Os módulos usam imports planos (from config import ...), como no contêiner
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# config cria LOG_DIR ao ser importado: fora de /app/logs durante os testes
+os.environ.setdefault("ATTACK_LOG_DIR", tempfile.mkdtemp(prefix="attack-tool-tests-"))
+
+
+@pytest.fixture
+def standin(tmp_path, monkeypatch):
+    """Servidor local que imita o ChitChat (benchmarks.standin) e sua URL base."""
+    from benchmarks.standin import start_server
+
+    # SessionManager grava sessions/ relativo ao diretório atual
+    monkeypatch.chdir(tmp_path)
+    server, base_url = start_server()
+    yield server, base_url
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def restricted_standin(tmp_path, monkeypatch):
+    """
+    Stand-in com /view/admin.php, que só abre para o admin: os demais são
+    redirecionados para o login (como uma sessão expirada). O SessionManager
+    autentica contra este servidor.
+    """
+    from benchmarks.standin import StandInHandler, start_server
+
+    class RestrictedHandler(StandInHandler):
+        def do_GET(self):
+            if urlparse(self.path).path != "/view/admin.php":
+                return super().do_GET()
+            session_id, session = self._session()
+            if session.get("usuario") != "admin":
+                return self._send(302, "", session_id, location="/")
+            return self._send(200, self._page("Admin", "<h1>Painel do administrador</h1>"), session_id)
+
+    monkeypatch.chdir(tmp_path)
+    server, base_url = start_server(handler=RestrictedHandler)
+    monkeypatch.setattr("session_manager.BASE_URL", base_url)
+    yield server, base_url
+    server.shutdown()
+    server.server_close()
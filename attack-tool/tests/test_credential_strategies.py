@@ -0,0 +1,111 @@
+from attacks.credential_strategies import CredentialStrategy, frequency_order
+from wordlists import Wordlist
+
+
+def run_plan(plan, valid):
+    """Percorre o plano como o brute force, marcando os acertos de `valid`."""
+    attempts = []
+    for index, username, password in plan.iter():
+        attempts.append((username, password))
+        if valid.get(username) == password:
+            plan.mark_valid(username, password)
+        plan.done(index)
+    return attempts
+
+
+def test_dedup_counts_repeated_entries():
+    plan = CredentialStrategy().plan(["a", "b", "a"], ["1", "2", "1", "3"])
+    assert plan.users == ["a", "b"]
+    assert plan.total == 6
+    assert plan.avoided["dedup"] == 3 * 4 - 6
+
+
+def test_without_dedup_keeps_repetitions():
+    plan = CredentialStrategy(dedup=False).plan(["a", "b", "a"], ["1", "2", "1", "3"])
+    assert plan.total == 12
+    assert plan.avoided["dedup"] == 0
+
+
+def test_dedup_of_pairs():
+    plan = CredentialStrategy().plan_pairs([("a", "1"), ("a", "1"), ("b", "2")])
+    assert plan.total == 2
+    assert plan.avoided["dedup"] == 1
+
+
+def test_user_major_short_circuit():
+    plan = CredentialStrategy().plan(["a", "b"], ["1", "2", "3", "4"])
+    attempts = run_plan(plan, {"a": "2"})
+    assert attempts == [("a", "1"), ("a", "2"), ("b", "1"), ("b", "2"), ("b", "3"), ("b", "4")]
+    assert plan.avoided["short_circuit"] == 2
+    assert plan.resume_position == plan.total
+
+
+def test_spray_short_circuit():
+    plan = CredentialStrategy(order="spray").plan(["a", "b"], ["1", "2", "3"])
+    attempts = run_plan(plan, {"a": "1"})
+    assert attempts == [("a", "1"), ("b", "1"), ("b", "2"), ("b", "3")]
+    assert plan.avoided["short_circuit"] == 2
+
+
+def test_spray_stops_when_every_user_is_found():
+    plan = CredentialStrategy(order="spray").plan(["a", "b"], ["1", "2", "3"])
+    attempts = run_plan(plan, {"a": "1", "b": "1"})
+    assert attempts == [("a", "1"), ("b", "1")]
+    assert plan.avoided["short_circuit"] == 4
+    assert len(attempts) + plan.avoided["short_circuit"] == plan.total
+
+
+def test_keep_going_tries_every_pair():
+    plan = CredentialStrategy(short_circuit=False).plan(["a", "b"], ["1", "2"])
+    assert len(run_plan(plan, {"a": "1"})) == 4
+    assert plan.avoided["short_circuit"] == 0
+
+
+def test_limit_and_resume_position():
+    plan = CredentialStrategy().plan(["a"], ["1", "2", "3", "4"])
+    emitted = list(plan.iter(limit=2))
+    assert [index for index, _, _ in emitted] == [0, 1]
+    assert plan.limited
+    # Tentativa 1 ainda pendente: a retomada começa nela
+    plan.done(0)
+    assert plan.resume_position == 1
+    assert [index for index, _, _ in plan.iter(start=plan.resume_position)] == [1, 2, 3]
+
+
+def test_frequency_order_ranks_by_count_then_common_passwords():
+    ordered, original, raw = frequency_order(["x", "123456", "y", "123456", "admin", "y", "y"])
+    assert ordered == ["y", "123456", "admin", "x"]
+    assert original == ["x", "123456", "y", "admin"]
+    assert raw == 7
+
+
+def test_frequency_order_gives_up_above_the_cap():
+    assert frequency_order(["a", "b", "c"], max_entries=2) is None
+
+
+def test_frequency_is_opt_in_and_wordlists_stay_streamed(tmp_path):
+    path = tmp_path / "passwords.txt"
+    path.write_text("1\n2\n2\n")
+    strategy = CredentialStrategy.from_params({})
+    assert not strategy.frequency
+    plan = strategy.plan(["a"], Wordlist(str(path)))
+    assert isinstance(plan.passwords, Wordlist)
+    assert not plan.frequency_applied
+    assert plan.total == 2
+
+
+def test_frequency_gain_is_reported_apart_and_never_negative():
+    passwords = ["x", "123456", "y", "123456", "admin", "y", "y"]
+    plan = CredentialStrategy(frequency=True).plan(["u", "v"], passwords)
+    plan.finalize([("u", "admin")])
+    # admin: posição 3 na ordem original, 2 na ordenada
+    assert plan.frequency_gain == 1
+    assert "frequency" not in plan.avoided
+
+    plan = CredentialStrategy(frequency=True).plan(["u"], passwords)
+    plan.finalize([("u", "x")])
+    assert plan.frequency_gain == 0
+
+    plan = CredentialStrategy(order="spray", frequency=True).plan(["u"], passwords)
+    plan.finalize([("u", "admin")])
+    assert plan.frequency_gain == 0
@@ -0,0 +1,61 @@
+import time
+
+import pytest
+
+from attacks.baseline import BASELINE_SAMPLES
+from distributed import AUTHKEY_ENV, Coordinator
+from events import EventLog
+from pacing import Pacer
+from session_manager import SessionManager
+
+PAYLOADS = ["' OR '1'='1", "abc", "admin' --", "xyz"]
+
+
+def coordinator(base_url, logs, **kwargs):
+    options = dict(processes=2, shard_size=1, add_log=lambda message, *args: logs.append(message),
+                   pacer=Pacer.unlimited())
+    options.update(kwargs)
+    params = {"payloads": PAYLOADS, "pacing": "fixed", "delay_range": (0.0, 0.0), "max_rps": 0}
+    return Coordinator(SessionManager(http_cache=False), "SQL Injection", f"{base_url}/", params, **options)
+
+
+def test_listen_requires_an_authkey_and_never_logs_it(standin, monkeypatch, tmp_path):
+    _, base_url = standin
+    monkeypatch.delenv(AUTHKEY_ENV, raising=False)
+    with pytest.raises(ValueError):
+        coordinator(base_url, [], listen="127.0.0.1:0")
+
+    monkeypatch.setenv(AUTHKEY_ENV, "chave-secreta-de-teste")
+    logs = []
+    merged = coordinator(base_url, logs, processes=1, listen="127.0.0.1:0").run(str(tmp_path / "dist.log"))
+    assert merged["attempts"] == len(PAYLOADS) * 3
+    assert any(AUTHKEY_ENV in line for line in logs)
+    assert not any("chave-secreta-de-teste" in line for line in logs)
+
+
+def test_discovery_and_baseline_run_once_for_all_shards(standin, tmp_path):
+    _, base_url = standin
+    records = []
+    events = EventLog(run_id="dist", listeners=[records.append])
+    merged = coordinator(base_url, []).run(str(tmp_path / "dist.log"), run_id="dist", events=events)
+
+    phases = [record["phase"] for record in records]
+    # Um shard por payload, mas um único baseline (1 cenário × BASELINE_SAMPLES)
+    assert phases.count("baseline") == BASELINE_SAMPLES
+    assert phases.count("injection") == len(PAYLOADS) * 3
+    assert merged["attempts"] == len(PAYLOADS) * 3
+    assert merged["success_count"] > 0
+
+
+def test_cancel_stops_shards_already_running(standin, tmp_path):
+    server, base_url = standin
+    server.state.latency = 0.25
+    started = time.monotonic()
+    logs = []
+    # Um único shard longo (4 payloads × 3 campos × redirecionamento): ~6s sem cancelamento,
+    # além de baseline (~1,5s) e início do processo
+    merged = coordinator(base_url, logs, processes=1, shard_size=len(PAYLOADS),
+                         should_stop=lambda: time.monotonic() - started > 4.0).run(str(tmp_path / "dist.log"))
+    assert time.monotonic() - started < 7.0
+    assert 0 < merged["attempts"] < len(PAYLOADS) * 3
+    assert any("Cancelamento" in line for line in logs)
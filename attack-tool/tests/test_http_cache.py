@@ -0,0 +1,118 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from http_cache import HTTPCache
+from session_manager import SessionManager
+
+ETAG = '"v1"'
+LAST_MODIFIED = "Mon, 05 Oct 2026 12:00:00 GMT"
+
+
+class ValidatingHandler(BaseHTTPRequestHandler):
+    """
+    /etag envia ETag e /modified envia Last-Modified; as duas respondem 304
+    à requisição condicional correspondente. Conta os GETs e os 304.
+    """
+
+    protocol_version = "HTTP/1.1"
+    hits = 0
+    not_modified = 0
+
+    def do_GET(self):
+        type(self).hits += 1
+        if self.path == "/etag":
+            validator, header, condition = ETAG, "ETag", "If-None-Match"
+        else:
+            validator, header, condition = LAST_MODIFIED, "Last-Modified", "If-Modified-Since"
+        if self.headers.get(condition) == validator:
+            type(self).not_modified += 1
+            self.send_response(304)
+            self.send_header(header, validator)
+            self.end_headers()
+            return
+        body = f"pagina {self.path}".encode()
+        self.send_response(200)
+        self.send_header(header, validator)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def validating_url():
+    ValidatingHandler.hits = ValidatingHandler.not_modified = 0
+    server = ThreadingHTTPServer(("127.0.0.1", 0), ValidatingHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_fresh_entry_is_served_without_network(validating_url):
+    cache, session = HTTPCache(ttl=300), requests.Session()
+    first = cache.get(session, f"{validating_url}/etag")
+    second = cache.get(session, f"{validating_url}/etag")
+    assert not hasattr(first, "from_cache")
+    assert second.from_cache == "fresh"
+    assert second.text == first.text == "pagina /etag"
+    assert ValidatingHandler.hits == 1
+    assert (cache.misses, cache.fresh_hits) == (1, 1)
+
+
+@pytest.mark.parametrize("path", ["/etag", "/modified"])
+def test_expired_entry_is_revalidated_with_304(validating_url, path):
+    # TTL zero: toda leitura depois da primeira vira requisição condicional
+    cache, session = HTTPCache(ttl=0), requests.Session()
+    cache.get(session, f"{validating_url}{path}")
+    response = cache.get(session, f"{validating_url}{path}")
+    assert response.from_cache == "revalidated"
+    assert response.status_code == 200
+    assert response.text == f"pagina {path}"
+    assert ValidatingHandler.hits == 2
+    assert ValidatingHandler.not_modified == 1
+    assert cache.revalidated == 1
+
+
+def test_entries_are_keyed_by_session_identity(validating_url):
+    cache = HTTPCache(ttl=300)
+    alice, bob = requests.Session(), requests.Session()
+    alice.cookies.set("PHPSESSID", "alice")
+    bob.cookies.set("PHPSESSID", "bob")
+    cache.get(alice, f"{validating_url}/etag")
+    assert not hasattr(cache.get(bob, f"{validating_url}/etag"), "from_cache")
+    assert ValidatingHandler.hits == 2
+    assert cache.invalidate(alice) == 1
+    assert len(cache) == 1
+
+
+def test_authentication_change_invalidates_cached_pages(standin, monkeypatch, tmp_path):
+    _, base_url = standin
+    log_file = str(tmp_path / "auth.log")
+    monkeypatch.setattr("session_manager.BASE_URL", base_url)
+    manager = SessionManager(http_cache=False)
+    manager.enable_http_cache(ttl=300, path=None)
+    home = f"{base_url}/view/home.php"
+
+    # Antes do login, a home redireciona para a página de login
+    manager.get_session_cookie(log_file=log_file)
+    assert "Bem-vindo" not in manager.cached_get(home).text
+    assert manager.cached_get(home).from_cache == "fresh"
+
+    # O PHPSESSID não muda no login: sem invalidar, a página antiga seria servida
+    cookie = manager.session.cookies.get("PHPSESSID")
+    assert manager.authenticate("admin", "admin", log_file=log_file)
+    assert manager.session.cookies.get("PHPSESSID") == cookie
+    response = manager.cached_get(home)
+    assert not hasattr(response, "from_cache")
+    assert "Bem-vindo, admin" in response.text
+
+    manager.logout(log_file=log_file)
+    assert len(manager.http_cache) == 0
+    assert "Bem-vindo" not in manager.cached_get(home).text
@@ -0,0 +1,51 @@
+import pytest
+
+from attacks.indicators import SQLI_INDICATORS, IndicatorMatcher
+
+TEXTS = [
+    "",
+    "<html><body>Bem-vindo, admin! <a href='logout.php'>Sair</a></body></html>",
+    "Warning: mysql_fetch_array() expects parameter 1; You have an error in your SQL syntax",
+    "<input type='password' name='Senha'> Login",
+    "painel de controle do administrador",
+    "welcome home: dashboard do perfil; bem vindo e sucesso",
+    "ORA-00933: SQL command not properly ended; database error",
+    "nenhum indicador aqui",
+]
+
+
+def substring_scan(matcher, text):
+    """Detecção anterior: uma busca de substring por padrão."""
+    return {category: [p for p in matcher.patterns(category) if p in text]
+            for category in ("auth_bypass", "sql_error", "login_field", "logged_in")}
+
+
+@pytest.mark.parametrize("text", TEXTS)
+def test_scan_matches_substring_lists(text):
+    text = text.lower()
+    assert SQLI_INDICATORS.scan(text) == substring_scan(SQLI_INDICATORS, text)
+
+
+def test_overlapping_and_nested_patterns():
+    matcher = IndicatorMatcher()
+    matcher.register("a", ["painel de controle", "painel", "controle"])
+    matcher.register("b", ["de con", "abc", "bcd"])
+    # "painel de controle" contém os outros padrões; "abc"/"bcd" se sobrepõem
+    assert matcher.scan("o painel de controle, abcd") == {
+        "a": ["painel de controle", "painel", "controle"],
+        "b": ["de con", "abc", "bcd"],
+    }
+    assert matcher.scan("controle") == {"a": ["controle"], "b": []}
+
+
+def test_register_lowercases_dedups_and_recompiles():
+    matcher = IndicatorMatcher()
+    matcher.register("a", ["Logout", "logout"])
+    assert matcher.patterns("a") == ["logout"]
+    assert matcher.scan("sair") == {"a": []}
+    matcher.register("a", ["sair"])
+    assert matcher.scan("sair") == {"a": ["sair"]}
+
+
+def test_empty_matcher():
+    assert IndicatorMatcher().scan("qualquer texto") == {}
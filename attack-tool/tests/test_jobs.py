@@ -0,0 +1,99 @@
+import time
+
+import pytest
+
+from jobs import JobLimits, JobManager
+from session_manager import SessionManager
+
+PASSWORDS = [f"senha{i}" for i in range(40)]
+
+
+def wait_for(condition, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError("condição não atingida a tempo")
+        time.sleep(0.02)
+
+
+@pytest.fixture
+def slow_target(standin):
+    server, base_url = standin
+    server.state.latency = 0.1
+    return server, f"{base_url}/controller/usuario.php"
+
+
+def brute_force_params():
+    return {"usernames": ["nobody"], "passwords": PASSWORDS, "max_attempts": len(PASSWORDS),
+            "pacing": "fixed", "delay_range": (0.0, 0.0)}
+
+
+def test_limits_clamp_params():
+    params, adjusted = JobLimits(max_rps=10, max_concurrency=4, timeout=0).apply(
+        {"max_rps": 0, "concurrency": 16, "processes": 1})
+    assert params["max_rps"] == 10
+    assert params["concurrency"] == 4
+    assert params["processes"] == 1
+    assert len(adjusted) == 2
+
+
+def test_cancel_queued_and_running_jobs(slow_target):
+    server, target = slow_target
+    manager = JobManager(max_workers=1, limits=JobLimits(timeout=0))
+    session_manager = SessionManager(http_cache=False)
+    running = manager.submit(session_manager, "Brute Force", target, brute_force_params())
+    queued = manager.submit(session_manager, "Brute Force", target, brute_force_params())
+    wait_for(lambda: server.state.requests >= 3)
+    assert (running.status, queued.status) == ("running", "queued")
+
+    # Na fila: sai sem executar e sem nenhuma requisição
+    assert manager.cancel(queued.id)
+    assert queued.status == "cancelled"
+    assert queued.started_at is None and queued.result is None
+
+    # Em execução: para na próxima requisição, com resultado parcial
+    assert manager.cancel(running.id)
+    running.future.result(timeout=10)
+    assert running.status == "cancelled"
+    assert running.cancel_reason == "Cancelado pelo usuário"
+    assert 0 < running.result["attempts"] < len(PASSWORDS)
+    assert running.snapshot()["attempts"] == running.result["attempts"]
+
+    # Já terminados: nada a cancelar
+    assert not manager.cancel(running.id)
+    assert not manager.cancel(queued.id)
+    assert manager.active_count() == 0
+    manager.shutdown()
+
+
+def test_timeout_cancels_running_job(slow_target):
+    _, target = slow_target
+    manager = JobManager(max_workers=1, limits=JobLimits(timeout=0.5))
+    job = manager.submit(SessionManager(http_cache=False), "Brute Force", target, brute_force_params())
+    job.future.result(timeout=10)
+    assert job.status == "cancelled"
+    assert job.cancel_reason.startswith("Tempo limite")
+    assert job.result["attempts"] < len(PASSWORDS)
+    manager.shutdown()
+
+
+def test_cancelled_job_resumes_from_its_checkpoint(slow_target):
+    server, target = slow_target
+    manager = JobManager(max_workers=1, limits=JobLimits(timeout=0))
+    session_manager = SessionManager(http_cache=False)
+    job = manager.submit(session_manager, "Brute Force", target, brute_force_params())
+    wait_for(lambda: server.state.requests >= 3)
+    manager.cancel(job.id)
+    job.future.result(timeout=10)
+    done = job.result["attempts"]
+
+    server.state.latency = 0.0
+    before = server.state.requests
+    resumed = manager.resume(job.id)
+    resumed.future.result(timeout=30)
+    assert resumed.status == "completed"
+    assert resumed.checkpoint_name == job.checkpoint_name
+    # Só as tentativas que faltavam são feitas (POST + redirecionamento cada)
+    assert resumed.result["attempts"] == len(PASSWORDS)
+    assert server.state.requests - before == 2 * (len(PASSWORDS) - done)
+    manager.shutdown()
@@ -0,0 +1,53 @@
+import threading
+
+from config import flush_logs
+from live_log import LiveLogSink
+
+
+class FakeContainer:
+    """Placeholder do Streamlit: guarda cada redesenho."""
+
+    def __init__(self):
+        self.renders = []
+
+    def text_area(self, label, value, height, key):
+        self.renders.append((label, value, key))
+
+
+def test_ring_buffer_keeps_last_lines_and_writes_every_line(tmp_path):
+    log_file = str(tmp_path / "live.log")
+    container = FakeContainer()
+    sink = LiveLogSink(log_file, container, max_lines=3, max_fps=0)
+    for i in range(5):
+        sink.add_log(f"linha {i}")
+    label, value, _ = container.renders[-1]
+    assert "(5 total)" in label
+    assert [line.split("] ", 1)[1] for line in value.split("\n")] == ["linha 2", "linha 3", "linha 4"]
+    assert flush_logs()
+    with open(log_file, encoding="utf-8") as f:
+        assert len(f.read().splitlines()) == 5
+
+
+def test_redraws_are_throttled(tmp_path):
+    container = FakeContainer()
+    sink = LiveLogSink(str(tmp_path / "live.log"), container, max_fps=1)
+    for i in range(50):
+        sink.add_log(f"linha {i}")
+    assert len(container.renders) == 1
+    sink.flush()
+    assert len(container.renders) == 2
+    assert "(50 total)" in container.renders[-1][0]
+    # Nada pendente: flush não redesenha
+    sink.flush()
+    assert len(container.renders) == 2
+
+
+def test_flush_only_renders_on_owner_thread(tmp_path):
+    container = FakeContainer()
+    sink = LiveLogSink(str(tmp_path / "live.log"), container, max_fps=0)
+    worker = threading.Thread(target=sink.add_log, args=("de outra thread",))
+    worker.start()
+    worker.join()
+    assert container.renders == []
+    sink.flush()
+    assert "de outra thread" in container.renders[-1][1]
@@ -0,0 +1,67 @@
+import pytest
+
+import log_viewer
+from log_viewer import LineIndex, tail_lines
+
+
+def write(path, data, mode="wb"):
+    with open(path, mode) as f:
+        f.write(data)
+
+
+@pytest.fixture
+def log_file(tmp_path):
+    path = tmp_path / "ataque.log"
+    write(path, b"primeira\nsegunda\r\nterceira\nparcial")
+    return str(path)
+
+
+@pytest.mark.parametrize("block_size", [1, 3, 64 * 1024])
+def test_tail_lines_includes_partial_last_line(log_file, block_size):
+    assert tail_lines(log_file, 2, block_size) == ["terceira", "parcial"]
+    assert tail_lines(log_file, 10, block_size) == ["primeira", "segunda", "terceira", "parcial"]
+
+
+@pytest.mark.parametrize("block_size", [1, 5, 64 * 1024])
+def test_tail_lines_with_trailing_newline(tmp_path, block_size):
+    path = tmp_path / "completo.log"
+    write(path, "a\nbb\nção\n".encode("utf-8"))
+    assert tail_lines(str(path), 2, block_size) == ["bb", "ção"]
+    assert tail_lines(str(path), 0, block_size) == []
+
+
+def test_tail_lines_empty_file(tmp_path):
+    path = tmp_path / "vazio.log"
+    write(path, b"")
+    assert tail_lines(str(path), 5) == []
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 7, 4 * 1024 * 1024])
+def test_line_index_partial_line_and_appends(log_file, monkeypatch, chunk_size):
+    monkeypatch.setattr(log_viewer, "INDEX_CHUNK_SIZE", chunk_size)
+    index = LineIndex(log_file).refresh()
+    assert index.line_count == 4
+    assert index.read_lines(0, 10) == ["primeira", "segunda", "terceira", "parcial"]
+    assert index.read_lines(3, 1) == ["parcial"]
+
+    # A linha parcial é completada e outra é anexada
+    write(log_file, b" completa\nquinta\n", mode="ab")
+    index.refresh()
+    assert index.line_count == 5
+    assert index.read_lines(3, 2) == ["parcial completa", "quinta"]
+    assert index.read_lines(1, 1) == ["segunda"]
+
+
+def test_line_index_reindexes_when_file_shrinks(log_file):
+    index = LineIndex(log_file).refresh()
+    write(log_file, b"novo\n")
+    index.refresh()
+    assert index.line_count == 1
+    assert index.read_lines(0, 5) == ["novo"]
+
+
+def test_line_index_bounds(log_file):
+    index = LineIndex(log_file).refresh()
+    assert index.read_lines(10, 5) == []
+    assert index.read_lines(-3, 1) == ["primeira"]
+    assert index.read_lines(0, 0) == []
@@ -0,0 +1,98 @@
+import time
+from datetime import timedelta
+
+import pytest
+
+from config import PACING_MODE
+from pacing import Pacer
+
+
+class FakeResponse:
+    def __init__(self, latency=0.05, status_code=200):
+        self.elapsed = timedelta(seconds=latency)
+        self.status_code = status_code
+
+
+def adaptive(**kwargs):
+    options = dict(mode="adaptive", max_rps=100.0, initial_rps=10.0, min_rps=0.5,
+                   increase=0.5, decrease=0.5, latency_factor=3.0)
+    options.update(kwargs)
+    return Pacer(**options)
+
+
+def test_fixed_is_the_default_and_ignores_feedback():
+    assert PACING_MODE == "fixed"
+    pacer = Pacer(delay_range=(0.0, 0.0), max_rps=None)
+    assert pacer.mode == "fixed"
+    pacer.record(FakeResponse(status_code=503))
+    assert (pacer.increases, pacer.decreases) == (0, 0)
+
+
+def test_slow_start_grows_ten_percent_until_first_decrease():
+    pacer = adaptive()
+    pacer.record(FakeResponse())
+    assert pacer.rate == pytest.approx(11.0)
+    pacer.record(FakeResponse())
+    assert pacer.rate == pytest.approx(12.1)
+    # Taxa baixa: o aumento mínimo é o aditivo
+    pacer = adaptive(initial_rps=2.0)
+    pacer.record(FakeResponse())
+    assert pacer.rate == pytest.approx(2.5)
+
+
+def test_overload_halves_the_rate_then_grows_additively():
+    pacer = adaptive()
+    pacer.record(FakeResponse(status_code=503))
+    assert pacer.rate == pytest.approx(5.0)
+    pacer.record(FakeResponse())
+    assert pacer.rate == pytest.approx(5.5)
+    pacer._last_decrease = 0.0  # Fora da janela da redução anterior
+    pacer.record(error=ConnectionError())
+    assert pacer.decreases == 2
+
+
+def test_burst_of_failures_decreases_once_per_smoothed_latency():
+    pacer = adaptive()
+    for _ in range(5):
+        pacer.record(FakeResponse(latency=0.5, status_code=503))
+    assert pacer.decreases == 1
+    assert pacer.rate == pytest.approx(5.0)
+
+
+def test_latency_well_above_the_minimum_counts_as_slow():
+    pacer = adaptive()
+    pacer.record(FakeResponse(latency=0.02))
+    rate = pacer.rate
+    pacer.record(FakeResponse(latency=0.2))
+    assert pacer.decreases == 1
+    assert pacer.rate == pytest.approx(rate * 0.5)
+
+
+def test_rate_stays_between_min_and_max():
+    pacer = adaptive(initial_rps=10.0, max_rps=10.5)
+    for _ in range(3):
+        pacer.record(FakeResponse())
+    assert pacer.rate == pytest.approx(10.5)
+
+    pacer = adaptive(initial_rps=0.6)
+    for _ in range(3):
+        pacer._last_decrease = 0.0  # Fora da janela da redução anterior
+        pacer.record(FakeResponse(status_code=429))
+    assert pacer.rate == pytest.approx(0.5)
+
+
+def test_max_rps_spaces_reserved_slots():
+    pacer = Pacer(mode="fixed", delay_range=(0.0, 0.0), max_rps=10.0)
+    delays = [pacer.next_delay() for _ in range(3)]
+    assert delays[0] == pytest.approx(0.0, abs=0.01)
+    assert delays[1] == pytest.approx(0.1, abs=0.01)
+    assert delays[2] == pytest.approx(0.2, abs=0.01)
+
+
+def test_cancel_interrupts_waiting():
+    pacer = Pacer(mode="fixed", delay_range=(5.0, 5.0), max_rps=None)
+    pacer.cancel()
+    started = time.monotonic()
+    assert pacer.wait() == 0.0
+    assert time.monotonic() - started < 0.5
+    assert pacer.cancelled
@@ -0,0 +1,70 @@
+from attacks.brute_force import BruteForceAttack
+from attacks.credential_strategies import CredentialStrategy
+from attacks.response_cache import VerdictCache, response_fingerprint
+from pacing import Pacer
+from session_manager import SessionManager
+
+
+class FakeResponse:
+    def __init__(self, content, status_code=200, url="http://alvo/", history=()):
+        self.content = content
+        self.status_code = status_code
+        self.url = url
+        self.history = list(history)
+
+
+def test_lru_evicts_least_recently_used():
+    cache = VerdictCache(max_size=2)
+    cache.put("a", True)
+    cache.put("b", False)
+    # Leitura renova "a": "b" passa a ser o mais antigo
+    assert cache.get("a") is True
+    cache.put("c", True)
+    assert len(cache) == 2
+    assert cache.get("b") is None
+    assert cache.get("a") is True
+    assert cache.get("c") is True
+
+
+def test_put_existing_key_refreshes_recency():
+    cache = VerdictCache(max_size=2)
+    cache.put("a", True)
+    cache.put("b", True)
+    cache.put("a", False)
+    cache.put("c", True)
+    assert cache.get("a") is False
+    assert cache.get("b") is None
+
+
+def test_hit_miss_accounting_and_clear():
+    cache = VerdictCache()
+    assert cache.get("x") is None
+    cache.put("x", False)
+    # Veredicto False também é um hit (só None conta como ausência)
+    assert cache.get("x") is False
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert cache.hit_rate == 0.5
+    assert "1/2" in cache.describe()
+    cache.clear()
+    assert (len(cache), cache.hits, cache.misses, cache.hit_rate) == (0, 0, 0, 0.0)
+
+
+def test_fingerprint_distinguishes_status_url_redirects_and_body():
+    base = response_fingerprint(FakeResponse(b"login invalido"))
+    assert response_fingerprint(FakeResponse(b"login invalido")) == base
+    assert response_fingerprint(FakeResponse(b"login invalido", status_code=500)) != base
+    assert response_fingerprint(FakeResponse(b"login invalido", url="http://alvo/home")) != base
+    assert response_fingerprint(FakeResponse(b"login invalido", history=[object()])) != base
+    assert response_fingerprint(FakeResponse(b"bem-vindo")) != base
+    assert response_fingerprint(FakeResponse(None)) == response_fingerprint(FakeResponse(b""))
+
+
+def test_brute_force_reuses_verdicts_for_identical_responses(standin, tmp_path):
+    _, base_url = standin
+    attack = BruteForceAttack(SessionManager(http_cache=False))
+    attack.run(f"{base_url}/controller/usuario.php", ["nobody", "admin"], ["x", "y", "z", "admin"],
+               max_attempts=100, pacer=Pacer.unlimited(), log_file=str(tmp_path / "bf.log"),
+               strategy=CredentialStrategy(short_circuit=False))
+    assert attack.valid_credentials == [("admin", "admin")]
+    # As tentativas inválidas devolvem a mesma página: só a primeira é analisada
+    assert attack.verdict_cache.hits >= 5
@@ -0,0 +1,67 @@
+import json
+
+from checkpoint import Checkpoint
+from events import EventLog
+from results_store import ResultsStore
+from wordlists import Wordlist
+
+
+def test_params_are_stored_readable_and_redacted(tmp_path):
+    passwords = tmp_path / "senhas.txt"
+    passwords.write_text("123456\n")
+    store = ResultsStore(str(tmp_path / "results.sqlite3"))
+    store.start_run("run1", "Brute Force", "http://alvo", {
+        "usernames": ["admin"], "passwords": Wordlist(str(passwords)),
+        "admin_credentials": ("admin", "segredo"),
+    }, "run1.log", "run1.events.jsonl")
+    store.flush()
+    params = json.loads(store.get_run("run1")["params"])
+    assert params["passwords"] == {"wordlist": str(passwords)}
+    assert params["usernames"] == ["admin"]
+    assert params["admin_credentials"] == ["admin", None]
+
+
+def test_resume_discards_attempts_after_the_checkpoint(tmp_path, monkeypatch):
+    store = ResultsStore(str(tmp_path / "results.sqlite3"))
+    events = EventLog(run_id="run1", module="sql_injection", listeners=[store.record_event])
+    checkpoint = Checkpoint("SQL Injection", directory=str(tmp_path))
+    clock = [1000.0]
+    monkeypatch.setattr("events.time.time", lambda: clock[0])
+    monkeypatch.setattr("checkpoint.time.time", lambda: clock[0])
+
+    store.start_run("run1", "SQL Injection", "http://alvo", {}, "run1.log", None)
+    checkpoint.start("http://alvo", {}, "run1.log")
+    for _ in range(3):
+        clock[0] += 1
+        events.emit("injection", "safe", payload="x")
+    checkpoint.update(3, force=True)
+    # Cenário interrompido: duas tentativas que a retomada vai refazer
+    for _ in range(2):
+        clock[0] += 1
+        events.emit("injection", "safe", payload="y")
+
+    saved = Checkpoint("SQL Injection", directory=str(tmp_path))
+    saved.load()
+    store.start_run("run1", "SQL Injection", "http://alvo", {}, "run1.log", None,
+                    replay_from=saved.saved_at)
+    for _ in range(2):
+        clock[0] += 1
+        events.emit("injection", "safe", payload="y")
+    store.flush()
+    stats = store.attempt_stats("run1")
+    assert [row["attempts"] for row in stats] == [5]
+
+
+def test_finish_run_replaces_findings_and_records_totals(tmp_path):
+    store = ResultsStore(str(tmp_path / "results.sqlite3"))
+    store.start_run("run1", "XSS", "http://alvo", {}, "run1.log", None)
+    store.finish_run("run1", "XSS", [{"param": "msg", "payload": "<b>", "url": "http://alvo/a"}],
+                     attempts=10, success_count=1, status="cancelled")
+    store.start_run("run1", "XSS", "http://alvo", {}, "run1.log", None)
+    store.finish_run("run1", "XSS", [{"param": "msg", "payload": "<b>", "url": "http://alvo/a"},
+                                     {"param": "q", "payload": "<i>", "url": "http://alvo/b"}],
+                     attempts=20, success_count=2, timings={"attack": 1.5})
+    run = store.get_run("run1")
+    assert (run["status"], run["attempts"], run["success_count"]) == ("completed", 20, 2)
+    assert sorted(f["field"] for f in store.findings(run_id="run1")) == ["msg", "q"]
+    assert store.timings("run1") == {"attack": 1.5}
@@ -0,0 +1,69 @@
+import pytest
+
+from concurrency import bounded_map
+from session_manager import SessionManager
+from session_pool import Identity, SessionPool, is_expired
+
+
+@pytest.fixture
+def pool(restricted_standin, tmp_path):
+    _, base_url = restricted_standin
+    pool = SessionPool(SessionManager(http_cache=False),
+                       [Identity("anonymous"), Identity("user", "user", "123456"),
+                        Identity("admin", "admin", "admin")],
+                       log_file=str(tmp_path / "pool.log"), session_dir=str(tmp_path / "pool"),
+                       probe_url=f"{base_url}/view/home.php")
+    assert pool.login_all() == {"anonymous": True, "user": True, "admin": True}
+    return pool
+
+
+def test_login_all_keeps_identities_apart(pool, restricted_standin):
+    _, base_url = restricted_standin
+    assert pool.identities["admin"].is_admin
+    assert not pool.identities["user"].is_admin
+    assert not pool.identities["anonymous"].is_authenticated
+    assert "Bem-vindo, user" in pool.get("user", f"{base_url}/view/home.php").text
+    assert "Bem-vindo, admin" in pool.get("admin", f"{base_url}/view/home.php").text
+    assert is_expired(pool.get("anonymous", f"{base_url}/view/home.php"))
+
+
+def test_access_denial_is_not_treated_as_expiry(pool, restricted_standin):
+    server, base_url = restricted_standin
+    admin_page = f"{base_url}/view/admin.php"
+    assert "Painel do administrador" in pool.get("admin", admin_page).text
+
+    # O usuário vai para o login, mas a home ainda abre: acesso negado, sem novo login
+    assert is_expired(pool.get("user", admin_page))
+    assert (pool.denials, pool.reauths) == (1, 0)
+    assert pool.identities["user"].logins == 1
+
+    # A URL negada não é sondada de novo nesta geração: só a requisição e o redirecionamento
+    before = server.state.requests
+    assert is_expired(pool.get("user", admin_page))
+    assert server.state.requests - before == 2
+    assert pool.denials == 1
+
+
+def test_expired_session_logs_in_again_and_retries(pool, restricted_standin):
+    server, base_url = restricted_standin
+    home = f"{base_url}/view/home.php"
+    server.state.sessions.clear()  # O servidor esquece todas as sessões
+
+    response = pool.get("user", home)
+    assert "Bem-vindo, user" in response.text
+    assert (pool.reauths, pool.denials) == (1, 0)
+    assert pool.identities["user"].logins == 2
+    # As outras identidades só renovam quando elas mesmas expiram
+    assert pool.identities["admin"].logins == 1
+
+
+def test_concurrent_workers_share_a_single_relogin(pool, restricted_standin):
+    server, base_url = restricted_standin
+    home = f"{base_url}/view/home.php"
+    server.state.sessions.clear()
+
+    # Todos os workers veem a mesma geração expirada: um único novo login
+    results = list(bounded_map(lambda _: pool.get("user", home).text, range(8), workers=8))
+    assert all(error is None and "Bem-vindo, user" in text for _, text, error in results)
+    assert pool.reauths == 1
+    assert pool.identities["user"].logins == 2
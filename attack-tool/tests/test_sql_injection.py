@@ -0,0 +1,65 @@
+from attacks import sql_injection
+from attacks.sql_injection import SQLInjectionAttack
+from checkpoint import Checkpoint
+from pacing import Pacer
+from session_manager import SessionManager
+
+PAYLOADS = ["' OR '1'='1", "abc", "admin' --"]
+LOGIN_FIELDS = [{"name": "Usuario", "type": "hidden", "value": "Login"},
+                {"name": "Login", "type": "text"}, {"name": "Senha", "type": "password"}]
+
+
+class CancellingPacer(Pacer):
+    """Sem delay; cancela o ataque quando ele chega a cancel_at tentativas."""
+
+    def __init__(self, attack, cancel_at):
+        super().__init__(mode="fixed", delay_range=(0.0, 0.0), max_rps=None)
+        self.attack = attack
+        self.cancel_at = cancel_at
+
+    def next_delay(self):
+        if self.attack.total_attempts >= self.cancel_at:
+            self.cancel()
+        return super().next_delay()
+
+
+def build_attack(base_url):
+    attack = SQLInjectionAttack(SessionManager(http_cache=False))
+    scenarios = [sql_injection.TestScenario(f"Login {name}", f"{base_url}/controller/usuario.php",
+                                            "POST", LOGIN_FIELDS)
+                 for name in "ABC"]
+    attack.discover_form_scenarios = lambda target_url, add_log: scenarios
+    return attack
+
+
+def findings(attack):
+    return sorted((v.payload, v.scenario_name, v.field) for v in attack.vulnerabilities)
+
+
+def test_resume_continues_inside_an_interrupted_payload(standin, tmp_path):
+    _, base_url = standin
+    log_file = str(tmp_path / "sqli.log")
+
+    clean = build_attack(base_url)
+    clean.run(f"{base_url}/", payloads=PAYLOADS, log_file=log_file, pacer=Pacer.unlimited())
+    assert clean.total_attempts == 27
+
+    # Cancela no meio do 2º payload: cenário A concluído, cenário B interrompido
+    checkpoint = Checkpoint("SQL Injection", directory=str(tmp_path))
+    checkpoint.start(f"{base_url}/", {}, log_file)
+    first = build_attack(base_url)
+    first.run(f"{base_url}/", payloads=PAYLOADS, log_file=log_file, checkpoint=checkpoint,
+              pacer=CancellingPacer(first, cancel_at=13))
+
+    saved = Checkpoint("SQL Injection", directory=str(tmp_path))
+    assert saved.can_resume()
+    assert saved.position == 4
+    assert saved.state["total"] == 9
+    assert saved.counters["total_attempts"] == 12
+
+    resumed = build_attack(base_url)
+    resumed.run(f"{base_url}/", payloads=PAYLOADS, log_file=log_file, checkpoint=saved,
+                pacer=Pacer.unlimited())
+    assert resumed.total_attempts == clean.total_attempts
+    assert findings(resumed) == findings(clean)
+    assert not Checkpoint("SQL Injection", directory=str(tmp_path)).can_resume()
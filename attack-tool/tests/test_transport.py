@@ -0,0 +1,79 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from transport import DNSCache, TransportStats, build_session
+
+
+class UnavailableHandler(BaseHTTPRequestHandler):
+    """Responde 503 a todo GET e conta as requisições recebidas."""
+
+    protocol_version = "HTTP/1.1"
+    hits = 0
+
+    def do_GET(self):
+        type(self).hits += 1
+        body = b"indisponivel"
+        self.send_response(503)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def unavailable_url():
+    UnavailableHandler.hits = 0
+    server = ThreadingHTTPServer(("127.0.0.1", 0), UnavailableHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/"
+    server.shutdown()
+    server.server_close()
+
+
+def test_status_is_not_retried_by_default(unavailable_url):
+    stats = TransportStats()
+    session = build_session(retries=2, stats=stats)
+    response = session.get(unavailable_url)
+    assert response.status_code == 503
+    assert UnavailableHandler.hits == 1
+    assert stats.snapshot()["requests"] == 1
+
+
+def test_status_retries_are_opt_in(unavailable_url):
+    session = build_session(retries=2, retry_statuses=(503,))
+    session.adapters["http://"].max_retries.backoff_factor = 0
+    response = session.get(unavailable_url)
+    assert response.status_code == 503
+    assert UnavailableHandler.hits == 3
+
+
+def test_connection_is_reused(unavailable_url):
+    stats = TransportStats()
+    session = build_session(stats=stats)
+    for _ in range(3):
+        session.get(unavailable_url)
+    snapshot = stats.snapshot()
+    assert snapshot["new_connections"] == 1
+    assert snapshot["reused_connections"] == 2
+
+
+def test_dns_cache_resolves_once(monkeypatch):
+    calls = []
+
+    def getaddrinfo(host, port, type=None):
+        calls.append(host)
+        return [(None, None, None, None, ("10.0.0.1", port))]
+
+    monkeypatch.setattr("transport.socket.getaddrinfo", getaddrinfo)
+    cache = DNSCache(ttl=60)
+    assert cache.resolve("web", 80) == "10.0.0.1"
+    assert cache.resolve("web", 80) == "10.0.0.1"
+    assert calls == ["web"]
+    cache.clear()
+    cache.resolve("web", 80)
+    assert calls == ["web", "web"]
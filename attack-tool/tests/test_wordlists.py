@@ -0,0 +1,44 @@
+import pytest
+
+from wordlists import Wordlist
+
+
+@pytest.fixture
+def wordlist_file(tmp_path):
+    path = tmp_path / "senhas.txt"
+    # Bytes inválidos diferentes viram o mesmo texto ao decodificar com replace
+    path.write_bytes(b"123456\n\n  admin  \r\n123456\nsenha\xff\nsenha\xfe\nadmin\nultima")
+    return str(path)
+
+
+@pytest.mark.parametrize("dedup", [True, False])
+def test_len_matches_what_iteration_yields(wordlist_file, dedup):
+    wordlist = Wordlist(wordlist_file, dedup=dedup)
+    words = list(wordlist)
+    assert len(wordlist) == len(words)
+    assert len(set(words)) == (len(words) if dedup else 4)
+
+
+def test_stats(wordlist_file):
+    stats = Wordlist(wordlist_file).stats()
+    assert stats["lines"] == 7
+    assert stats["unique"] == 4
+    assert list(Wordlist(wordlist_file)) == ["123456", "admin", "senha�", "ultima"]
+
+
+def test_known_stats_skip_rereading_the_file(tmp_path):
+    path = tmp_path / "w.txt"
+    path.write_text("a\nb\n")
+    stats = Wordlist(str(path)).stats()
+    path.write_text("a\nb\nc\n")
+    assert len(Wordlist(str(path), stats=stats)) == 2
+
+
+def test_empty_file_and_in_memory_list(tmp_path):
+    path = tmp_path / "vazio.txt"
+    path.write_bytes(b"")
+    assert list(Wordlist(str(path))) == []
+    assert len(Wordlist(str(path))) == 0
+    wordlist = Wordlist([" a ", "", "b", "a"])
+    assert list(wordlist) == ["a", "b"]
+    assert len(wordlist) == 2
@@ -0,0 +1,31 @@
+from attacks.xss import XSSAttack
+
+PAYLOAD = '<script>alert("XSS-Test-Gemini-CLI-1")</script>'
+HANDLER_PAYLOAD = '<img src=x onerror=alert("XSS-Test-Gemini-CLI-4")>'
+
+
+def test_active_script_and_handler_payloads():
+    attack = XSSAttack(None)
+    assert attack.is_payload_active(f"<html><body>{PAYLOAD}</body></html>", PAYLOAD)
+    assert attack.is_payload_active(f"<p>{HANDLER_PAYLOAD}</p>", HANDLER_PAYLOAD)
+
+
+def test_escaped_payload_is_not_active():
+    attack = XSSAttack(None)
+    escaped = "&lt;script&gt;alert(&quot;XSS-Test-Gemini-CLI-1&quot;)&lt;/script&gt;"
+    assert not attack.is_payload_active(f"<p>{escaped}</p>", PAYLOAD)
+
+
+def test_prefilter_skips_parsing_when_nothing_is_reflected():
+    attack = XSSAttack(None)
+    assert not attack.is_payload_active("<html><script>var x = 1;</script></html>", PAYLOAD)
+    assert attack._parse_cache == {}
+
+
+def test_identical_bodies_are_parsed_once(monkeypatch):
+    attack = XSSAttack(None)
+    body = f"<html><body>{PAYLOAD}</body></html>"
+    assert attack.is_payload_active(body, PAYLOAD)
+    monkeypatch.setattr("attacks.xss.BeautifulSoup", None)  # Um novo parse falharia
+    assert attack.is_payload_active(body, PAYLOAD)
+    assert len(attack._parse_cache) == 1
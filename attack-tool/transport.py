@@ -0,0 +1,170 @@
+import socket
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.util.retry import Retry
+
+
+class DNSCache:
+    """Cache simples de resolução DNS com TTL (ex.: host 'web' do docker-compose)."""
+
+    def __init__(self, ttl=300):
+        self.ttl = ttl
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def resolve(self, host, port):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get((host, port))
+            if entry and entry[1] > now:
+                return entry[0]
+
+        infos = socket.getaddrinfo(host, port, type=socket.SOCK_STREAM)
+        address = infos[0][4][0]
+        with self._lock:
+            self._entries[(host, port)] = (address, now + self.ttl)
+        return address
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class TransportStats:
+    """Estatísticas de conexões e tráfego de um transporte HTTP."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.requests = 0
+            self.new_connections = 0
+            self.bytes_out = 0
+            self.bytes_in = 0
+            self.errors = 0
+
+    def add(self, **counters):
+        with self._lock:
+            for name, value in counters.items():
+                setattr(self, name, getattr(self, name) + value)
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "new_connections": self.new_connections,
+                "reused_connections": max(0, self.requests - self.new_connections),
+                "bytes_out": self.bytes_out,
+                "bytes_in": self.bytes_in,
+                "errors": self.errors,
+            }
+
+
+def _connection_class(base, dns_cache, stats):
+    """
+    Cria uma classe de conexão urllib3 que resolve o host via DNSCache e
+    conta cada socket TCP aberto (handshakes reais, não objetos do pool).
+    """
+
+    class CachedDNSConnection(base):
+        def _new_conn(self):
+            stats.add(new_connections=1)
+            if dns_cache is None:
+                return super()._new_conn()
+            original_host = self._dns_host
+            self._dns_host = dns_cache.resolve(original_host, self.port)
+            try:
+                return super()._new_conn()
+            finally:
+                self._dns_host = original_host
+
+    return CachedDNSConnection
+
+
+def _pool_class(base, connection_base, dns_cache, stats):
+    """Cria uma classe de pool urllib3 que usa a conexão com DNS em cache."""
+
+    class PooledConnectionPool(base):
+        ConnectionCls = _connection_class(connection_base, dns_cache, stats)
+
+    return PooledConnectionPool
+
+
+class PooledAdapter(HTTPAdapter):
+    """
+    HTTPAdapter com pool dimensionado, timeout padrão, DNS em cache e
+    contabilização de conexões e bytes trafegados.
+
+    Por padrão só falhas de conexão são repetidas: a requisição não chegou
+    ao alvo. Repetir GETs por status (retry_statuses, ex.: 502-504) reenvia
+    o payload e soma o backoff à latência medida, por isso é opcional.
+    """
+
+    def __init__(self, pool_size=10, timeout=15, retries=2, backoff=0.3,
+                 dns_cache=None, stats=None, retry_statuses=()):
+        self.default_timeout = timeout
+        self.dns_cache = dns_cache
+        self.stats = stats or TransportStats()
+        retry = Retry(
+            total=retries,
+            connect=retries,
+            read=0,
+            status=retries if retry_statuses else 0,
+            backoff_factor=backoff,
+            status_forcelist=tuple(retry_statuses),
+            allowed_methods=frozenset(["GET", "HEAD", "OPTIONS"]),
+            raise_on_status=False,
+        )
+        super().__init__(pool_connections=pool_size, pool_maxsize=pool_size,
+                         max_retries=retry, pool_block=True)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _pool_class(HTTPConnectionPool, HTTPConnection, self.dns_cache, self.stats),
+            "https": _pool_class(HTTPSConnectionPool, HTTPSConnection, self.dns_cache, self.stats),
+        }
+
+    def send(self, request, stream=False, timeout=None, **kwargs):
+        if timeout is None:
+            timeout = self.default_timeout
+
+        body = request.body or b""
+        header_size = sum(len(k) + len(v) + 4 for k, v in request.headers.items())
+        self.stats.add(requests=1, bytes_out=len(body) + header_size)
+
+        try:
+            response = super().send(request, stream=stream, timeout=timeout, **kwargs)
+        except Exception:
+            self.stats.add(errors=1)
+            raise
+
+        if not stream:
+            # O Session lê o corpo logo em seguida de qualquer forma
+            self.stats.add(bytes_in=len(response.content))
+        return response
+
+
+def build_session(pool_size=10, timeout=15, retries=2, dns_cache=None, stats=None, session=None,
+                  retry_statuses=()):
+    """
+    Monta (ou reconfigura) um requests.Session com adapters PooledAdapter
+    compartilhando o mesmo DNSCache e TransportStats.
+    """
+    session = session or requests.Session()
+    adapter = PooledAdapter(pool_size=pool_size, timeout=timeout, retries=retries,
+                            dns_cache=dns_cache, stats=stats, retry_statuses=retry_statuses)
+    for prefix in ("http://", "https://"):
+        old_adapter = session.adapters.get(prefix)
+        session.mount(prefix, adapter)
+        if old_adapter is not None and old_adapter is not adapter:
+            old_adapter.close()
+    session.headers["Connection"] = "keep-alive"
+    return session
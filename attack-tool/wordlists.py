@@ -0,0 +1,77 @@
+import mmap
+import os
+
+
+class Wordlist:
+    """
+    Lista de palavras lida sob demanda de um arquivo (uma por linha).
+
+    O arquivo é percorrido via mmap a cada iteração, sem carregar a lista
+    inteira em memória; linhas vazias são ignoradas e, com dedup=True,
+    entradas repetidas são descartadas. Também aceita uma lista em memória
+    (ex.: vinda de um text_area), com o mesmo comportamento.
+
+    A deduplicação (e a contagem de únicas em stats) guarda cada entrada
+    única em um set durante a passada: a memória cresce com o número de
+    palavras distintas. Para wordlists muito grandes, use dedup=False.
+    """
+
+    def __init__(self, source, dedup=True, encoding='utf-8', stats=None):
+        self.source = source
+        self.dedup = dedup
+        self.encoding = encoding
+        self._stats = stats  # estatísticas já conhecidas (evita reler o arquivo)
+
+    @property
+    def is_file(self):
+        return isinstance(self.source, (str, os.PathLike))
+
+    def _iter_raw(self):
+        if not self.is_file:
+            for word in self.source:
+                word = word.strip()
+                if word:
+                    yield word
+            return
+
+        with open(self.source, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                for raw_line in iter(mm.readline, b""):
+                    word = raw_line.strip()
+                    if word:
+                        yield word.decode(self.encoding, errors='replace')
+
+    def __iter__(self):
+        if not self.dedup:
+            yield from self._iter_raw()
+            return
+
+        seen = set()
+        for word in self._iter_raw():
+            if word not in seen:
+                seen.add(word)
+                yield word
+
+    def stats(self):
+        """Retorna (e guarda em cache) tamanho em bytes, linhas e entradas únicas."""
+        if self._stats is None:
+            lines = 0
+            # Mesmo critério de __iter__: __len__ precisa bater com o que é gerado
+            unique = set()
+            for word in self._iter_raw():
+                lines += 1
+                unique.add(word)
+            self._stats = {
+                "path": str(self.source) if self.is_file else None,
+                "bytes": os.path.getsize(self.source) if self.is_file else None,
+                "lines": lines,
+                "unique": len(unique),
+            }
+        return self._stats
+
+    def __len__(self):
+        stats = self.stats()
+        return stats["unique"] if self.dedup else stats["lines"]
+